@@ -0,0 +1,124 @@
+# src/data/alignment.py
+import math
+import numpy as np
+from scipy.signal import resample_poly
+from src.data.timebase import timebase_of
+
+# Rate ratios within this relative tolerance of an integer use polyphase resampling
+RATIO_TOLERANCE = 1e-6
+# Anti-aliasing window of the polyphase filter (beta 10 keeps the gain ripple below 1e-5)
+POLYPHASE_WINDOW = ("kaiser", 10.0)
+
+
+def _polyphase_plan(source, grid):
+    """
+    (up, down, offset) if grid is source resampled by an integer factor up or down with
+    grid sample 0 on the upsampled source grid (offset in units of source.dt / up), else None.
+    """
+    if source.n < 2 or not source.dt > 0 or not grid.dt > 0:
+        return None
+    ratio = grid.dt / source.dt
+    if ratio >= 1 and abs(ratio - round(ratio)) <= RATIO_TOLERANCE * ratio:
+        up, down = 1, int(round(ratio))
+    elif ratio < 1 and abs(1 / ratio - round(1 / ratio)) <= RATIO_TOLERANCE / ratio:
+        up, down = int(round(1 / ratio)), 1
+    else:
+        return None
+    offset = (grid.t0 - source.t0) / source.dt * up
+    if abs(offset - round(offset)) > 1e-3:
+        return None
+    return up, down, int(round(offset))
+
+
+def _resample_rows(matrix, source, grid, plan, out):
+    """Polyphase resampling of every row of matrix (sampled on source) into out (on grid)."""
+    up, down, offset = plan
+    n = source.n
+    # Grid sample i sits at offset + i * down on the upsampled source grid, covered are 0 .. (n - 1) * up
+    i0 = max(0, -(offset // down))
+    while (offset + i0 * down) % up:
+        i0 += 1
+    i1 = min(grid.n, ((n - 1) * up - offset) // down + 1)
+    if i1 <= i0:
+        return
+    p0 = (offset + i0 * down) // up
+    p1 = (offset + (i1 - 1) * down) // up + 1
+    if up == down == 1:
+        out[:, i0:i1] = matrix[:, p0:p1]
+        return
+
+    # Margin of source samples so the filter sees real neighbours at the window edges;
+    # the leading margin is a multiple of down to keep the output on the grid
+    margin = 10 * max(up, down) // up + 1
+    lead = min(p0 // down, math.ceil(margin / down)) * down
+    stop = min(n, p1 + margin)
+    resampled = resample_poly(matrix[:, p0 - lead:stop], up, down, axis=1, window=POLYPHASE_WINDOW,
+                              padtype="line")
+    skip = lead * up // down
+    out[:, i0:i1] = resampled[:, skip:skip + i1 - i0]
+
+
+def _interpolate_rows(matrix, source_time, grid_time, out):
+    """Linear interpolation of every row of matrix at grid_time (one gather for all rows)."""
+    source_time = np.asarray(source_time, dtype=float)
+    n = len(source_time)
+    if n < 2:
+        hit = grid_time == source_time[0] if n else np.zeros(len(grid_time), dtype=bool)
+        out[:, hit] = matrix[:, :1]
+        return
+    inside = (grid_time >= source_time[0]) & (grid_time <= source_time[-1])
+    t = grid_time[inside]
+    idx = np.clip(np.searchsorted(source_time, t, side="right") - 1, 0, n - 2)
+    weight = (t - source_time[idx]) / (source_time[idx + 1] - source_time[idx])
+    out[:, inside] = matrix[:, idx] * (1.0 - weight) + matrix[:, idx + 1] * weight
+
+
+def align_signals(signals, grid, fill_value=0.0):
+    """
+    Resamples signals onto one common time grid.
+    signals: List of (values, time); missing signals may be (None, None).
+    grid: Timebase of the output.
+    Returns a (len(signals), grid.n) float64 matrix. Samples outside a signal's time span
+    (and missing signals) are fill_value.
+
+    Signals sharing a time axis are resampled together as one matrix. Integer rate ratios
+    with grid samples on source samples use polyphase resampling (anti-aliased when
+    downsampling), any other timebase is linearly interpolated.
+    """
+    out = np.full((len(signals), grid.n), fill_value, dtype=float)
+    groups = {}  # time axis -> (timebase, time, rows)
+    for row, (values, time) in enumerate(signals):
+        if values is None or time is None or len(values) == 0 or len(values) != len(time):
+            continue
+        timebase = timebase_of(time)
+        key = timebase.key() if timebase is not None else id(time)
+        groups.setdefault(key, (timebase, time, []))[2].append(row)
+
+    grid_time = None
+    for timebase, time, rows in groups.values():
+        matrix = np.vstack([signals[row][0] for row in rows]).astype(float, copy=False)
+        block = out[rows]
+        plan = _polyphase_plan(timebase, grid) if timebase is not None else None
+        if plan is not None:
+            _resample_rows(matrix, timebase, grid, plan, block)
+        else:
+            if grid_time is None:
+                grid_time = np.asarray(grid.array())
+            _interpolate_rows(matrix, time, grid_time, block)
+        out[rows] = block
+    return out
+
+
+def overlay_grid(time, reference_time):
+    """
+    Grid for plotting a signal (sampled on time) against a reference signal: samples of
+    the reference axis spanning the signal, decimated to at most the signal's own rate.
+    None if either axis is not uniformly sampled.
+    """
+    source = timebase_of(time)
+    reference = timebase_of(reference_time)
+    if source is None or reference is None or source.n == 0 or not reference.dt > 0:
+        return None
+    step = max(1, int(source.dt / reference.dt + RATIO_TOLERANCE))
+    i0, i1 = reference.index_range(source.t0, source.value(source.n - 1) + reference.dt / 2)
+    return reference.window(i0, i1, step)
@@ -4,6 +4,8 @@ import scipy.signal as sigproc
 from scipy.signal import spectrogram, savgol_filter
 from scipy.interpolate import splprep, splev
 from src.utils.config_manager import config_manager
+from src.data.timebase import time_index
+from src.data.channel_health import channel_mask, select_channels
 
 # Load Config
 _analysis_conf = config_manager.get_config("analysis", {})
@@ -60,6 +62,12 @@ class SignalProcessor:
         Computes spectrogram for a single channel data.
         window_ms: Window size in milliseconds (overrides nperseg if provided).
         """
+        nperseg, noverlap = SignalProcessor._segment_params(fs, nperseg, noverlap, window_ms)
+        freq, times, Sxx = spectrogram(data, fs, nperseg=nperseg, noverlap=noverlap, nfft=nfft)
+        return freq, times, Sxx
+
+    @staticmethod
+    def _segment_params(fs, nperseg=None, noverlap=None, window_ms=None):
         if window_ms is not None:
              nperseg = int(window_ms * fs / 1000.0)
              
@@ -69,9 +77,31 @@ class SignalProcessor:
             _conf = _analysis_conf.get("spectrogram", {})
             overlap_ratio = _conf.get("noverlap_ratio", 0.5)
             noverlap = int(nperseg * overlap_ratio) # Default from config
-            
-        freq, times, Sxx = spectrogram(data, fs, nperseg=nperseg, noverlap=noverlap, nfft=nfft)
-        return freq, times, Sxx
+        return nperseg, noverlap
+
+    @staticmethod
+    def spectrogram_stream(chunks, fs, nperseg=None, noverlap=None, nfft=512, window_ms=None):
+        """
+        Incremental compute_spectrogram over a stream of (data, time) blocks, e.g.
+        SignalSource.chunks(). Yields (freq, times, Sxx) for the segments completed by each
+        block; the columns of all yields together equal compute_spectrogram of the whole
+        signal (times counted from its first sample). Only one block plus one segment
+        overlap is held in memory.
+        """
+        nperseg, noverlap = SignalProcessor._segment_params(fs, nperseg, noverlap, window_ms)
+        step = nperseg - noverlap
+        carry = np.empty(0)
+        offset = 0  # Sample index of carry[0]
+        for data, _ in chunks:
+            buf = np.concatenate([carry, data]) if len(carry) else np.asarray(data, dtype=float)
+            segments = (len(buf) - noverlap) // step if len(buf) >= nperseg else 0
+            if segments > 0:
+                used = (segments - 1) * step + nperseg
+                freq, times, Sxx = spectrogram(buf[:used], fs, nperseg=nperseg, noverlap=noverlap, nfft=nfft)
+                yield freq, times + offset / fs, Sxx
+                offset += segments * step
+                buf = buf[segments * step:]
+            carry = buf
 
     @staticmethod
     def norm_signal(data, width):
@@ -156,8 +186,8 @@ class SignalProcessor:
         #     print("  time_array is None or empty")
 
         # Time slicing
-        idx_ti = np.searchsorted(time_array, t_start)
-        idx_tf = np.searchsorted(time_array, t_end)
+        idx_ti = time_index(time_array, t_start)
+        idx_tf = time_index(time_array, t_end)
         
         # print(f"  idx_ti={idx_ti}, idx_tf={idx_tf}, num_points={idx_tf - idx_ti}")
         
@@ -248,8 +278,8 @@ class SignalProcessor:
         t_start = min(t1, t2)
         t_end = max(t1, t2)
         
-        idx_ti = np.searchsorted(time_array, t_start)
-        idx_tf = np.searchsorted(time_array, t_end)
+        idx_ti = time_index(time_array, t_start)
+        idx_tf = time_index(time_array, t_end)
         
         if idx_tf <= idx_ti:
             return None, None
@@ -285,6 +315,32 @@ class SignalProcessor:
              
         return angles, dphase
 
+    @staticmethod
+    def calculate_phase_cycle(filtered_data_T, idx, excluded_channels=[]):
+        """
+        Phase of every channel against the reference channel at one sample.
+        
+        Args:
+            filtered_data_T: (Time, Channels) band filtered data (compute_wavelet_data).
+            idx: Sample index.
+            excluded_channels: list of int identifiers (1-based) to leave out; the first
+                               good channel is the reference.
+            
+        Returns:
+            channels (np.array): 1-based channel numbers.
+            phase_diffs (np.array): arctan2(channel, reference) in degrees.
+        """
+        vals_all = filtered_data_T[idx, :] # Array (Channels)
+        good = channel_mask(len(vals_all), excluded_channels)
+        if not good.any():
+            return None, None
+        vals = select_channels(vals_all, good)
+        
+        # arctan2(y, x)
+        phase_diffs = np.arctan2(vals, vals[0]) * 180 / np.pi
+        channels = np.flatnonzero(good) + 1
+        return channels, phase_diffs
+
     @staticmethod
     def calculate_phase_diffs_robust(peaks_list, p1, p2, fbase, num_coils=12, excluded_channels=[]):
         """
@@ -466,11 +522,15 @@ class SignalProcessor:
         return np.array(all_times), np.array(all_channels), np.array(all_amps)
 
     @staticmethod
-    def compute_svd(data_matrix):
+    def compute_svd(data_matrix, excluded_channels=[]):
         """
         Computes SVD of the data matrix.
         Args:
             data_matrix: (Channels, Time)
+            excluded_channels: list of int identifiers (1-based) left out of the
+                               decomposition; their rows of U are zero. Unless the good
+                               channels form one block, this copies the good rows once
+                               (np.linalg.svd copies its input as well).
         Returns:
             U, S, VT
             U: (Channels, Channels) - Spatial Modes (columns)
@@ -483,8 +543,14 @@ class SignalProcessor:
         # SVD
         # Input: (Channels, Time)
         # U -> (Channels, K), S -> (K,), VT -> (K, Time)
+        good = channel_mask(data_matrix.shape[0], excluded_channels)
         try:
-            U, S, VT = np.linalg.svd(data_matrix, full_matrices=False)
+            U, S, VT = np.linalg.svd(select_channels(data_matrix, good), full_matrices=False)
+            if not good.all():
+                # Back to one row per coil, excluded coils do not move
+                U_all = np.zeros((len(good), U.shape[1]), dtype=U.dtype)
+                U_all[good] = U
+                U = U_all
             return U, S, VT
         except Exception as e:
             print(f"SVD Error: {e}")
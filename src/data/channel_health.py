@@ -0,0 +1,137 @@
+# src/data/channel_health.py
+import numpy as np
+import scipy.signal as sigproc
+from src.utils.config_manager import config_manager
+
+# Load Config
+_health_conf = config_manager.get_config("analysis", {}).get("channel_health", {})
+
+
+class ChannelHealth:
+    """
+    Per-channel quality of one (channels, time) matrix, see screen_channels().
+
+    rms: AC RMS per channel.
+    clip_fraction: Fraction of samples held on the channel's min/max rail (runs of at
+                   least clip_min_run equal samples at the extreme).
+    flat_run: Longest run of identical consecutive samples.
+    snr_db: In-band power over the out-of-band noise floor (dB).
+    excluded: Boolean mask of channels left out of SVD and phase fits; good is its inverse.
+    reasons: Per channel, the checks it failed (empty when good).
+    """
+
+    def __init__(self, rms, clip_fraction, flat_run, snr_db, excluded, reasons, names=None):
+        self.rms = rms
+        self.clip_fraction = clip_fraction
+        self.flat_run = flat_run
+        self.snr_db = snr_db
+        self.excluded = excluded
+        self.good = ~excluded
+        self.reasons = reasons
+        self.names = list(names) if names is not None else [f"Ch{i + 1}" for i in range(len(rms))]
+        self.excluded.flags.writeable = False
+        self.good.flags.writeable = False
+
+    def excluded_channels(self):
+        """1-based channel numbers of the excluded channels (as used by the phase fits)."""
+        return [int(i) + 1 for i in np.flatnonzero(self.excluded)]
+
+    def summary(self):
+        parts = [f"{self.names[i]} ({', '.join(self.reasons[i])})" for i in np.flatnonzero(self.excluded)]
+        return "all channels good" if not parts else "excluded " + ", ".join(parts)
+
+
+def _runs(equal):
+    """(row, length) of every run of True in a (channels, n) boolean matrix, in one pass."""
+    rows, n = equal.shape
+    padded = np.zeros((rows, n + 2), dtype=np.int8)
+    padded[:, 1:-1] = equal
+    # Run edges of all rows at once; the zero padding keeps runs from crossing rows
+    edges = np.diff(padded.ravel())
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return starts // (n + 2), ends - starts
+
+
+def _longest_runs(equal):
+    """Longest run of True per row of a (channels, n) boolean matrix."""
+    row, length = _runs(equal)
+    longest = np.zeros(equal.shape[0], dtype=np.int64)
+    np.maximum.at(longest, row, length)
+    return longest
+
+
+def screen_channels(data, fs, names=None, band=None):
+    """
+    Screens every channel of data (channels, time) for dead, saturated, stuck or
+    disconnected coils in one vectorized pass over the whole matrix:
+    RMS against the median channel (dead_rms_ratio), samples held on the rails
+    (max_clip_fraction of samples in runs of clip_min_run or more equal values at the
+    channel's max/min; a clean waveform only touches its extremes), flat-line runs
+    (max_flat_ms) and in-band SNR (min_snr_db, band_hz against the noise floor above
+    the band).
+    Thresholds come from config analysis.channel_health. Returns a ChannelHealth.
+    """
+    data = np.asarray(data)
+    n = data.shape[1]
+    band = band if band is not None else _health_conf.get("band_hz", [1000.0, 50000.0])
+
+    rms = data.std(axis=1)
+
+    clip_fraction = np.zeros(len(data))
+    flat_run = np.ones(len(data), dtype=np.int64)
+    if n > 1:
+        same = data[:, 1:] == data[:, :-1]
+        flat_run += _longest_runs(same)
+        # Repeats at the channel's own extreme: the digitiser (or amplifier) held the rail
+        rail = data[:, 1:] == data.max(axis=1)[:, None]
+        rail |= data[:, 1:] == data.min(axis=1)[:, None]
+        rail &= same
+        row, length = _runs(rail)
+        held = length + 1 >= _health_conf.get("clip_min_run", 3)
+        np.add.at(clip_fraction, row[held], length[held] + 1)
+        clip_fraction /= n
+
+    nperseg = min(n, _health_conf.get("nperseg", 1024))
+    freq, psd = sigproc.welch(data, fs=fs, nperseg=nperseg, axis=-1)
+    in_band = (freq >= band[0]) & (freq <= band[1])
+    noise = freq > band[1]
+    if not noise.any():
+        noise = ~in_band
+    with np.errstate(divide="ignore", invalid="ignore"):
+        snr_db = 10 * np.log10(psd[:, in_band].mean(axis=1) / np.median(psd[:, noise], axis=1))
+    snr_db = np.nan_to_num(snr_db, nan=-np.inf, posinf=np.inf)
+
+    checks = [
+        ("dead", rms < _health_conf.get("dead_rms_ratio", 0.1) * np.median(rms)),
+        ("saturated", clip_fraction > _health_conf.get("max_clip_fraction", 0.01)),
+        ("flat", flat_run > _health_conf.get("max_flat_ms", 1.0) * 1e-3 * fs),
+        ("low SNR", snr_db < _health_conf.get("min_snr_db", 6.0)),
+    ]
+    failed = np.array([mask for _, mask in checks])
+    reasons = [[checks[k][0] for k in np.flatnonzero(failed[:, i])] for i in range(len(data))]
+    return ChannelHealth(rms, clip_fraction, flat_run, snr_db, failed.any(axis=0), reasons, names)
+
+
+def select_channels(matrix, good, axis=0):
+    """
+    The channels of matrix (along axis) where good is True, as a copy. The copy is
+    skipped when nothing is excluded (matrix itself is returned) or when the good
+    channels form one block (a slice of matrix).
+    """
+    if good is None or np.all(good):
+        return matrix
+    index = np.flatnonzero(good)
+    if len(index) and index[-1] - index[0] + 1 == len(index):
+        block = [slice(None)] * np.ndim(matrix)
+        block[axis] = slice(index[0], index[-1] + 1)
+        return matrix[tuple(block)]
+    return np.take(matrix, index, axis=axis)
+
+
+def channel_mask(num_channels, excluded_channels=()):
+    """Boolean mask of the good channels from 1-based excluded channel numbers."""
+    good = np.ones(num_channels, dtype=bool)
+    excluded = [ch - 1 for ch in excluded_channels if 1 <= ch <= num_channels]
+    good[excluded] = False
+    return good
@@ -0,0 +1,150 @@
+# src/data/fetch_orchestrator.py
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src.data.loader import _Progress, _load_workers
+from src.utils.config_manager import config_manager
+_sys_config = config_manager.get_config("system",{})
+
+# Reads in flight per data source (config system.fetch_limits); sources not listed use load_workers
+FETCH_LIMITS = {"Text file": 4, "DAQ SV.": 4}
+
+
+class _SourceLimiter:
+    """Semaphore of one data source where critical requests go before background ones."""
+
+    def __init__(self, limit):
+        self.limit = max(1, int(limit))
+        self.active = 0
+        self.critical_waiting = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self, critical):
+        async with self._condition:
+            if critical:
+                self.critical_waiting += 1
+            try:
+                await self._condition.wait_for(
+                    lambda: self.active < self.limit and (critical or not self.critical_waiting))
+            finally:
+                if critical:
+                    self.critical_waiting -= 1
+            self.active += 1
+
+    async def release(self):
+        async with self._condition:
+            self.active -= 1
+            self._condition.notify_all()
+
+
+class FetchOrchestrator:
+    """
+    Issues the signal reads of one or more shots concurrently.
+
+    Requests are (bundle, names) pairs on ShotBundles of any data source (text files,
+    archives, MDSplus). One asyncio loop in a background thread schedules every signal as
+    its own job, limited per source (method) so local disk and the MDSplus server are
+    used in parallel without overloading either. The blocking reads run in a thread pool
+    and land in the bundles, so background requests keep loading after fetch() returns
+    and are later served from memory. Critical requests take free slots first.
+    MDSplus requests in batch mode stay one job, to keep the GetMany round trip.
+    """
+
+    def __init__(self, limits=None):
+        self.limits = dict(FETCH_LIMITS)
+        self.limits.update(_sys_config.get("fetch_limits", {}))
+        self.limits.update(limits or {})
+        self._loop = None
+        self._executor = None
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._executor = ThreadPoolExecutor(max_workers=sum(self.limits.values()) or 1,
+                                                    thread_name_prefix="Fetch")
+                threading.Thread(target=self._loop.run_forever, name="FetchOrchestrator", daemon=True).start()
+            return self._loop
+
+    def _limiter(self, source):
+        # Only used on the loop thread
+        limiter = self._limiters.get(source)
+        if limiter is None:
+            limiter = self._limiters[source] = _SourceLimiter(self.limits.get(source, _load_workers()))
+        return limiter
+
+    @staticmethod
+    def _jobs(bundle, names):
+        names = list(dict.fromkeys(names))
+        if bundle.path is None and _sys_config.get("mds_batch", False):
+            return [names] if names else []
+        return [[name] for name in names]
+
+    async def _run_job(self, bundle, names, critical, limit, counter, deadline):
+        limiter = self._limiter(bundle.method)
+        await limiter.acquire(critical)
+        try:
+            if limit is not None:
+                await limit.acquire()
+            try:
+                if counter.cancelled() or (deadline is not None and deadline.stopped()):
+                    return {name: (None, None) for name in names}
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    self._executor, lambda: bundle.get_many(names, workers=1, progress=lambda d, t, n: counter.step(n),
+                                                            cancel_event=counter.cancel_event, deadline=deadline))
+            finally:
+                if limit is not None:
+                    limit.release()
+        finally:
+            await limiter.release()
+
+    async def _run_request(self, bundle, names, critical, workers, counter, deadline):
+        limit = asyncio.Semaphore(workers) if workers is not None else None
+        parts = await asyncio.gather(*(self._run_job(bundle, job, critical, limit, counter, deadline)
+                                       for job in self._jobs(bundle, names)))
+        result = {}
+        for part in parts:
+            result.update(part)
+        return {name: result.get(name, (None, None)) for name in names}
+
+    def submit(self, bundle, names, critical=False, workers=None, progress=None, cancel_event=None, deadline=None):
+        """
+        Starts loading names into bundle and returns a concurrent.futures.Future of
+        {name: (raw_data, prof_time)}.
+        workers: Optional limit of this request's reads in flight (on top of the source limit).
+        progress: Optional callback progress(done, total, name), called from reader threads.
+        cancel_event: Optional threading.Event; signals not started yet are skipped (None, None).
+        deadline: Optional MDSplus time limit of the whole request (loader._Deadline, closed by
+                  the caller); every job reads against it and jobs not started once it expired
+                  are skipped.
+        """
+        names = list(names)
+        counter = _Progress(progress, len(names), cancel_event)
+        workers = _load_workers(workers) if workers is not None else None
+        return asyncio.run_coroutine_threadsafe(self._run_request(bundle, names, critical, workers, counter, deadline),
+                                                self._ensure_loop())
+
+    def fetch(self, requests, background=(), workers=None, progress=None, cancel_event=None):
+        """
+        Loads every request concurrently and returns once the critical ones arrived.
+        requests: [(bundle, names)] the caller waits for (the critical path).
+        background: [(bundle, names)] loaded alongside at lower priority, not waited for.
+        progress: Optional callback progress(done, total, name) over the critical signals.
+        Returns one {name: (raw_data, prof_time)} per request, in order.
+        Latency is that of the slowest critical read, not the sum of all reads.
+        """
+        requests = [(bundle, list(names)) for bundle, names in requests]
+        counter = _Progress(progress, sum(len(names) for _, names in requests), cancel_event)
+        step = lambda done, total, name: counter.step(name)
+        futures = [self.submit(bundle, names, critical=True, workers=workers, progress=step, cancel_event=cancel_event)
+                   for bundle, names in requests]
+        for bundle, names in background:
+            self.submit(bundle, names, cancel_event=cancel_event)
+        return [future.result() for future in futures]
+
+
+# Shared by the loaders and the main window
+fetch_orchestrator = FetchOrchestrator()
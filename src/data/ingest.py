@@ -0,0 +1,215 @@
+# src/data/ingest.py
+import os
+import threading
+import time
+from src.data.loader import load_txt_data
+from src.data.analysis import SignalProcessor
+from src.data.shot_catalog import shot_catalog, _shot_number
+from src.data.shot_archive import is_archive, open_archive
+from src.data.tt1_reader import is_zip_shot, list_tt1_files
+from src.utils.config_manager import config_manager
+_sys_config = config_manager.get_config("system",{})
+
+
+def shot_stamp(path):
+    """
+    Stamp of a shot folder (count, total size and newest mtime of its TT1 files) or
+    archive/zip (size and mtime), as (stamp string, newest mtime in s). ("", 0) if unreadable.
+    """
+    try:
+        if is_archive(path) or is_zip_shot(path):
+            st = os.stat(path)
+            return f"{st.st_size}:{st.st_mtime_ns}", st.st_mtime
+        count = size = newest = 0
+        for txt_path in list_tt1_files(path).values():
+            st = os.stat(txt_path)
+            count += 1
+            size += st.st_size
+            newest = max(newest, st.st_mtime_ns)
+    except (OSError, ValueError):
+        return "", 0
+    return (f"{count}:{size}:{newest}", newest / 1e9) if count else ("", 0)
+
+
+def stored_summary(path, ip_signal, catalog=None):
+    """
+    Summary of a shot for ip_signal as stored by the ingester (see ShotCatalog.summary),
+    or None if there is none or the shot changed since it was ingested.
+    """
+    catalog = catalog if catalog is not None else shot_catalog
+    try:
+        summary = catalog.summary(path, ip_signal)
+    except Exception as e:
+        print(f"Reading the summary of {path} failed: {e}")
+        return None
+    if summary is None or summary["duration"] is None or summary["stamp"] != shot_stamp(path)[0]:
+        return None
+    return summary
+
+
+class ShotIngester:
+    """
+    Watches a data root for newly arriving shots and ingests them in the background.
+
+    The root is polled (no file system notifications or services needed). A shot
+    folder/archive is ingested once its stamp (see shot_stamp) has stopped changing
+    for `settle` seconds, i.e. the DAQ has finished writing it: every signal is
+    converted to the .npy sidecar cache, its headers go into the shot catalog and the
+    summary quantities (plasma duration, IP max) of every available IP signal are
+    stored there, so the shot later opens from the cache without parsing text or
+    recomputing them. Shots that are already summarized with
+    the same stamp are skipped; at start only shots modified within backfill_hours are
+    ingested (None: all of them). on_ingested callbacks are called from the ingest
+    thread as callback(shot, path, summary).
+    """
+
+    def __init__(self, interval=None, settle=None, backfill_hours=None, ip_signals=None, catalog=None):
+        self.interval = float(interval if interval is not None else _sys_config.get("ingest_interval", 5))
+        self.settle = float(settle if settle is not None else _sys_config.get("ingest_settle", 2))
+        self.backfill_hours = backfill_hours if backfill_hours is not None else _sys_config.get("ingest_backfill_hours", 24)
+        self.ip_signals = list(ip_signals if ip_signals is not None else _sys_config.get("ingest_ip_signals", ["IP2", "IP1"]))
+        self.catalog = catalog if catalog is not None else shot_catalog
+        self.enabled = _sys_config.get("ingest", True)
+        self.on_ingested = []
+        self.root = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._pending = {}  # path -> (stamp, first seen with that stamp)
+        self._done = None  # path -> stamp of the ingested shots of root
+
+    def start(self, root):
+        """Starts watching root (restarts the watch if another root was watched)."""
+        root = os.path.abspath(root)
+        if not self.enabled or not os.path.isdir(root):
+            return
+        with self._lock:
+            if self.root == root and self._thread is not None and self._thread.is_alive():
+                return
+        self.stop(wait=True)
+        with self._lock:
+            self.root = root
+            self._pending = {}
+            self._done = None
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(self._stop,), name="ShotIngest", daemon=True)
+            self._thread.start()
+
+    def stop(self, wait=False):
+        """Stops watching; a running conversion stops after its current signal."""
+        with self._lock:
+            self._stop.set()
+            thread = self._thread
+        if wait and thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def is_running(self):
+        with self._lock:
+            return self._thread is not None and self._thread.is_alive()
+
+    def _run(self, stop):
+        while not stop.is_set():
+            try:
+                self.poll(stop_event=stop)
+            except Exception as e:
+                print(f"Ingest of {self.root} failed: {e}")
+            stop.wait(self.interval)
+
+    def poll(self, root=None, now=None, stop_event=None):
+        """
+        One pass over the root: ingests every new or changed shot that has settled.
+        Returns the paths ingested in this pass.
+        """
+        if root is not None and os.path.abspath(root) != self.root:
+            self.root, self._pending, self._done = os.path.abspath(root), {}, None
+        now = time.time() if now is None else now
+        if self._done is None:
+            self._done = {path: s["stamp"] for path, s in self.catalog.summaries(self.root).items()}
+        try:
+            candidates = [e.path for e in os.scandir(self.root)
+                          if _shot_number(e.path) is not None and (e.is_dir() or is_archive(e.path) or is_zip_shot(e.path))]
+        except OSError:
+            return []
+
+        ingested = []
+        for path in sorted(candidates, key=_shot_number):
+            if stop_event is not None and stop_event.is_set():
+                break
+            stamp, mtime = shot_stamp(path)
+            if not stamp or self._done.get(path) == stamp:
+                self._pending.pop(path, None)
+                continue
+            if path not in self._done and self.backfill_hours is not None and not self._pending.get(path) \
+                    and now - mtime > self.backfill_hours * 3600:
+                # Old shot that was never ingested: leave it to the on-demand loaders
+                self._done[path] = stamp
+                continue
+            seen = self._pending.get(path)
+            if seen is None or seen[0] != stamp:
+                self._pending[path] = (stamp, now)
+                seen = self._pending[path]
+            if now - seen[1] < self.settle:
+                continue
+            if self.ingest(path, stamp, stop_event=stop_event) is not None:
+                ingested.append(path)
+        for path in set(self._pending) - set(candidates):
+            del self._pending[path]
+        return ingested
+
+    def ingest(self, path, stamp=None, stop_event=None):
+        """
+        Converts one shot folder/archive to the binary cache, catalogs it and stores its
+        summaries. Returns the summary dict of the preferred IP signal, or None if it was
+        stopped or failed.
+        """
+        path = os.path.abspath(path)
+        shot = _shot_number(path)
+        stamp = stamp if stamp is not None else shot_stamp(path)[0]
+        try:
+            if is_archive(path):
+                # Archives are binary already, only the IP signals are read for the summaries
+                names = open_archive(path).signals()
+                params = [name for name in self.ip_signals if name in names]
+            else:
+                names = list(list_tt1_files(path))
+                ip = [name for name in self.ip_signals if name in names]
+                params = ip + [name for name in names if name not in ip]
+                if not params:
+                    return None  # Unreadable (e.g. half-copied) zip
+            data = load_txt_data(shot, params, base_path=path, workers=1, use_cache=True, cancel_event=stop_event)
+        except (OSError, ValueError) as e:
+            print(f"Ingest of shot {shot} failed: {e}")
+            return None
+        if stop_event is not None and stop_event.is_set():
+            return None
+
+        self.catalog.scan_shot(path)
+        summaries = []
+        for ip_signal in self.ip_signals:
+            ip_data, ip_time = data.get(ip_signal, (None, None))
+            if ip_data is None:
+                continue
+            duration, ip_max, start_idx = SignalProcessor.cal_duration(ip_data, ip_time)
+            summary = {"ip_signal": ip_signal, "duration": float(duration), "ip_max": float(ip_max),
+                       "t_start": None, "t_end": None, "stamp": stamp}
+            if ip_max:
+                summary.update(t_start=float(ip_time[start_idx]), t_end=float(ip_time[start_idx] + duration))
+            summaries.append(summary)
+        if not summaries:
+            summaries.append({"ip_signal": None, "duration": None, "ip_max": None, "t_start": None, "t_end": None, "stamp": stamp})
+        summary = summaries[0]
+        self.catalog.set_summaries(path, summaries)
+        if self._done is not None:
+            self._done[path] = stamp
+        self._pending.pop(path, None)
+        print(f"Ingested shot {shot} ({len(data)} signals)")
+        for callback in list(self.on_ingested):
+            try:
+                callback(shot, path, summary)
+            except Exception as e:
+                print(f"Ingest callback failed: {e}")
+        return summary
+
+
+# Global ingester used by the main window
+shot_ingester = ShotIngester()
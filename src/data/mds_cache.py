@@ -0,0 +1,183 @@
+# src/data/mds_cache.py
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import numpy as np
+from src.utils.config_manager import config_manager
+_sys_config = config_manager.get_config("system",{})
+
+
+def _default_cache_dir():
+    path = _sys_config.get("mds_cache_dir", "cache/mds")
+    if not os.path.isabs(path):
+        path = os.path.join(config_manager.base_path, path)
+    return path
+
+
+class MDSSignalCache:
+    """
+    Local on-disk cache for signals fetched from MDSplus.
+
+    Entries are keyed by (server, tree, shot, signal) and point to content-addressed
+    blobs (<sha1>.npy), so a time axis shared by many channels is stored once.
+    An SQLite index keeps the access time of every entry; when the blobs exceed
+    max_bytes the least recently used entries are evicted. Cached arrays are returned
+    as read-only memory maps.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.cache_dir = cache_dir if cache_dir else _default_cache_dir()
+        if max_bytes is None:
+            max_bytes = int(_sys_config.get("mds_cache_max_mb", 2048) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def _connect(self):
+        if not self._ready:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        db = sqlite3.connect(os.path.join(self.cache_dir, "index.sqlite"), timeout=30)
+        if not self._ready:
+            db.executescript("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    server TEXT, tree TEXT, shot INTEGER, signal TEXT,
+                    data_hash TEXT, time_hash TEXT, last_access REAL,
+                    PRIMARY KEY (server, tree, shot, signal));
+                CREATE TABLE IF NOT EXISTS blobs (hash TEXT PRIMARY KEY, size INTEGER);
+            """)
+            self._ready = True
+        return db
+
+    def _blob_path(self, digest):
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.npy")
+
+    def get_many(self, server, tree, shot, signals):
+        """Returns {signal: (raw_data, prof_time)} for the cached signals (misses are left out)."""
+        hits = {}
+        with self._lock:
+            db = self._connect()
+            try:
+                rows = db.execute(
+                    f"SELECT signal, data_hash, time_hash FROM entries WHERE server=? AND tree=? AND shot=? "
+                    f"AND signal IN ({','.join('?' * len(signals))})",
+                    (server, tree, shot, *signals)).fetchall()
+                blobs = {}
+                for signal, data_hash, time_hash in rows:
+                    try:
+                        for digest in (data_hash, time_hash):
+                            if digest not in blobs:
+                                blobs[digest] = np.load(self._blob_path(digest), mmap_mode="r")
+                    except (OSError, ValueError):
+                        continue  # Blob removed behind our back, treat as a miss
+                    hits[signal] = (blobs[data_hash], blobs[time_hash])
+                if hits:
+                    now = time.time()
+                    db.executemany("UPDATE entries SET last_access=? WHERE server=? AND tree=? AND shot=? AND signal=?",
+                                   [(now, server, tree, shot, s) for s in hits])
+                    db.commit()
+            finally:
+                db.close()
+        return hits
+
+    def put_many(self, server, tree, shot, results):
+        """Stores {signal: (raw_data, prof_time)}; failed signals (None) are skipped."""
+        digests = {}  # id(array) -> hash, shared time arrays are hashed once
+        rows = []
+        with self._lock:
+            db = self._connect()
+            try:
+                for signal, (raw_data, prof_time) in results.items():
+                    if raw_data is None or prof_time is None:
+                        continue
+                    hashes = []
+                    for array in (raw_data, prof_time):
+                        if id(array) not in digests:
+                            digests[id(array)] = self._store_blob(db, np.asarray(array))
+                        hashes.append(digests[id(array)])
+                    rows.append((server, tree, shot, signal, hashes[0], hashes[1], time.time()))
+                db.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                db.commit()
+                self._evict(db)
+            finally:
+                db.close()
+
+    def _store_blob(self, db, array):
+        digest = hashlib.sha1(f"{array.dtype.str}{array.shape}".encode() + np.ascontiguousarray(array).tobytes()).hexdigest()
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, array)
+            os.replace(tmp_path, path)
+        db.execute("INSERT OR REPLACE INTO blobs VALUES (?, ?)", (digest, os.path.getsize(path)))
+        return digest
+
+    def _evict(self, db):
+        """
+        Drops least recently used entries until the blobs fit in max_bytes. Blobs whose
+        file cannot be removed (e.g. open elsewhere) stay accounted for and are retried
+        on the next eviction.
+        """
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        stuck = set()
+        total -= self._drop_orphans(db, stuck)  # Left over by an earlier eviction
+        for server, tree, shot, signal in db.execute(
+                "SELECT server, tree, shot, signal FROM entries ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            db.execute("DELETE FROM entries WHERE server=? AND tree=? AND shot=? AND signal=?", (server, tree, shot, signal))
+            total -= self._drop_orphans(db, stuck)
+        db.commit()
+
+    def _drop_orphans(self, db, stuck):
+        """Removes the blobs no entry refers to; returns the bytes freed. stuck: hashes not to retry."""
+        freed = 0
+        orphans = db.execute(
+            "SELECT hash, size FROM blobs WHERE hash NOT IN (SELECT data_hash FROM entries) "
+            "AND hash NOT IN (SELECT time_hash FROM entries)").fetchall()
+        for digest, size in orphans:
+            if digest in stuck:
+                continue
+            try:
+                os.remove(self._blob_path(digest))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Could not remove cached blob {digest}: {e}")
+                stuck.add(digest)
+                continue
+            db.execute("DELETE FROM blobs WHERE hash=?", (digest,))
+            freed += size
+        return freed
+
+    def total_bytes(self):
+        with self._lock:
+            db = self._connect()
+            try:
+                return db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+            finally:
+                db.close()
+
+    def clear(self):
+        with self._lock:
+            db = self._connect()
+            try:
+                for (digest,) in db.execute("SELECT hash FROM blobs").fetchall():
+                    try:
+                        os.remove(self._blob_path(digest))
+                    except OSError:
+                        pass
+                db.execute("DELETE FROM entries")
+                db.execute("DELETE FROM blobs")
+                db.commit()
+            finally:
+                db.close()
+
+
+# Global cache used by the loader
+mds_cache = MDSSignalCache()
@@ -0,0 +1,181 @@
+# src/data/mds_pool.py
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from mdsthin import Connection
+from src.utils.config_manager import config_manager
+_sys_config = config_manager.get_config("system",{})
+
+
+class PooledConnection:
+    """
+    An mdsthin connection owned by the pool, plus the tree it currently has open.
+    The tree stays open between calls so repeated fetches of the same shot skip openTree.
+    """
+
+    def __init__(self, con, address):
+        self.con = con
+        self.address = address
+        self.tree = None  # (tree, shot) currently open
+        self.broken = False
+        self.last_used = time.monotonic()
+        self.last_checked = self.last_used
+
+    def open_tree(self, tree, shot):
+        if self.tree == (tree, shot):
+            return
+        self.close_tree()
+        self.con.openTree(tree, shot)
+        self.tree = (tree, shot)
+
+    def close_tree(self):
+        if self.tree is not None:
+            tree, shot = self.tree
+            self.tree = None
+            self.con.closeTree(tree, shot)
+
+    def get(self, expr, *args):
+        return self.con.get(expr, *args)
+
+    def settimeout(self, seconds):
+        """Timeout of every socket operation of the following requests (None blocks)."""
+        sock = getattr(self.con, "_socket", None)  # mdsthin keeps its socket here
+        if sock is not None:
+            sock.settimeout(seconds)
+
+    def abort(self):
+        """
+        Makes a request blocked in another thread fail at once (e.g. on cancel).
+        The connection is discarded afterwards.
+        """
+        self.broken = True
+        sock = getattr(self.con, "_socket", None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def get_many(self):
+        return self.con.getMany()
+
+    def close(self):
+        try:
+            self.close_tree()
+        except Exception:
+            pass
+        try:
+            self.con.disconnect()
+        except Exception:
+            pass
+
+
+class MDSConnectionPool:
+    """
+    Pool of MDSplus connections keyed by "host:port".
+
+    - Idle connections are reused, newest first, so a warm connection with its tree open is preferred.
+    - Connections idle longer than idle_timeout (s) are closed.
+    - Connections idle longer than health_check_interval (s) are pinged before reuse and
+      replaced if the ping fails.
+    - Connections that raised a socket error (OSError) are discarded instead of returned.
+    - New connections and health checks time out after connect_timeout (s).
+    - Every borrowed connection starts with the socket timeout request_timeout (s), whatever
+      timeout its previous borrower left set (e.g. the rest of a load deadline).
+    """
+
+    def __init__(self, connection_factory=None, idle_timeout=None, health_check_interval=None, max_idle_per_host=None,
+                 connect_timeout=None, request_timeout=None):
+        self.connect_timeout = connect_timeout if connect_timeout is not None else _sys_config.get("mds_connect_timeout", 5)
+        self.request_timeout = request_timeout if request_timeout is not None else _sys_config.get("mds_request_timeout", 20)
+        self._factory = connection_factory if connection_factory else (
+            lambda address: Connection(address, timeout=self.connect_timeout))
+        self.idle_timeout = idle_timeout if idle_timeout is not None else _sys_config.get("mds_idle_timeout", 300)
+        self.health_check_interval = health_check_interval if health_check_interval is not None else _sys_config.get("mds_health_check_interval", 30)
+        self.max_idle_per_host = max_idle_per_host if max_idle_per_host is not None else _sys_config.get("mds_max_idle_per_host", 4)
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self, address):
+        """
+        Borrows a connection to address for the duration of the with-block.
+        Usage:
+            with mds_pool.connection("127.0.0.1:8000") as con:
+                con.open_tree("tt1", shotno)
+                con.get("IP1")
+        """
+        entry = self._acquire(address)
+        try:
+            yield entry
+        except OSError:
+            entry.broken = True
+            raise
+        finally:
+            self._release(entry)
+
+    def _acquire(self, address):
+        while True:
+            now = time.monotonic()
+            self._close_expired(now)
+            with self._lock:
+                idle = self._idle.get(address)
+                entry = idle.pop() if idle else None
+            if entry is None:
+                entry = PooledConnection(self._factory(address), address)
+            elif not (now - entry.last_checked < self.health_check_interval or self._healthy(entry)):
+                entry.close()
+                continue
+            entry.settimeout(self.request_timeout or None)
+            return entry
+
+    def _healthy(self, entry):
+        try:
+            entry.settimeout(self.connect_timeout)
+            entry.con.get("1")
+        except Exception:
+            return False
+        entry.last_checked = time.monotonic()
+        return True
+
+    def _release(self, entry):
+        if entry.broken:
+            entry.close()
+            return
+        entry.last_used = time.monotonic()
+        with self._lock:
+            idle = self._idle.setdefault(entry.address, [])
+            idle.append(entry)
+            surplus = idle[:-self.max_idle_per_host] if self.max_idle_per_host > 0 else list(idle)
+            del idle[:len(surplus)]
+        for old in surplus:
+            old.close()
+
+    def _close_expired(self, now):
+        expired = []
+        with self._lock:
+            for idle in self._idle.values():
+                keep = [e for e in idle if now - e.last_used <= self.idle_timeout]
+                expired.extend(e for e in idle if now - e.last_used > self.idle_timeout)
+                idle[:] = keep
+        for entry in expired:
+            entry.close()
+
+    def idle_count(self, address=None):
+        with self._lock:
+            if address is not None:
+                return len(self._idle.get(address, []))
+            return sum(len(idle) for idle in self._idle.values())
+
+    def close_all(self):
+        """Closes every idle connection (e.g. on application exit)."""
+        with self._lock:
+            entries = [e for idle in self._idle.values() for e in idle]
+            self._idle = {}
+        for entry in entries:
+            entry.close()
+
+
+# Global pool used by the loader
+mds_pool = MDSConnectionPool()
@@ -0,0 +1,124 @@
+# src/data/prefetch.py
+import os
+import threading
+from src.data.loader import fetch_mhd_data
+from src.data.shot_cache import shot_cache
+from src.data.shot_archive import is_archive, ARCHIVE_EXT
+from src.utils.config_manager import config_manager
+_sys_config = config_manager.get_config("system",{})
+
+
+def neighbour_shots(shotno, depth):
+    """Shots to prefetch around shotno, nearest first: N+1, N-1, N+2, N-2, ..."""
+    shots = []
+    for k in range(1, depth + 1):
+        shots.extend(s for s in (shotno + k, shotno - k) if s > 0)
+    return shots
+
+
+def neighbour_path(base_path, shotno, neighbour):
+    """
+    Data directory of a neighbouring shot for the text method.
+    Shot folders (and .tt1z archives) are named after the shot (e.g. data/1275), so the
+    neighbour is the sibling entry; returns None if base_path is not named after the
+    shot or the sibling is missing.
+    """
+    if not base_path:
+        return None
+    path = os.path.abspath(base_path)
+    name, ext = os.path.basename(path), ""
+    if is_archive(path):
+        name, ext = name[:-len(ARCHIVE_EXT)], ARCHIVE_EXT
+    if name != str(shotno):
+        return None
+    sibling = os.path.join(os.path.dirname(path), f"{neighbour}{ext}")
+    return sibling if (os.path.isfile(sibling) if ext else os.path.isdir(sibling)) else None
+
+
+class ShotPrefetcher:
+    """
+    Loads the shots around the displayed one into the shot cache in the background.
+
+    One prefetch thread runs at a time and loads the neighbours nearest first with a
+    single loader worker, at background priority in the fetch orchestrator. It stops
+    when depth is exhausted, when the prefetched data would exceed budget_bytes, or
+    when the next shot would evict something from the shot cache (so the displayed
+    shot is never pushed out). A foreground load calls
+    cancel() first; the running prefetch then stops after its current channel.
+    """
+
+    def __init__(self, depth=None, budget_bytes=None, cache=None, fetch=None):
+        if depth is None:
+            depth = int(_sys_config.get("prefetch_depth", 2))
+        if budget_bytes is None:
+            budget_bytes = int(_sys_config.get("prefetch_budget_mb", 256) * 1024 * 1024)
+        self.depth = depth
+        self.budget_bytes = budget_bytes
+        self.cache = cache if cache is not None else shot_cache
+        self.fetch = fetch if fetch is not None else fetch_mhd_data
+        # Prefetched shots live in the shot cache, so there is nothing to gain without it
+        self.enabled = _sys_config.get("prefetch", True) and _sys_config.get("shot_cache", True)
+        self._thread = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    def schedule(self, shotno, method, mode, suffix='T', ip_signal='IP2', base_path=None, estimate_bytes=0):
+        """
+        Starts prefetching the neighbours of shotno (replaces any running prefetch).
+        estimate_bytes: Size of one shot (e.g. the one just loaded) used for the budget.
+        """
+        if not self.enabled or self.depth <= 0:
+            return
+        self.cancel(wait=True)
+        jobs = []
+        for shot in neighbour_shots(shotno, self.depth):
+            if method == "DAQ SV.":
+                jobs.append((shot, None))
+            else:
+                path = neighbour_path(base_path, shotno, shot)
+                if path is not None:
+                    jobs.append((shot, path))
+        if not jobs:
+            return
+        with self._lock:
+            self._cancel = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run, args=(jobs, method, mode, suffix, ip_signal, estimate_bytes, self._cancel),
+                name="ShotPrefetch", daemon=True)
+            self._thread.start()
+
+    def cancel(self, wait=False):
+        """Stops the running prefetch; with wait=True blocks until its thread has exited."""
+        with self._lock:
+            self._cancel.set()
+            thread = self._thread
+        if wait and thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def is_running(self):
+        with self._lock:
+            return self._thread is not None and self._thread.is_alive()
+
+    def _run(self, jobs, method, mode, suffix, ip_signal, estimate, cancel):
+        prefetched = 0
+        for shot, path in jobs:
+            if cancel.is_set():
+                return
+            if prefetched + estimate > self.budget_bytes or self.cache.total_bytes() + estimate > self.cache.max_bytes:
+                return
+            before = self.cache.total_bytes()
+            try:
+                result = self.fetch(shot, method, mode, suffix=suffix, ip_signal=ip_signal, base_path=path,
+                                    workers=1, use_shot_cache=True, cancel_event=cancel, critical=False)
+            except Exception as e:
+                print(f"Prefetch of shot {shot} failed: {e}")
+                continue
+            if result[0] is None:
+                continue
+            added = max(self.cache.total_bytes() - before, 0)
+            prefetched += added
+            estimate = max(estimate, added)
+
+
+# Global prefetcher used by the main window
+shot_prefetcher = ShotPrefetcher()
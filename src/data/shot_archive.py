@@ -0,0 +1,252 @@
+# src/data/shot_archive.py
+import bz2
+import json
+import lzma
+import os
+import struct
+import threading
+import zlib
+import numpy as np
+from src.data.tt1_reader import read_tt1_signal
+from src.data.timebase import Timebase
+
+# Shot archive (.tt1z): all signals of a shot in one file, chunked and compressed.
+#
+#   MAGIC | chunk blobs ... | JSON index | index offset (<Q) | MAGIC
+#
+# The JSON index holds, per signal, the TT1 header, the (t0, dt, n) timebase, the encoding
+# and [offset, length] of every chunk of chunk_samples samples. Chunks are independent, so
+# a time window only decompresses the chunks it overlaps.
+ARCHIVE_EXT = ".tt1z"
+MAGIC = b"TT1Z\x01\n"
+FORMAT_VERSION = 1
+DEFAULT_CHUNK_SAMPLES = 1 << 12  # 20 ms at 200 kHz
+
+# Lossless stdlib codecs: (compress, decompress)
+CODECS = {
+    "zlib": (lambda data: zlib.compress(data, 6), zlib.decompress),
+    "bz2": (lambda data: bz2.compress(data, 9), bz2.decompress),
+    "lzma": (lambda data: lzma.compress(data, preset=6), lzma.decompress),
+    "none": (bytes, bytes),
+}
+
+_TRAILER = struct.Struct("<Q")
+
+
+def is_archive(path):
+    return bool(path) and str(path).endswith(ARCHIVE_EXT) and os.path.isfile(path)
+
+
+def _shuffle(array):
+    """Groups byte k of every element together (compresses much better than raw doubles)."""
+    return array.view(np.uint8).reshape(-1, array.itemsize).T.tobytes()
+
+
+def _unshuffle(data, dtype, count):
+    return np.frombuffer(data, dtype=np.uint8).reshape(np.dtype(dtype).itemsize, count).T.copy().view(dtype).ravel()
+
+
+def _fixed_point_scale(raw_data):
+    """
+    Number of decimals F such that raw_data == round(raw_data * 10**F) / 10**F bit for bit
+    (true for TT1 "%f" data), or None. Those signals are stored as int64 mantissas.
+    """
+    for decimals in range(10):
+        scale = 10 ** decimals
+        mantissa = np.round(raw_data * scale)
+        if np.any(np.abs(mantissa) >= 2 ** 53):
+            return None
+        if np.array_equal((mantissa.astype(np.int64) / scale).view(np.uint64), raw_data.view(np.uint64)):
+            return decimals
+    return None
+
+
+def _encode_chunk(values, decimals):
+    if decimals is None:
+        return _shuffle(np.ascontiguousarray(values, dtype="<f8"))
+    mantissa = np.round(values * 10 ** decimals).astype("<i8")
+    return _shuffle(np.diff(mantissa, prepend=np.int64(0)))  # Deltas, the first one is absolute
+
+
+def _decode_chunk(data, decimals, count):
+    if decimals is None:
+        return _unshuffle(data, "<f8", count)
+    mantissa = np.cumsum(_unshuffle(data, "<i8", count))
+    return mantissa / 10 ** decimals
+
+
+def write_shot_archive(shot_dir, archive_path=None, codec="zlib", chunk_samples=DEFAULT_CHUNK_SAMPLES, params=None):
+    """
+    Converts a TT1 shot directory (<shot_dir>/<signal>.txt) into one archive file.
+    archive_path: Output file (default: <shot_dir>.tt1z next to the directory).
+    params: Signals to include (default: every .txt of the directory).
+    Returns the archive path. Values are stored losslessly, reading them back gives the
+    same arrays as read_tt1_signal.
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec {codec}, use one of {sorted(CODECS)}")
+    shot_dir = os.path.abspath(shot_dir)
+    if archive_path is None:
+        archive_path = shot_dir.rstrip(os.sep) + ARCHIVE_EXT
+    if params is None:
+        params = sorted(e.name[:-4] for e in os.scandir(shot_dir) if e.is_file() and e.name.endswith(".txt"))
+    compress = CODECS[codec][0]
+
+    index = {"version": FORMAT_VERSION, "codec": codec, "chunk_samples": chunk_samples, "signals": {}}
+    tmp_path = f"{archive_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        for param in params:
+            try:
+                raw_data, timebase, header = read_tt1_signal(os.path.join(shot_dir, f"{param}.txt"))
+            except Exception as e:
+                print(f"Skipping {param}: {e}")
+                continue
+            decimals = _fixed_point_scale(raw_data)
+            chunks = []
+            for i in range(0, len(raw_data), chunk_samples):
+                blob = compress(_encode_chunk(raw_data[i:i + chunk_samples], decimals))
+                chunks.append([f.tell(), len(blob)])
+                f.write(blob)
+            index["signals"][param] = {"header": header, "timebase": list(timebase.key()),
+                                       "decimals": decimals, "chunks": chunks}
+        index_offset = f.tell()
+        f.write(json.dumps(index).encode("utf-8"))
+        f.write(_TRAILER.pack(index_offset))
+        f.write(MAGIC)
+    os.replace(tmp_path, archive_path)
+    return archive_path
+
+
+class ShotArchive:
+    """
+    Read access to a .tt1z shot archive. The index is read once on open; reads of a
+    time window decompress only the overlapping chunks. Safe to share between threads.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self._file = open(self.path, "rb")
+        self._lock = threading.Lock()
+        try:
+            self._read_index()
+        except Exception:
+            self._file.close()
+            raise
+
+    def _read_index(self):
+        f = self._file
+        size = os.fstat(f.fileno()).st_size
+        trailer = _TRAILER.size + len(MAGIC)
+        if size < len(MAGIC) + trailer or f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not a shot archive: {self.path}")
+        f.seek(size - trailer)
+        tail = f.read(trailer)
+        if tail[_TRAILER.size:] != MAGIC:
+            raise ValueError(f"Truncated shot archive: {self.path}")
+        index_offset = _TRAILER.unpack(tail[:_TRAILER.size])[0]
+        f.seek(index_offset)
+        index = json.loads(f.read(size - trailer - index_offset).decode("utf-8"))
+        if index.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported shot archive version {index.get('version')}: {self.path}")
+        self.codec = index["codec"]
+        self.chunk_samples = index["chunk_samples"]
+        self._signals = index["signals"]
+        self._decompress = CODECS[self.codec][1]
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def signals(self):
+        return list(self._signals)
+
+    def __contains__(self, name):
+        return name in self._signals
+
+    def header(self, name):
+        return dict(self._signals[name]["header"])
+
+    def timebase(self, name):
+        return Timebase(*self._signals[name]["timebase"])
+
+    def read(self, name, t_start=None, t_end=None, decimate=1):
+        """
+        Returns (raw_data, timebase) of one signal, restricted to t_start <= t < t_end (ms)
+        and every decimate-th sample when given. Raises KeyError for unknown signals.
+        """
+        entry = self._signals[name]
+        timebase = Timebase(*entry["timebase"])
+        step = max(1, int(decimate))
+        i0, i1 = timebase.index_range(t_start, t_end)
+        window = timebase.window(i0, i1, step)
+        if i1 <= i0:
+            return np.empty(0), window
+
+        cs = self.chunk_samples
+        first, last = i0 // cs, (i1 - 1) // cs
+        parts = [self._chunk(entry, timebase, k) for k in range(first, last + 1)]
+        values = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        values = values[i0 - first * cs:i1 - first * cs:step]
+        return np.ascontiguousarray(values), window
+
+    def iter_chunks(self, name, t_start=None, t_end=None):
+        """
+        Yields (raw_data, timebase) per stored chunk overlapping t_start <= t < t_end, in
+        time order; one chunk is decompressed at a time.
+        """
+        entry = self._signals[name]
+        timebase = Timebase(*entry["timebase"])
+        i0, i1 = timebase.index_range(t_start, t_end)
+        cs = self.chunk_samples
+        for k in range(i0 // cs, (i1 - 1) // cs + 1 if i1 > i0 else i0 // cs):
+            lo, hi = max(i0, k * cs), min(i1, (k + 1) * cs)
+            values = self._chunk(entry, timebase, k)
+            yield np.ascontiguousarray(values[lo - k * cs:hi - k * cs]), timebase.window(lo, hi)
+
+    def _chunk(self, entry, timebase, k):
+        offset, length = entry["chunks"][k]
+        with self._lock:
+            self._file.seek(offset)
+            blob = self._file.read(length)
+        count = min(self.chunk_samples, timebase.n - k * self.chunk_samples)
+        return _decode_chunk(self._decompress(blob), entry["decimals"], count)
+
+
+# Archives opened by the loaders: path -> (size, mtime_ns, ShotArchive)
+_open_archives = {}
+_open_archives_lock = threading.Lock()
+
+
+def open_archive(path):
+    """Returns a shared ShotArchive for path, reopened when the file changed."""
+    st = os.stat(path)
+    key = os.path.abspath(path)
+    with _open_archives_lock:
+        entry = _open_archives.get(key)
+        if entry is not None and entry[:2] == (st.st_size, st.st_mtime_ns):
+            return entry[2]
+        archive = ShotArchive(key)
+        _open_archives[key] = (st.st_size, st.st_mtime_ns, archive)
+    if entry is not None:
+        entry[2].close()
+    return archive
+
+
+if __name__ == "__main__":
+    # Converter: python -m src.data.shot_archive <shot dir> [archive] [--codec zlib|bz2|lzma]
+    import argparse
+    parser = argparse.ArgumentParser(description="Convert a TT1 shot directory into a .tt1z archive")
+    parser.add_argument("shot_dir")
+    parser.add_argument("archive", nargs="?", default=None)
+    parser.add_argument("--codec", default="zlib", choices=sorted(CODECS))
+    parser.add_argument("--chunk-samples", type=int, default=DEFAULT_CHUNK_SAMPLES)
+    args = parser.parse_args()
+    out = write_shot_archive(args.shot_dir, args.archive, codec=args.codec, chunk_samples=args.chunk_samples)
+    source = sum(e.stat().st_size for e in os.scandir(args.shot_dir) if e.name.endswith(".txt"))
+    print(f"{out}: {os.path.getsize(out) / 1e6:.1f} MB (text {source / 1e6:.1f} MB)")
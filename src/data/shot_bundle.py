@@ -0,0 +1,268 @@
+# src/data/shot_bundle.py
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from src.data.alignment import align_signals
+from src.data.channel_health import screen_channels
+from src.data.fetch_orchestrator import fetch_orchestrator
+from src.data.loader import load_txt_data, load_mds_data
+from src.data.shot_archive import is_archive, open_archive
+from src.data.tt1_reader import find_tt1_file, list_tt1_files, tt1_stat
+from src.utils.config_manager import config_manager
+_sys_config = config_manager.get_config("system",{})
+
+# Overlay signals loaded in the background once a shot is displayed (config system.overlay_preload)
+OVERLAY_PRELOAD = ["IP1", "IP2", "HCN1", "HCN2", "HCN3", "GP"]
+# Resampled matrices kept per bundle (most recent grids)
+ALIGNED_ENTRIES = 8
+
+
+class ShotBundle:
+    """
+    All signals of one shot behind a single object.
+
+    The bundle indexes the signals of the shot (the .txt files of a shot folder, the
+    contents of a .tt1z archive, or the signals listed in params.json for MDSplus)
+    without reading them. Arrays are loaded on
+    first access and kept, so the m/n probe matrices, the T/N variants and the overlays
+    all share one read per signal and memory grows only with what is used.
+    Text signals are reloaded when their file changes on disk.
+    """
+
+    def __init__(self, shotno, method, base_path=None, params=None):
+        self.shotno = shotno
+        self.method = method
+        self.path = None if method == "DAQ SV." else os.path.abspath(base_path if base_path else r'data')
+        self.params = params if params is not None else config_manager.get_params()
+        self._signals = {}  # name -> (raw_data, prof_time, stamp)
+        self._index = None
+        self._aligned = OrderedDict()  # (names, grid, fill_value) -> (source arrays, matrix)
+        self._health = {}  # (id(matrix), fs) -> (weakref to matrix, ChannelHealth)
+        self._loading = {}  # name -> threading.Event set once the read in progress finishes
+        self._lock = threading.Lock()
+        self._preload_cancel = threading.Event()
+        self._preload_future = None
+
+    def key(self):
+        return (self.shotno, self.method, self.path)
+
+    def _stamp(self, name):
+        if self.path is None:
+            return None
+        try:
+            st = os.stat(self.path) if is_archive(self.path) else tt1_stat(find_tt1_file(self.path, name))
+            return (st.st_size, st.st_mtime_ns)
+        except OSError:
+            return None
+
+    def available(self):
+        """Names of the signals of this shot (params.json order first, then other files)."""
+        if self._index is None:
+            names = list(self.params)
+            if self.path is not None:
+                try:
+                    if is_archive(self.path):
+                        files = set(open_archive(self.path).signals())
+                    else:
+                        files = set(list_tt1_files(self.path))
+                except (OSError, ValueError):
+                    files = set()
+                names = [n for n in names if n in files] + sorted(files - set(names))
+            self._index = names
+        return list(self._index)
+
+    def __contains__(self, name):
+        return name in self.available()
+
+    def loaded(self):
+        """Names of the signals already materialized."""
+        with self._lock:
+            return list(self._signals)
+
+    def nbytes(self):
+        """Memory held by the materialized arrays (shared time axes counted once)."""
+        with self._lock:
+            arrays = {}
+            for raw_data, prof_time, _ in self._signals.values():
+                arrays[id(raw_data)] = raw_data
+                arrays[id(prof_time)] = prof_time
+            for _, matrix in self._aligned.values():
+                arrays[id(matrix)] = matrix
+        return sum(a.nbytes for a in arrays.values())
+
+    def release(self, name=None):
+        """Drops one materialized signal, or all of them."""
+        with self._lock:
+            if name is None:
+                self._signals.clear()
+            else:
+                self._signals.pop(name, None)
+            self._aligned.clear()
+            self._health.clear()
+
+    def get(self, name):
+        """Returns (raw_data, prof_time) of one signal, loading it on first access."""
+        return self.get_many([name])[name]
+
+    def get_many(self, names, workers=None, progress=None, cancel_event=None, deadline=None):
+        """
+        Returns {name: (raw_data, prof_time)}; only signals not materialized yet are read,
+        in one parallel/batched load. Calls from several threads load different signals
+        concurrently; a signal another call is already reading is waited for, not read twice.
+        Failed or cancelled signals are (None, None) and are retried on the next access.
+        progress: Optional callback progress(done, total, name) over all requested names.
+        deadline: Optional time limit shared with the other reads of one MDSplus load
+                  (see load_mds_data).
+        """
+        result = {}
+        missing = []  # Read by this call
+        pending = {}  # Being read by another call: name -> threading.Event
+        with self._lock:
+            for name in names:
+                entry = self._signals.get(name)
+                if entry is not None and entry[2] == self._stamp(name):
+                    result[name] = entry[:2]
+                elif name in self._loading:
+                    pending.setdefault(name, self._loading[name])
+                elif name not in missing:
+                    missing.append(name)
+                    self._loading[name] = threading.Event()
+
+        counter = [len(names) - len(missing) - len(pending)]
+        counter_lock = threading.Lock()
+
+        def step(name):
+            with counter_lock:
+                counter[0] += 1
+                done = counter[0]
+            if progress is not None:
+                progress(done, len(names), name)
+
+        loaded = {}
+        try:
+            if missing:
+                available = self.available()
+                loadable = [n for n in missing if self.path is None or n in available]
+                for name in missing:
+                    if name not in loadable:
+                        # No file for this signal, nothing to read
+                        print(f"Error fetching {name}: not available for shot {self.shotno}")
+                        step(name)
+
+                if loadable:
+                    stamps = {n: self._stamp(n) for n in loadable}
+                    if self.path is None:
+                        data = load_mds_data(self.shotno, loadable, workers=workers, progress=lambda d, t, n: step(n),
+                                             cancel_event=cancel_event, deadline=deadline)
+                    else:
+                        data = load_txt_data(self.shotno, loadable, base_path=self.path, workers=workers,
+                                             progress=lambda d, t, n: step(n), cancel_event=cancel_event)
+                    for name in loadable:
+                        raw_data, prof_time = (data or {}).get(name, (None, None))
+                        if raw_data is not None and prof_time is not None:
+                            loaded[name] = (raw_data, prof_time, stamps[name])
+        finally:
+            with self._lock:
+                self._signals.update(loaded)
+                for name in missing:
+                    self._loading.pop(name).set()
+
+        for name in missing:
+            result[name] = loaded[name][:2] if name in loaded else (None, None)
+        for name, event in pending.items():
+            event.wait()
+            with self._lock:
+                entry = self._signals.get(name)
+            result[name] = entry[:2] if entry is not None else (None, None)
+            step(name)
+
+        return {name: result[name] for name in names}
+
+    def aligned(self, names, grid, fill_value=0.0):
+        """
+        Returns a read-only (len(names), grid.n) matrix of the signals resampled onto the
+        Timebase grid (see align_signals). The result is kept with the bundle and reused
+        until one of the signals is reloaded.
+        """
+        names = list(names)
+        sources = self.get_many(names)
+        arrays = tuple(sources[name][0] for name in names)
+        key = (tuple(names), grid.key(), fill_value)
+        with self._lock:
+            entry = self._aligned.get(key)
+            if entry is not None and all(a is b for a, b in zip(entry[0], arrays)):
+                self._aligned.move_to_end(key)
+                return entry[1]
+
+        matrix = align_signals([sources[name] for name in names], grid, fill_value)
+        matrix.flags.writeable = False
+        with self._lock:
+            self._aligned[key] = (arrays, matrix)
+            self._aligned.move_to_end(key)
+            while len(self._aligned) > ALIGNED_ENTRIES:
+                self._aligned.popitem(last=False)
+        return matrix
+
+    def channel_health(self, data, fs, names=None):
+        """
+        ChannelHealth of a (channels, time) matrix of this shot (see screen_channels).
+        Kept with the bundle while the matrix is alive, so reloading a cached shot or
+        switching back to it does not screen again.
+        """
+        key = (id(data), fs)
+        with self._lock:
+            entry = self._health.get(key)
+            if entry is not None and entry[0]() is data:
+                return entry[1]
+
+        health = screen_channels(data, fs, names=names)
+        with self._lock:
+            for old_key in [k for k, (ref, _) in self._health.items() if ref() is None]:
+                del self._health[old_key]
+            self._health[key] = (weakref.ref(data), health)
+        return health
+
+    def is_loaded(self, name):
+        with self._lock:
+            return name in self._signals
+
+    def preload(self, names=None):
+        """
+        Loads signals in the background (default: config system.overlay_preload) so a
+        later get() returns at once. They go through the fetch orchestrator at background
+        priority, so critical reads of any shot are served first. Replaces a running
+        preload. Returns a concurrent.futures.Future of {name: (raw_data, prof_time)}.
+        """
+        if names is None:
+            names = _sys_config.get("overlay_preload", OVERLAY_PRELOAD)
+        self.cancel_preload()
+        cancel = threading.Event()
+        self._preload_cancel = cancel
+        available = set(self.available()) if self.path is not None else None
+        names = [n for n in names if (available is None or n in available) and not self.is_loaded(n)]
+        self._preload_future = fetch_orchestrator.submit(self, names, cancel_event=cancel)
+        return self._preload_future
+
+    def cancel_preload(self, wait=False):
+        """Stops a running preload; signals already being read finish."""
+        self._preload_cancel.set()
+        future = self._preload_future
+        if wait and future is not None:
+            future.result()
+
+
+# Bundles in use, shared by every caller asking for the same shot (dropped once unused)
+_bundles = weakref.WeakValueDictionary()
+_bundles_lock = threading.Lock()
+
+
+def open_bundle(shotno, method, base_path=None):
+    """Returns the ShotBundle of a shot, reusing the one already held by another caller."""
+    bundle = ShotBundle(shotno, method, base_path)
+    with _bundles_lock:
+        existing = _bundles.get(bundle.key())
+        if existing is not None:
+            return existing
+        _bundles[bundle.key()] = bundle
+    return bundle
@@ -0,0 +1,84 @@
+# src/data/shot_cache.py
+import threading
+from collections import OrderedDict
+import numpy as np
+from src.utils.config_manager import config_manager
+_sys_config = config_manager.get_config("system",{})
+
+
+class ShotCache:
+    """
+    Process-wide LRU cache of fetch_mhd_data results.
+
+    Keys are (shot, method, mode, suffix, ip_signal, path, ...) tuples, values are the
+    result tuple. Each entry can carry a stamp (e.g. source file mtimes) that must still
+    match on lookup. Entries are evicted least recently used first once the arrays exceed
+    max_bytes. Cached arrays are made read-only since several callers share them.
+    """
+
+    def __init__(self, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = int(_sys_config.get("shot_cache_mb", 512) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, stamp, nbytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _nbytes(value):
+        # Arrays shared inside one entry (e.g. a common time axis) are counted once
+        arrays = {id(v): v for v in value if isinstance(v, np.ndarray) and not isinstance(v, np.memmap)}
+        return sum(a.nbytes for a in arrays.values())
+
+    def get(self, key, stamp=None):
+        """Returns the cached value, or None if missing or the stamp changed."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] != stamp:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, stamp=None):
+        for v in value:
+            if isinstance(v, np.ndarray):
+                v.flags.writeable = False
+        nbytes = self._nbytes(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (value, stamp, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        _, _, nbytes = self._entries.pop(key)
+        self._bytes -= nbytes
+
+    def invalidate(self, shot=None):
+        """Drops all entries, or only those of one shot."""
+        with self._lock:
+            for key in [k for k in self._entries if shot is None or k[0] == shot]:
+                self._remove(key)
+
+    def total_bytes(self):
+        with self._lock:
+            return self._bytes
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+# Global cache used by fetch_mhd_data
+shot_cache = ShotCache()
@@ -0,0 +1,249 @@
+# src/data/shot_catalog.py
+import os
+import sqlite3
+import threading
+from src.data.tt1_reader import read_tt1_header, is_zip_shot, list_tt1_files, tt1_stat, ZIP_EXT
+from src.data.shot_archive import is_archive, open_archive, ARCHIVE_EXT
+from src.utils.config_manager import config_manager
+_sys_config = config_manager.get_config("system",{})
+
+
+_SUMMARY_KEYS = ("ip_signal", "duration", "ip_max", "t_start", "t_end", "stamp")
+
+
+def _default_db_path():
+    path = _sys_config.get("catalog_path", "cache/catalog.sqlite")
+    if not os.path.isabs(path):
+        path = os.path.join(config_manager.base_path, path)
+    return path
+
+
+def _shot_number(path):
+    """Shot number from a shot folder (data/1275), zip (data/1275.zip) or archive (data/1275.tt1z) name, or None."""
+    name = os.path.basename(os.path.normpath(path))
+    for ext in (ARCHIVE_EXT, ZIP_EXT):
+        if name.endswith(ext):
+            name = name[:-len(ext)]
+    return int(name) if name.isdigit() else None
+
+
+class ShotCatalog:
+    """
+    SQLite index of the shots under a data root and the signals they contain.
+
+    Only TT1 headers are read (signal name, unit, samples, period, trigger and create
+    time), never the samples. Every file's size and mtime is stored, so a rescan only
+    re-reads headers of new or changed files and drops rows of deleted ones.
+    Shots are folders, zip files of a folder or .tt1z archives named after the shot number.
+    Summary quantities (duration, IP max, ...) of ingested shots are kept alongside,
+    see src/data/ingest.py.
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path if db_path else _default_db_path()
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def _connect(self):
+        if not self._ready:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        db = sqlite3.connect(self.db_path, timeout=30)
+        if not self._ready:
+            db.executescript("""
+                CREATE TABLE IF NOT EXISTS shots (
+                    path TEXT PRIMARY KEY, root TEXT, shot INTEGER);
+                CREATE TABLE IF NOT EXISTS signals (
+                    path TEXT, name TEXT, unit TEXT, samples INTEGER, period REAL,
+                    trigger_time REAL, create_time TEXT, size INTEGER, mtime_ns INTEGER,
+                    PRIMARY KEY (path, name));
+                CREATE TABLE IF NOT EXISTS ip_summaries (
+                    path TEXT, ip_signal TEXT, duration REAL, ip_max REAL,
+                    t_start REAL, t_end REAL, stamp TEXT, rank INTEGER);
+                CREATE INDEX IF NOT EXISTS ip_summaries_by_path ON ip_summaries (path, rank);
+                CREATE INDEX IF NOT EXISTS shots_by_root ON shots (root, shot);
+            """)
+            self._ready = True
+        return db
+
+    def scan(self, root):
+        """
+        Indexes every shot folder/archive directly under root (or root itself if it is a
+        shot). Shots that disappeared are removed. Returns the number of headers read.
+        """
+        root = os.path.abspath(root)
+        candidates = [root] if _shot_number(root) is not None else []
+        try:
+            candidates += [e.path for e in os.scandir(root)
+                           if _shot_number(e.path) is not None and (e.is_dir() or is_archive(e.path) or is_zip_shot(e.path))]
+        except OSError:
+            pass
+
+        read = 0
+        for path in candidates:
+            read += self.scan_shot(path)
+        with self._lock:
+            db = self._connect()
+            try:
+                gone = [p for (p,) in db.execute("SELECT path FROM shots WHERE root=?", (root,)) if not os.path.exists(p)]
+                for path in gone:
+                    db.execute("DELETE FROM shots WHERE path=?", (path,))
+                    db.execute("DELETE FROM signals WHERE path=?", (path,))
+                    db.execute("DELETE FROM ip_summaries WHERE path=?", (path,))
+                db.commit()
+            finally:
+                db.close()
+        return read
+
+    def scan_shot(self, path):
+        """Indexes one shot folder or archive. Returns the number of headers read."""
+        path = os.path.abspath(path)
+        archive = is_archive(path)
+        files = {}  # name -> (txt path, size, mtime_ns)
+        try:
+            if archive:
+                st = os.stat(path)
+                files = {None: (path, st.st_size, st.st_mtime_ns)}
+            else:
+                for name, txt_path in list_tt1_files(path).items():
+                    st = tt1_stat(txt_path)
+                    files[name] = (txt_path, st.st_size, st.st_mtime_ns)
+        except OSError:
+            files = {}
+
+        with self._lock:
+            db = self._connect()
+            try:
+                known = {name: (size, mtime_ns) for name, size, mtime_ns in
+                         db.execute("SELECT name, size, mtime_ns FROM signals WHERE path=?", (path,))}
+            finally:
+                db.close()
+
+        # Headers are read without holding the lock, queries from the UI stay responsive
+        rows = []
+        if archive:
+            # One stamp for the whole archive, its signals are re-read together
+            source = files.get(None)
+            removed = set(known) if source is None else set()
+            if source is not None and (not known or any(v != source[1:] for v in known.values())):
+                rows = self._archive_rows(path, source)
+                removed = set(known) - {row[1] for row in rows}
+        else:
+            removed = set(known) - set(files)
+            for name, (txt_path, size, mtime_ns) in files.items():
+                if known.get(name) == (size, mtime_ns):
+                    continue
+                try:
+                    rows.append(self._row(path, name, read_tt1_header(txt_path), size, mtime_ns))
+                except OSError:
+                    continue
+
+        with self._lock:
+            db = self._connect()
+            try:
+                db.executemany("DELETE FROM signals WHERE path=? AND name=?", [(path, name) for name in removed])
+                db.executemany("INSERT OR REPLACE INTO signals VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                if files:
+                    db.execute("INSERT OR REPLACE INTO shots VALUES (?, ?, ?)", (path, os.path.dirname(path), _shot_number(path)))
+                else:
+                    db.execute("DELETE FROM shots WHERE path=?", (path,))
+                    db.execute("DELETE FROM ip_summaries WHERE path=?", (path,))
+                db.commit()
+            finally:
+                db.close()
+        return len(rows)
+
+    @staticmethod
+    def _row(path, name, header, size, mtime_ns):
+        def number(key, kind):
+            value = header.get(key)
+            return value if isinstance(value, kind) else None
+        return (path, name, header.get("SignalUnit"), number("Samples", int), number("Period", float),
+                number("TriggerTime", float), header.get("CreateTime"), size, mtime_ns)
+
+    def _archive_rows(self, path, source):
+        try:
+            archive = open_archive(path)
+        except (OSError, ValueError) as e:
+            print(f"Catalog: cannot read {path}: {e}")
+            return []
+        return [self._row(path, name, archive.header(name), source[1], source[2]) for name in archive.signals()]
+
+    def shots(self, root):
+        """[(shot, path)] of the shots indexed under root, by shot number."""
+        with self._lock:
+            db = self._connect()
+            try:
+                return db.execute("SELECT shot, path FROM shots WHERE root=? AND shot IS NOT NULL ORDER BY shot, path",
+                                  (os.path.abspath(root),)).fetchall()
+            finally:
+                db.close()
+
+    def find_shot(self, shot, root):
+        """Path of a shot under root (folder preferred over archive), or None."""
+        paths = [p for s, p in self.shots(root) if s == shot]
+        return sorted(paths, key=is_archive)[0] if paths else None
+
+    def signals(self, path):
+        """Header info of every signal of a shot, as dicts ordered by name."""
+        with self._lock:
+            db = self._connect()
+            try:
+                rows = db.execute("SELECT name, unit, samples, period, trigger_time, create_time FROM signals "
+                                  "WHERE path=? ORDER BY name", (os.path.abspath(path),)).fetchall()
+            finally:
+                db.close()
+        keys = ("name", "unit", "samples", "period", "trigger_time", "create_time")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def signal_names(self, path):
+        return [s["name"] for s in self.signals(path)]
+
+    def set_summaries(self, path, summaries):
+        """
+        Replaces the summaries of a shot: one dict per IP signal (keys as returned by
+        summary()), the preferred one first.
+        """
+        path = os.path.abspath(path)
+        rows = [(path,) + tuple(summary.get(key) for key in _SUMMARY_KEYS) + (rank,)
+                for rank, summary in enumerate(summaries)]
+        with self._lock:
+            db = self._connect()
+            try:
+                db.execute("DELETE FROM ip_summaries WHERE path=?", (path,))
+                db.executemany("INSERT INTO ip_summaries VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                db.commit()
+            finally:
+                db.close()
+
+    def summary(self, path, ip_signal=None):
+        """
+        Summary dict of a shot (ip_signal, duration, ip_max, t_start, t_end, stamp) for
+        ip_signal (default: the preferred one), or None.
+        """
+        query = f"SELECT {', '.join(_SUMMARY_KEYS)} FROM ip_summaries WHERE path=?"
+        args = (os.path.abspath(path),)
+        if ip_signal is not None:
+            query += " AND ip_signal=?"
+            args += (ip_signal,)
+        with self._lock:
+            db = self._connect()
+            try:
+                row = db.execute(query + " ORDER BY rank LIMIT 1", args).fetchone()
+            finally:
+                db.close()
+        return dict(zip(_SUMMARY_KEYS, row)) if row else None
+
+    def summaries(self, root):
+        """{path: preferred summary dict} of the summarized shots under root."""
+        with self._lock:
+            db = self._connect()
+            try:
+                rows = db.execute(f"SELECT s.path, {', '.join('s.' + k for k in _SUMMARY_KEYS)} FROM ip_summaries s "
+                                  "JOIN shots USING (path) WHERE shots.root=? AND s.rank=0",
+                                  (os.path.abspath(root),)).fetchall()
+            finally:
+                db.close()
+        return {row[0]: dict(zip(_SUMMARY_KEYS, row[1:])) for row in rows}
+
+# Global catalog used by the main window
+shot_catalog = ShotCatalog()
@@ -0,0 +1,188 @@
+# src/data/signal_stream.py
+import os
+import numpy as np
+from src.data.loader import _Deadline, _evaluate_many, _mds_address, _time_fingerprint, _time_fingerprint_expr
+from src.data.mds_pool import mds_pool
+from src.data.shot_archive import is_archive, open_archive
+from src.data.timebase import Timebase
+from src.data.tt1_reader import iter_tt1_chunks, find_tt1_file, list_tt1_files
+from src.data.txt_cache import cached_tt1, tt1_line_index
+from src.utils.config_manager import config_manager
+_sys_config = config_manager.get_config("system",{})
+
+# Samples per streamed block (config system.stream_chunk_samples)
+DEFAULT_CHUNK_SAMPLES = 1 << 16
+
+
+def _chunk_samples(chunk_samples=None):
+    if chunk_samples is None:
+        chunk_samples = _sys_config.get("stream_chunk_samples", DEFAULT_CHUNK_SAMPLES)
+    return max(1, int(chunk_samples))
+
+
+def _rechunk(blocks, chunk_samples):
+    """Regroups (raw_data, timebase) blocks into blocks of exactly chunk_samples (the last may be shorter)."""
+    pending, timebase = [], None
+    size = 0
+    for raw_data, block_timebase in blocks:
+        if timebase is None:
+            timebase = block_timebase
+        pending.append(raw_data)
+        size += len(raw_data)
+        while size >= chunk_samples:
+            values = np.concatenate(pending) if len(pending) > 1 else pending[0]
+            yield values[:chunk_samples], timebase.window(0, chunk_samples)
+            rest = values[chunk_samples:]
+            pending, size = [rest], len(rest)
+            timebase = Timebase(timebase.value(chunk_samples), timebase.dt, size)
+    if size:
+        yield np.concatenate(pending) if len(pending) > 1 else pending[0], timebase.window(0, size)
+
+
+class SignalSource:
+    """
+    Streaming access to the signals of one shot.
+
+    chunks() yields (raw_data, prof_time) blocks of at most chunk_samples samples in time
+    order, so a consumer can start on the first block while the rest is still being read
+    and memory stays bounded by one block. A new source implements signals() and
+    _blocks(); _blocks() may yield (raw_data, Timebase) or (raw_data, prof_time) pairs.
+    """
+
+    def signals(self):
+        raise NotImplementedError
+
+    def _blocks(self, name, t_start, t_end, chunk_samples):
+        raise NotImplementedError
+
+    def chunks(self, name, t_start=None, t_end=None, chunk_samples=None):
+        """
+        Yields (raw_data, prof_time) of signal name with t_start <= t < t_end (ms).
+        chunk_samples: Samples per block (default: config system.stream_chunk_samples).
+        """
+        for raw_data, time in self._blocks(name, t_start, t_end, _chunk_samples(chunk_samples)):
+            yield raw_data, time.array() if isinstance(time, Timebase) else time
+
+    def read(self, name, t_start=None, t_end=None):
+        """(raw_data, prof_time) of the whole window, assembled from the stream."""
+        blocks = list(self.chunks(name, t_start, t_end))
+        if not blocks:
+            return np.empty(0), np.empty(0)
+        return np.concatenate([b[0] for b in blocks]), np.concatenate([b[1] for b in blocks])
+
+
+class TextSource(SignalSource):
+    """TT1 shot folder (or zipped / compressed files). Uses the .npy cache when valid, otherwise parses the text block by block."""
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+
+    def signals(self):
+        return list(list_tt1_files(self.path))
+
+    def _blocks(self, name, t_start, t_end, chunk_samples):
+        txt_path = find_tt1_file(self.path, name)
+        cached = cached_tt1(txt_path) if _sys_config.get("txt_cache", True) else None
+        if cached is not None:
+            raw_data, timebase, _ = cached
+            i0, i1 = timebase.index_range(t_start, t_end)
+            for k in range(i0, i1, chunk_samples):
+                stop = min(k + chunk_samples, i1)
+                yield np.array(raw_data[k:stop]), timebase.window(k, stop)
+            return
+        line_index = tt1_line_index(txt_path, build=False) if _sys_config.get("txt_line_index", True) else None
+        yield from iter_tt1_chunks(txt_path, chunk_samples, t_start, t_end, line_index=line_index)
+
+
+class ArchiveSource(SignalSource):
+    """.tt1z shot archive; compressed chunks are decoded one at a time."""
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+
+    def signals(self):
+        return open_archive(self.path).signals()
+
+    def _blocks(self, name, t_start, t_end, chunk_samples):
+        return _rechunk(open_archive(self.path).iter_chunks(name, t_start, t_end), chunk_samples)
+
+
+class MDSSource(SignalSource):
+    """
+    MDSplus shot. The time axis is fingerprinted once, then every block is one request
+    for the DATA/DIM_OF index range, on a pooled connection borrowed per block.
+
+    Requests are bounded like in load_mds_data: request_timeout (s) of socket inactivity
+    per request (default: config system.mds_request_timeout) and, when given, timeout (s)
+    for one whole stream. There is no stream limit by default, as a stream advances at
+    the pace of its consumer. Once cancel_event is set the request in flight is aborted
+    and the stream ends; a timed out stream raises TimeoutError.
+    """
+
+    def __init__(self, shotno, params=None, pool=None, batch=None, timeout=None, request_timeout=None, cancel_event=None):
+        self.shotno = shotno
+        self.params = params if params is not None else config_manager.get_params()
+        self.pool = pool if pool else mds_pool
+        self.batch = _sys_config.get("mds_batch", False) if batch is None else batch
+        self.timeout = timeout
+        self.request_timeout = request_timeout if request_timeout is not None else _sys_config.get("mds_request_timeout", 20)
+        self.cancel_event = cancel_event
+
+    def signals(self):
+        return list(self.params)
+
+    def _request(self, deadline, request):
+        """Runs request(con) on a pooled connection with the tree open, under the deadline."""
+        with self.pool.connection(_mds_address()) as con:
+            deadline.attach(con)
+            try:
+                deadline.arm(con)
+                con.open_tree('tt1', self.shotno)
+                deadline.arm(con)
+                return request(con)
+            finally:
+                deadline.detach(con)
+
+    def _blocks(self, name, t_start, t_end, chunk_samples):
+        deadline = _Deadline(self.timeout, self.request_timeout, self.cancel_event)
+        try:
+            yield from self._deadline_blocks(deadline, name, t_start, t_end, chunk_samples)
+        except OSError:
+            if self.cancel_event is not None and self.cancel_event.is_set():
+                return  # Request aborted by the cancel
+            if deadline.expired():
+                raise TimeoutError(f"Streaming {name} timed out after {self.timeout} s")
+            raise
+        finally:
+            deadline.close()
+
+    def _deadline_blocks(self, deadline, name, t_start, t_end, chunk_samples):
+        if deadline.stopped():
+            return
+        key = _time_fingerprint(self._request(deadline, lambda con: con.get(_time_fingerprint_expr(name)).data()))
+        if key is None:
+            raise ValueError(f"No time axis for {name}")
+        i0, i1 = Timebase.from_header({}, int(key[0]), key[1], key[2]).index_range(t_start, t_end)
+        for k in range(i0, i1, chunk_samples):
+            if self.cancel_event is not None and self.cancel_event.is_set():
+                return
+            if deadline.expired():
+                raise TimeoutError(f"Streaming {name} timed out after {self.timeout} s")
+            last = min(k + chunk_samples, i1) - 1
+            expressions = {"d": f"DATA({name})[{k} : {last} : 1]", "t": f"DIM_OF({name})[{k} : {last} : 1]"}
+            values = self._request(deadline, lambda con: _evaluate_many(con, expressions, self.batch))
+            for value in values.values():
+                if isinstance(value, Exception):
+                    raise value
+            yield np.asarray(values["d"]), np.asarray(values["t"])
+
+
+def open_source(shotno, method, base_path=None, cancel_event=None):
+    """
+    SignalSource of a shot: MDSplus for "DAQ SV.", else a shot folder or .tt1z archive.
+    cancel_event: Optional threading.Event that ends MDSplus streams (aborting the request in flight).
+    """
+    if method == "DAQ SV.":
+        return MDSSource(shotno, cancel_event=cancel_event)
+    path = base_path if base_path else r'data'
+    return ArchiveSource(path) if is_archive(path) else TextSource(path)
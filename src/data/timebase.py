@@ -0,0 +1,145 @@
+# src/data/timebase.py
+import math
+import threading
+import weakref
+import numpy as np
+
+
+class TimeAxis(np.ndarray):
+    """
+    Read-only time array (ms) materialized from a Timebase.
+    Behaves like a normal float64 array; .timebase is only kept on the full axis,
+    slices and arithmetic results are plain time values without a descriptor.
+    """
+
+    def __array_finalize__(self, obj):
+        self.timebase = None
+
+
+class Timebase:
+    """
+    Uniform sampling time axis described by (t0, dt, n): t[i] = t0 + dt * i (ms).
+    Channels recorded with the same settings share one Timebase and one materialized array.
+    """
+    __slots__ = ("t0", "dt", "n", "__weakref__")
+
+    # Materialized axes shared by all equal descriptors (dropped once unused)
+    _axes = weakref.WeakValueDictionary()
+    _axes_lock = threading.Lock()
+
+    def __init__(self, t0, dt, n):
+        self.t0 = float(t0)
+        self.dt = float(dt)
+        self.n = int(n)
+
+    @classmethod
+    def from_header(cls, header, n, t_first=None, t_last=None):
+        """
+        Builds the descriptor from a TT1 header (TriggerTime, Period) and the sample count.
+        The header Period is printed with 6 decimals only, which drifts by up to one sample
+        over 100k samples, so dt is refined from the first/last time stamps when given.
+        """
+        t0 = header.get("TriggerTime", 0.0) if t_first is None else t_first
+        dt = header.get("Period", 0.0)
+        if t_first is not None and t_last is not None and n > 1:
+            dt = (t_last - t_first) / (n - 1)
+        return cls(t0, dt, n)
+
+    def key(self):
+        return (self.t0, self.dt, self.n)
+
+    def __eq__(self, other):
+        return isinstance(other, Timebase) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __len__(self):
+        return self.n
+
+    def __repr__(self):
+        return f"Timebase(t0={self.t0}, dt={self.dt}, n={self.n})"
+
+    def value(self, i):
+        """Time of sample i, computed exactly like the materialized array."""
+        return self.t0 + self.dt * float(i)
+
+    def index_range(self, t_start=None, t_end=None):
+        """Sample range [i0, i1) with t_start <= t < t_end (None leaves that side open)."""
+        i0 = 0 if t_start is None else self.searchsorted(t_start)
+        i1 = self.n if t_end is None else self.searchsorted(t_end)
+        return i0, max(i0, i1)
+
+    def window(self, i0, i1, step=1):
+        """Timebase of the samples i0, i0 + step, ... < i1."""
+        return Timebase(self.value(i0), self.dt * step, len(range(i0, i1, step)))
+
+    def array(self):
+        """Returns the shared, read-only TimeAxis for this descriptor (materialized on first use)."""
+        key = self.key()
+        with Timebase._axes_lock:
+            axis = Timebase._axes.get(key)
+            if axis is None:
+                values = np.arange(self.n) * self.dt
+                values += self.t0
+                axis = values.view(TimeAxis)
+                axis.timebase = self
+                axis.flags.writeable = False
+                Timebase._axes[key] = axis
+        return axis
+
+    def searchsorted(self, t, side="left"):
+        """O(1) equivalent of np.searchsorted(self.array(), t, side)."""
+        if self.n == 0 or self.dt <= 0 or not math.isfinite(t):
+            return int(np.searchsorted(self.array(), t, side=side))
+
+        i = min(max(math.ceil((t - self.t0) / self.dt), 0), self.n)
+        # Correct the float estimate against the exact sample values
+        if side == "left":
+            while i > 0 and self.value(i - 1) >= t:
+                i -= 1
+            while i < self.n and self.value(i) < t:
+                i += 1
+        else:
+            while i > 0 and self.value(i - 1) > t:
+                i -= 1
+            while i < self.n and self.value(i) <= t:
+                i += 1
+        return i
+
+
+def time_index(time_array, t, side="left"):
+    """
+    np.searchsorted for time arrays. Uses index arithmetic when the array is a
+    TimeAxis with a known Timebase, otherwise a binary search.
+    """
+    timebase = getattr(time_array, "timebase", None)
+    if timebase is not None:
+        return timebase.searchsorted(t, side=side)
+    return np.searchsorted(time_array, t, side=side)
+
+
+def same_timebase(time_a, time_b):
+    """True if two time arrays share a time axis (compared by descriptor when known)."""
+    tb_a = getattr(time_a, "timebase", None)
+    tb_b = getattr(time_b, "timebase", None)
+    if tb_a is not None and tb_b is not None:
+        return tb_a == tb_b
+    return len(time_a) == len(time_b)
+
+
+def timebase_of(time_array, tolerance=0.01):
+    """
+    Timebase of a time array: its descriptor when known, otherwise one fitted to a uniformly
+    sampled array (every step within tolerance * dt of the mean step). None if not uniform.
+    """
+    timebase = getattr(time_array, "timebase", None)
+    if timebase is not None:
+        return timebase
+    t = np.asarray(time_array, dtype=float)
+    if len(t) < 2:
+        return Timebase(t[0] if len(t) else 0.0, 0.0, len(t))
+    dt = (t[-1] - t[0]) / (len(t) - 1)
+    if not dt > 0 or np.max(np.abs(np.diff(t) - dt)) > tolerance * dt:
+        return None
+    return Timebase(t[0], dt, len(t))
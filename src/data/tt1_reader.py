@@ -0,0 +1,882 @@
+# src/data/tt1_reader.py
+import bz2
+import gzip
+import lzma
+import multiprocessing
+import os
+import struct
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from src.data.timebase import Timebase
+
+# Every TT1 text file starts with this many "Key = Value" lines
+HEADER_LINES = 8
+
+# Compressed TT1 files (<signal>.txt.gz etc.) are decompressed while they are read
+_OPENERS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+TT1_SUFFIXES = (".txt",) + tuple(f".txt{ext}" for ext in _OPENERS)
+ZIP_EXT = ".zip"
+
+# Header keys converted to numbers (value is the first token, units dropped)
+_INT_KEYS = ("ShotNo", "Samples")
+_FLOAT_KEYS = ("TriggerTime", "Period")
+
+# Bytes parsed per block by the fast path (kept small so temporaries stay in cache)
+_BLOCK_BYTES = 1 << 18
+
+# Bytes decompressed per read when a compressed file is read into the parse buffer
+_STREAM_BLOCK_BYTES = 1 << 18
+
+# Files below this size are always parsed in the calling thread (process start-up and
+# result transfer cost more than they save)
+PARALLEL_MIN_BYTES = 32 << 20
+
+# Process pool shared by all parallel parses, created on first use
+_process_pool = None
+_process_pool_size = 0
+_process_pool_lock = threading.Lock()
+
+# SWAR constants: eight ASCII bytes are handled at once inside one uint64 word
+_U = np.uint64
+_LOW_NIBBLES = _U(0x0F0F0F0F0F0F0F0F)
+_HIGH_BITS = _U(0x8080808080808080)
+_LOW_SEVEN_BITS = _U(0x7F7F7F7F7F7F7F7F)
+_ABOVE_NINE = _U(0x4646464646464646)  # 0x80 - ':', carries into the high bit for bytes > '9'
+_ASCII_ZERO = _U(0x3030303030303030)
+_ASCII_MINUS = _U(0x2D2D2D2D2D2D2D2D)
+_ABOVE_SPACE = _U(0x5F5F5F5F5F5F5F5F)  # 0x80 - '!', carries into the high bit for bytes > ' '
+
+
+def parse_tt1_header(lines):
+    """
+    Parses TT1 header lines ("Key = Value") into a dict.
+    Samples/ShotNo become int, TriggerTime/Period become float (ms).
+    Lines without '=' (e.g. blank lines) are ignored.
+    """
+    header = {}
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("ascii", errors="replace")
+        if "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        key, value = key.strip(), value.strip()
+        try:
+            if key in _INT_KEYS:
+                value = int(value.split()[0])
+            elif key in _FLOAT_KEYS:
+                value = float(value.split()[0])
+        except (ValueError, IndexError):
+            pass
+        header[key] = value
+    return header
+
+
+def is_zip_shot(path):
+    """True for a shot packed as one zip file (data/1275.zip holding the .txt files)."""
+    return str(path).lower().endswith(ZIP_EXT) and os.path.isfile(path)
+
+
+def split_zip_member(path):
+    """(zip path, member name) of a path inside a zip file (data/1275.zip/IP1.txt), or None."""
+    head, parts = os.path.abspath(path), []
+    while not os.path.exists(head):
+        head, tail = os.path.split(head)
+        if not tail:
+            return None
+        parts.insert(0, tail)
+    if not parts or not is_zip_shot(head):
+        return None
+    return head, "/".join(parts)
+
+
+def is_compressed(path):
+    """True if path is read through a decompressor (.gz/.bz2/.xz file or zip member)."""
+    return os.path.splitext(path)[1] in _OPENERS or (not os.path.exists(path) and split_zip_member(path) is not None)
+
+
+def tt1_signal_name(path):
+    """Signal name of a TT1 file path (IP1 for IP1.txt, IP1.txt.gz or 1275.zip/IP1.txt)."""
+    name = os.path.basename(path)
+    for suffix in TT1_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return os.path.splitext(name)[0]
+
+
+def tt1_stat(path):
+    """os.stat of a TT1 file; members of a zip file get the stat of the zip."""
+    try:
+        return os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        member = split_zip_member(path)
+        if member is None:
+            raise
+        return os.stat(member[0])
+
+
+def _zip_member_name(names, member):
+    """Member of the zip matching member, also when the shot folder itself was zipped (1275/IP1.txt)."""
+    if member in names:
+        return member
+    matches = sorted((name for name in names if name.endswith("/" + member)), key=lambda m: (m.count("/"), m))
+    if not matches:
+        raise FileNotFoundError(f"No member {member} in zip file")
+    return matches[0]
+
+
+def open_tt1(path):
+    """
+    Opens a TT1 file for binary reading: plain .txt, .txt.gz/.bz2/.xz (decompressed as it
+    is read) or a member of a zip file (data/1275.zip/IP1.txt). Nothing is extracted to disk.
+    """
+    opener = _OPENERS.get(os.path.splitext(path)[1])
+    if opener is not None:
+        return opener(path, "rb")
+    if not os.path.exists(path):
+        member = split_zip_member(path)
+        if member is not None:
+            # The member keeps the zip file open until it is closed itself
+            with zipfile.ZipFile(member[0]) as archive:
+                return archive.open(_zip_member_name(archive.namelist(), member[1]))
+    return open(path, "rb")
+
+
+def _size_hint(path, f):
+    """Decompressed size of a TT1 file when it is known up front (plain, gzip, zip), else a guess."""
+    ext = os.path.splitext(path)[1]
+    if ext == ".gz":
+        # ISIZE trailer: size of the (last) member modulo 2**32, only a hint; capped at the
+        # deflate limit so a truncated file cannot ask for a huge buffer
+        with open(path, "rb") as raw:
+            size = raw.seek(0, os.SEEK_END)
+            raw.seek(max(size - 4, 0))
+            trailer = raw.read(4)
+        return min(struct.unpack("<I", trailer)[0], size * 1032) if len(trailer) == 4 else size
+    if ext in _OPENERS:
+        return os.path.getsize(path) * 8  # Typical ratio of bz2/xz on TT1 text
+    if isinstance(f, zipfile.ZipExtFile):
+        zip_path, member = split_zip_member(path)
+        with zipfile.ZipFile(zip_path) as archive:
+            return archive.getinfo(_zip_member_name(archive.namelist(), member)).file_size
+    return os.fstat(f.fileno()).st_size
+
+
+def list_tt1_files(path):
+    """
+    {signal name: file path} of the TT1 files of a shot folder or zip file, by name.
+    A plain .txt wins over a compressed copy of the same signal.
+    """
+    files = {}
+    if is_zip_shot(path):
+        try:
+            with zipfile.ZipFile(path) as archive:
+                members = [info.filename for info in archive.infolist() if not info.is_dir()]
+        except zipfile.BadZipFile as e:
+            print(f"Cannot read {path}: {e}")  # e.g. still being copied
+            return {}
+        for member in sorted(members, key=lambda m: (m.count("/"), m)):
+            base = member.rsplit("/", 1)[-1]
+            if base.endswith(".txt") and base[:-4] not in files:
+                files[base[:-4]] = os.path.join(path, base)
+        return dict(sorted(files.items()))
+    rank = {suffix: i for i, suffix in enumerate(TT1_SUFFIXES)}
+    found = {}
+    for e in os.scandir(path):
+        if not e.is_file():
+            continue
+        name = tt1_signal_name(e.name)
+        suffix = e.name[len(name):]
+        if suffix in rank and (name not in found or rank[suffix] < found[name][0]):
+            found[name] = (rank[suffix], e.path)
+    return {name: found[name][1] for name in sorted(found)}
+
+
+def find_tt1_file(path, name):
+    """
+    Path of signal name in a shot folder or zip file: <name>.txt, else the first of
+    <name>.txt.gz/.bz2/.xz that exists. Defaults to <name>.txt (so a missing signal
+    fails with the usual FileNotFoundError).
+    """
+    txt_path = os.path.join(path, f"{name}.txt")
+    if is_zip_shot(path) or os.path.exists(txt_path):
+        return txt_path
+    for suffix in TT1_SUFFIXES[1:]:
+        candidate = os.path.join(path, f"{name}{suffix}")
+        if os.path.exists(candidate):
+            return candidate
+    return txt_path
+
+
+def read_tt1_header(path):
+    """Reads only the header of a TT1 text file (compressed files: only the first block is decompressed)."""
+    with open_tt1(path) as f:
+        lines = [f.readline() for _ in range(HEADER_LINES)]
+    return parse_tt1_header(lines)
+
+
+def _read_buffer(path):
+    """
+    Reads the whole file into a buffer padded with spaces on both sides,
+    so 16-byte windows around any number stay inside the buffer.
+    Compressed files are decompressed straight into that buffer (readinto), so there
+    is no temporary file and no second copy of the text.
+
+    Returns (buf, start, end, header) with buf[start:end] being the data rows.
+    """
+    compressed = is_compressed(path)
+    with open_tt1(path) as f:
+        buf = bytearray(_size_hint(path, f) + 16)
+        end = 8
+        while True:
+            if end == len(buf) - 8:
+                more = f.read(_BLOCK_BYTES)
+                if not more:
+                    break
+                # Larger than the hint: grow the buffer geometrically
+                buf[end:end] = more
+                end += len(more)
+                buf.extend(bytes(max(len(buf), _BLOCK_BYTES)))
+                continue
+            # Block-sized reads: decompressors return each block as a new bytes object,
+            # small blocks keep that staging copy in cache
+            n = f.readinto(memoryview(buf)[end:min(end + _STREAM_BLOCK_BYTES, len(buf) - 8)] if compressed
+                           else memoryview(buf)[end:len(buf) - 8])
+            if not n:
+                break
+            end += n
+    del buf[end + 8:]
+    buf[:8] = b" " * 8
+    buf[end:] = b" " * 8
+
+    start = 8
+    for _ in range(HEADER_LINES):
+        nl = buf.find(b"\n", start, end)
+        if nl < 0:
+            start = end
+            break
+        start = nl + 1
+    header = parse_tt1_header(bytes(buf[8:start]).splitlines())
+    return buf, start, end, header
+
+
+def read_tt1_file(path):
+    """
+    Reads a TT1 text file (8 header lines, then "time value" rows).
+
+    Returns:
+        raw_data (np.ndarray): Signal column, float64
+        prof_time (np.ndarray): Time column (ms), float64
+        header (dict): Parsed header, see parse_tt1_header
+    """
+    buf, start, end, header = _read_buffer(path)
+    columns = _parse_fixed_point(buf, start, end, header.get("Samples"))
+    if columns is None:
+        columns = _parse_generic(bytes(buf[start:end]))
+    prof_time, raw_data = columns
+    if len(raw_data) == 0:
+        raise ValueError(f"No samples in {path}")
+    return raw_data, prof_time, header
+
+
+def read_tt1_signal(path, processes=1, min_parallel_bytes=PARALLEL_MIN_BYTES):
+    """
+    Reads only the signal column of a TT1 text file. The time column is not parsed,
+    it is described by a Timebase built from the header and the first/last row.
+
+    processes: With more than one, files of at least min_parallel_bytes are split into
+               newline-aligned byte ranges parsed in a process pool (see _read_parallel).
+               The result is bit-identical to the serial parse. Compressed files are
+               always parsed serially, as they are decompressed in one stream.
+
+    Returns:
+        raw_data (np.ndarray): Signal column, float64
+        timebase (Timebase): (t0, dt, n) descriptor of the time axis (ms)
+        header (dict): Parsed header, see parse_tt1_header
+    """
+    if processes > 1 and not is_compressed(path) and os.path.getsize(path) >= min_parallel_bytes:
+        return _read_parallel(path, processes)
+
+    buf, start, end, header = _read_buffer(path)
+    columns = _parse_fixed_point(buf, start, end, header.get("Samples"), time_column=False)
+    if columns is None:
+        prof_time, raw_data = _parse_generic(bytes(buf[start:end]))
+        if len(raw_data) == 0:
+            raise ValueError(f"No samples in {path}")
+        t_first, t_last = prof_time[0], prof_time[-1]
+    else:
+        raw_data = columns[1]
+        if len(raw_data) == 0:
+            raise ValueError(f"No samples in {path}")
+        t_first, t_last = _first_last_time(buf, start, end)
+    return raw_data, Timebase.from_header(header, len(raw_data), t_first, t_last), header
+
+
+def _read_parallel(path, processes, chunks=None):
+    """
+    Parses one file across a process pool. The data rows are cut into byte ranges that
+    start right after a line break; every worker reads and parses its own range and the
+    parts are copied into one preallocated array in file order.
+    """
+    with open(path, "rb") as f:
+        header = parse_tt1_header([f.readline() for _ in range(HEADER_LINES)])
+        data_start = f.tell()
+        size = os.fstat(f.fileno()).st_size
+        first_row = _row_at(f, data_start)
+        last_row = _last_row(f, data_start, size)
+        if first_row is None or last_row is None:
+            raise ValueError(f"No samples in {path}")
+
+        # A few ranges per process so an uneven range does not leave the others idle
+        chunks = chunks if chunks else processes * 4
+        bounds = [data_start]
+        for i in range(1, chunks):
+            f.seek(max(data_start + (size - data_start) * i // chunks - 1, bounds[-1]))
+            f.readline()  # move to the start of the next row
+            if f.tell() >= size:
+                break
+            if f.tell() > bounds[-1]:
+                bounds.append(f.tell())
+        bounds.append(size)
+
+    pool = _get_process_pool(processes)
+    parts = list(pool.map(_parse_range, [path] * (len(bounds) - 1), bounds[:-1], bounds[1:]))
+
+    n = sum(len(part) for part in parts)
+    if n == 0:
+        raise ValueError(f"No samples in {path}")
+    raw_data = np.empty(n)
+    row = 0
+    for part in parts:
+        raw_data[row:row + len(part)] = part
+        row += len(part)
+    return raw_data, Timebase.from_header(header, n, first_row[0], last_row[0]), header
+
+
+def _parse_range(path, start, end):
+    """Signal column of the rows in bytes [start, end) of a file (runs in a pool process)."""
+    size = end - start
+    buf = bytearray(size + 16)
+    with open(path, "rb") as f:
+        f.seek(start)
+        n = f.readinto(memoryview(buf)[8:8 + size])
+    buf[:8] = b" " * 8
+    buf[8 + n:] = b" " * (len(buf) - 8 - n)
+    if not buf.strip():
+        return np.empty(0)
+    columns = _parse_fixed_point(buf, 8, 8 + n, None, time_column=False)
+    if columns is None:
+        return _parse_generic(bytes(buf[8:8 + n]))[1]
+    return columns[1]
+
+
+def _get_process_pool(processes):
+    """
+    Returns the shared process pool, (re)created with `processes` workers. Spawned
+    rather than forked, as the loaders call this from threads of a running Qt app.
+    """
+    global _process_pool, _process_pool_size
+    with _process_pool_lock:
+        if _process_pool is None or _process_pool_size != processes:
+            if _process_pool is not None:
+                _process_pool.shutdown(wait=False)
+            _process_pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+            _process_pool_size = processes
+        return _process_pool
+
+
+def read_tt1_window(path, t_start=None, t_end=None, decimate=1, line_index=None):
+    """
+    Reads only the rows of a TT1 text file with t_start <= t < t_end (ms), keeping
+    every decimate-th of them. Rows are located by bisecting the file on the time
+    column, so only the window (plus a few probe reads) is read and parsed.
+
+    line_index: Optional (offsets, stride, timebase, header) from build_tt1_line_index
+                (e.g. persisted by txt_cache). The window is then read with one seek to
+                the nearest indexed row, without probing the file.
+
+    Returns:
+        raw_data (np.ndarray): Signal column of the window, float64
+        timebase (Timebase): Time axis of the returned samples
+        header (dict): Parsed header, see parse_tt1_header
+    """
+    decimate = max(1, int(decimate))
+    if line_index is not None:
+        return _read_indexed_window(path, t_start, t_end, decimate, line_index)
+    if is_compressed(path):
+        # A compressed stream cannot be bisected: decompress and parse it once, then slice
+        raw_data, timebase, header = read_tt1_signal(path)
+        i0, i1 = timebase.index_range(t_start, t_end)
+        return raw_data[i0:i1:decimate].copy(), timebase.window(i0, i1, decimate), header
+
+    with open(path, "rb") as f:
+        header = parse_tt1_header([f.readline() for _ in range(HEADER_LINES)])
+        data_start = f.tell()
+        size = os.fstat(f.fileno()).st_size
+        n = header.get("Samples")
+        first_row = _row_at(f, data_start)
+        last_row = _last_row(f, data_start, size)
+        if not isinstance(n, int) or n <= 0 or first_row is None or last_row is None:
+            # No usable header: read everything and slice
+            raw_data, timebase, header = read_tt1_signal(path)
+            i0, i1 = timebase.index_range(t_start, t_end)
+            return raw_data[i0:i1:decimate].copy(), timebase.window(i0, i1, decimate), header
+
+        timebase = Timebase.from_header(header, n, first_row[0], last_row[0])
+        i0, i1 = timebase.index_range(t_start, t_end)
+        window = timebase.window(i0, i1, decimate)
+        if i1 <= i0:
+            return np.empty(0), window, header
+
+        offset = _find_row(f, data_start, size, timebase, i0)
+        f.seek(offset)
+        lines = []
+        remaining = i1 - i0
+        while remaining > 0:
+            line = f.readline()
+            if not line:
+                break
+            if line.strip():
+                lines.append(line)
+                remaining -= 1
+
+    raw_data = _parse_rows(b"".join(lines), i1 - i0, path)
+    return raw_data[::decimate].copy() if decimate > 1 else raw_data, window, header
+
+
+def _read_indexed_window(path, t_start, t_end, decimate, line_index):
+    offsets, stride, timebase, header = line_index
+    i0, i1 = timebase.index_range(t_start, t_end)
+    window = timebase.window(i0, i1, decimate)
+    if i1 <= i0:
+        return np.empty(0), window, header
+
+    # Indexed rows bracketing the window; the last offset is the end of the data
+    first_slot = i0 // stride
+    last_slot = min(-(-i1 // stride), len(offsets) - 1)
+    with open(path, "rb") as f:
+        f.seek(int(offsets[first_slot]))
+        chunk = f.read(int(offsets[last_slot]) - int(offsets[first_slot]))
+
+    skip = i0 - first_slot * stride
+    count = i1 - i0
+    newlines = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == 10)
+    begin = int(newlines[skip - 1]) + 1 if skip else 0
+    stop = int(newlines[skip + count - 1]) + 1 if len(newlines) >= skip + count else len(chunk)
+    raw_data = _parse_rows(chunk[begin:stop], count, path)
+    return raw_data[::decimate].copy() if decimate > 1 else raw_data, window, header
+
+
+def iter_tt1_chunks(path, chunk_samples=1 << 16, t_start=None, t_end=None, line_index=None):
+    """
+    Streams a TT1 text file: yields (raw_data, timebase) for consecutive blocks of at most
+    chunk_samples rows with t_start <= t < t_end (ms), in time order. Only the current
+    block is held in memory; the start row is found like in read_tt1_window.
+    line_index: Optional (offsets, stride, timebase, header) from build_tt1_line_index.
+    Compressed files are decompressed twice as a stream, once for the first/last time
+    stamps and once for the rows, so they never have to be held whole either.
+    """
+    chunk_samples = max(1, int(chunk_samples))
+    compressed = is_compressed(path)
+    if compressed:
+        header, first_time, last_time = _stream_first_last(path)
+    with open_tt1(path) as f:
+        if compressed:
+            n = header.get("Samples")
+            if not isinstance(n, int) or n <= 0 or first_time is None:
+                raw_data, timebase, _ = read_tt1_signal(path)
+                i0, i1 = timebase.index_range(t_start, t_end)
+                for k in range(i0, i1, chunk_samples):
+                    stop = min(k + chunk_samples, i1)
+                    yield raw_data[k:stop].copy(), timebase.window(k, stop)
+                return
+            timebase = Timebase.from_header(header, n, first_time, last_time)
+            i0, i1 = timebase.index_range(t_start, t_end)
+            if i1 <= i0:
+                return
+            for _ in range(HEADER_LINES):
+                f.readline()
+            skip = i0  # Rows before the window are decompressed and dropped block by block
+        elif line_index is not None:
+            offsets, stride, timebase, header = line_index
+            i0, i1 = timebase.index_range(t_start, t_end)
+            if i1 <= i0:
+                return
+            f.seek(int(offsets[i0 // stride]))
+            skip = i0 % stride
+        else:
+            header = parse_tt1_header([f.readline() for _ in range(HEADER_LINES)])
+            data_start = f.tell()
+            size = os.fstat(f.fileno()).st_size
+            n = header.get("Samples")
+            first_row = _row_at(f, data_start)
+            last_row = _last_row(f, data_start, size)
+            if not isinstance(n, int) or n <= 0 or first_row is None or last_row is None:
+                # No usable header: read everything and hand it out in blocks
+                raw_data, timebase, _ = read_tt1_signal(path)
+                i0, i1 = timebase.index_range(t_start, t_end)
+                for k in range(i0, i1, chunk_samples):
+                    stop = min(k + chunk_samples, i1)
+                    yield raw_data[k:stop].copy(), timebase.window(k, stop)
+                return
+            timebase = Timebase.from_header(header, n, first_row[0], last_row[0])
+            i0, i1 = timebase.index_range(t_start, t_end)
+            if i1 <= i0:
+                return
+            f.seek(_find_row(f, data_start, size, timebase, i0))
+            skip = 0
+
+        buf = b""
+        eof = False
+        index = i0
+        while skip > chunk_samples:
+            # Drop leading rows without keeping them (compressed streams start at row 0)
+            newlines = np.flatnonzero(np.frombuffer(buf, dtype=np.uint8) == 10)
+            if len(newlines) >= skip:
+                buf = buf[int(newlines[skip - 1]) + 1:]
+                skip = 0
+                break
+            skip -= len(newlines)
+            buf = buf[int(newlines[-1]) + 1:] if len(newlines) else buf
+            block = f.read(_BLOCK_BYTES)
+            if not block:
+                break
+            buf += block
+        while index < i1:
+            count = min(chunk_samples, i1 - index)
+            want = skip + count
+            newlines = np.flatnonzero(np.frombuffer(buf, dtype=np.uint8) == 10)
+            while len(newlines) < want and not eof:
+                block = f.read(max(_BLOCK_BYTES, (want - len(newlines)) * 24))
+                eof = not block
+                buf += block
+                newlines = np.flatnonzero(np.frombuffer(buf, dtype=np.uint8) == 10)
+            if len(newlines) < want and eof and buf[int(newlines[-1]) + 1 if len(newlines) else 0:].strip():
+                # Last row without a trailing newline
+                buf += b"\n"
+                newlines = np.append(newlines, len(buf) - 1)
+            if len(newlines) < want:
+                raise ValueError(f"Expected {i1 - i0} samples in {path}, found {index - i0 + max(0, len(newlines) - skip)}")
+
+            begin = int(newlines[skip - 1]) + 1 if skip else 0
+            end = int(newlines[want - 1]) + 1
+            yield _parse_rows(buf[begin:end], count, path), timebase.window(index, index + count)
+            buf = buf[end:]
+            index += count
+            skip = 0
+
+
+def _parse_rows(chunk, count, path):
+    """Signal column of `count` complete data rows."""
+    buf = bytearray(b" " * 8 + chunk + b" " * 8)
+    columns = _parse_fixed_point(buf, 8, 8 + len(chunk), count, time_column=False)
+    raw_data = columns[1] if columns is not None else _parse_generic(chunk)[1]
+    if len(raw_data) != count:
+        raise ValueError(f"Expected {count} samples in {path}, found {len(raw_data)}")
+    return raw_data
+
+
+def build_tt1_line_index(path, stride=1024):
+    """
+    Scans a TT1 text file once and records the byte offset of every stride-th data row.
+
+    Returns (offsets, timebase, header): offsets[k] is where row k * stride starts and the
+    last element is the end of the data. Returns None when the rows cannot be indexed
+    (no Samples in the header, blank lines inside the data, compressed files, ...).
+    """
+    if is_compressed(path):
+        return None
+    with open(path, "rb") as f:
+        header = parse_tt1_header([f.readline() for _ in range(HEADER_LINES)])
+        data_start = f.tell()
+        size = os.fstat(f.fileno()).st_size
+        n = header.get("Samples")
+        first_row = _row_at(f, data_start)
+        last_row = _last_row(f, data_start, size)
+        if not isinstance(n, int) or n <= 0 or first_row is None or last_row is None or first_row[1] != data_start:
+            return None
+
+        # End of the data without trailing whitespace
+        f.seek(max(data_start, size - 256))
+        tail = f.read()
+        data_end = size - (len(tail) - len(tail.rstrip()))
+
+        offsets = [data_start]
+        rows = 1  # rows started so far (row 0 at data_start)
+        f.seek(data_start)
+        position = data_start
+        while position < data_end:
+            block = f.read(min(_BLOCK_BYTES * 32, data_end - position))
+            if not block:
+                break
+            newlines = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == 10)
+            # Newline j of the block starts row rows + j
+            starts = np.arange(rows, rows + len(newlines))
+            keep = starts % stride == 0
+            offsets.extend((newlines[keep] + position + 1).tolist())
+            rows += len(newlines)
+            position += len(block)
+
+    if rows != n:
+        return None
+    offsets.append(data_end)
+    timebase = Timebase.from_header(header, n, first_row[0], last_row[0])
+    return np.asarray(offsets, dtype=np.int64), timebase, header
+
+
+def _stream_first_last(path):
+    """(header, first time, last time) of a TT1 file in one sequential pass (times None if no rows)."""
+    with open_tt1(path) as f:
+        header = parse_tt1_header([f.readline() for _ in range(HEADER_LINES)])
+        line = f.readline()
+        while line and not line.strip():
+            line = f.readline()
+        if not line:
+            return header, None, None
+        first_time = float(line.split()[0])
+        tail = line
+        while True:
+            block = f.read(_BLOCK_BYTES)
+            if not block:
+                break
+            tail = (tail + block)[-256:]
+    tail = tail.rstrip()
+    return header, first_time, float(tail[tail.rfind(b"\n") + 1:].split()[0])
+
+
+def _row_at(f, offset):
+    """Returns (time, offset) of the first complete row starting at or after offset."""
+    f.seek(offset)
+    line = f.readline()
+    while line and not line.strip():
+        offset = f.tell()
+        line = f.readline()
+    if not line:
+        return None
+    return float(line.split()[0]), offset
+
+
+def _last_row(f, data_start, size):
+    f.seek(max(data_start, size - 256))
+    tail = f.read().rstrip()
+    if not tail:
+        return None
+    return float(tail[tail.rfind(b"\n") + 1:].split()[0]), size
+
+
+def _find_row(f, data_start, size, timebase, row):
+    """
+    Byte offset of data row `row`. Each row's index is recovered from its time stamp
+    (the file's time column is within 1e-6 ms of the timebase), so the search is a
+    bisection over the file offsets.
+    """
+    def row_index(t):
+        return int(round((t - timebase.t0) / timebase.dt)) if timebase.dt > 0 else 0
+
+    lo, hi = data_start, size  # first row >= target starts in (lo, hi]
+    if row_index(_row_at(f, data_start)[0]) >= row:
+        return data_start
+    while hi - lo > 4096:
+        mid = (lo + hi) // 2
+        f.seek(mid)
+        f.readline()  # skip the partial row
+        probe = _row_at(f, f.tell())
+        if probe is None or row_index(probe[0]) >= row:
+            hi = mid
+        else:
+            lo = mid
+
+    # Linear scan of the last few kB
+    f.seek(lo)
+    if lo > data_start:
+        f.readline()
+    while True:
+        offset = f.tell()
+        line = f.readline()
+        if not line:
+            return offset
+        if line.strip() and row_index(float(line.split()[0])) >= row:
+            return offset
+
+
+def _first_last_time(buf, start, end):
+    """Parses the time stamp (first token) of the first and last data rows."""
+    first_end = buf.find(b"\n", start, end)
+    first_row = buf[start:first_end if first_end >= 0 else end]
+    body_end = end
+    while body_end > start and buf[body_end - 1] <= 32:
+        body_end -= 1
+    last_row = buf[buf.rfind(b"\n", start, body_end) + 1:body_end]
+    return float(first_row.split()[0]), float(last_row.split()[0])
+
+
+def _parse_generic(data):
+    """Slow but general path (any float format) for files the fast path rejects."""
+    table = np.loadtxt(data.splitlines(), dtype=np.float64, ndmin=2)
+    if table.shape[0] == 0:
+        return np.empty(0), np.empty(0)
+    return np.ascontiguousarray(table[:, 0]), np.ascontiguousarray(table[:, 1])
+
+
+def _swar_digits(x):
+    """Converts eight digit values (one per byte, most significant first) to an integer."""
+    x *= _U(2561)
+    x >>= _U(8)
+    x &= _U(0x00FF00FF00FF00FF)
+    x *= _U(6553601)
+    x >>= _U(16)
+    x &= _U(0x0000FFFF0000FFFF)
+    x *= _U(42949672960001)
+    x >>= _U(32)
+    return x
+
+
+def _separators(x):
+    """High bit set on every byte of x that is whitespace or a control character (<= 0x20)."""
+    flags = x & _LOW_SEVEN_BITS
+    flags += _ABOVE_SPACE
+    flags |= x
+    flags ^= _HIGH_BITS
+    return flags
+
+
+def _non_digits(x):
+    """High bit set on every byte of x that is not an ASCII digit '0'..'9'."""
+    # Every byte is at least 0x80 after the OR and below 0x80 after the mask, so no borrow
+    # or carry crosses into the neighbouring byte
+    below = x | _HIGH_BITS
+    below -= _ASCII_ZERO
+    below ^= _HIGH_BITS
+    above = x & _LOW_SEVEN_BITS
+    above += _ABOVE_NINE
+    below |= above
+    below |= x  # non-ASCII bytes
+    below &= _HIGH_BITS
+    return below
+
+
+def _parse_fixed_point(buf, start, end, samples, time_column=True):
+    """
+    Fast path for the fixed-point layout written by the TT1 DAQ ("%f", e.g. "-0.000272").
+
+    The decimal points are located with one vectorized scan, then the 8 bytes before and
+    after each point are decoded with integer bit tricks (SWAR) instead of strtod. Values
+    are rebuilt as mantissa / 10**F, which is exactly what a correctly rounded float parse
+    returns, so the output is bit-identical to pandas/numpy.
+
+    Returns (prof_time, raw_data) or None when the text does not follow the layout
+    (the caller then falls back to _parse_generic). With time_column=False only the
+    values are decoded and prof_time is None.
+    """
+    arr = np.frombuffer(buf, dtype=np.uint8)
+
+    # Number of fraction digits, taken from the first value
+    first_dot = buf.find(b".", start, end)
+    if first_dot < 0:
+        return None
+    frac_digits = 0
+    while 48 <= buf[first_dot + 1 + frac_digits] <= 57:
+        frac_digits += 1
+    if not 1 <= frac_digits <= 6:
+        return None
+
+    n_rows = samples
+    if not n_rows:
+        n_rows = int(np.count_nonzero(arr[start:end] == 46)) // 2
+
+    # 16-byte window [dot - 8, dot + 8) around every decimal point, viewed as two uint64
+    windows = np.ndarray((len(buf) - 15,), dtype=np.dtype((np.void, 16)), buffer=buf, strides=(1,))
+
+    # Fraction digits: bytes dot+1 .. dot+F of the high word, then whitespace
+    frac_keep = _U(((1 << (8 * frac_digits)) - 1) << 8) & _LOW_NIBBLES
+    frac_span = _U(((1 << (8 * frac_digits)) - 1) << 8) & _HIGH_BITS
+    frac_shift = _U(64 - 8 * (frac_digits + 1))
+    after_shift = _U(8 * (frac_digits + 1))
+    frac_scale = 10 ** frac_digits
+
+    prof_time = np.empty(n_rows) if time_column else None
+    raw_data = np.empty(n_rows)
+    row = 0
+    block_start = start
+    while block_start < end:
+        # Blocks always end on a line break, so even tokens are time and odd are data
+        block_end = end
+        if block_start + _BLOCK_BYTES < end:
+            block_end = buf.rfind(b"\n", block_start, block_start + _BLOCK_BYTES) + 1
+            if block_end <= block_start:
+                return None
+
+        dots = np.flatnonzero(arr[block_start:block_end] == 46)
+        n_block = len(dots) // 2
+        if len(dots) != 2 * n_block or row + n_block > n_rows:
+            return None
+        if not time_column:
+            dots = dots[1::2]
+        dots += block_start - 8
+        words = windows[dots].view("<u8").reshape(-1, 2)
+        lo = words[:, 0].byteswap()  # byte i = char i+1 before the dot
+        hi = words[:, 1]             # byte i = char i after the dot
+
+        # Fraction: F digits, followed by whitespace
+        bad = _non_digits(hi)
+        bad &= frac_span
+        if bad.any():
+            return None
+        after = hi >> after_shift
+        after &= _U(0xFF)
+        if np.any(after > _U(0x20)):
+            return None
+        frac = hi & frac_keep
+        frac <<= frac_shift
+        frac = _swar_digits(frac)
+
+        # Integer part: run of digits ending right before the dot. The first byte
+        # below '0' in front of it ends the run and may be a '-' sign.
+        first = lo | _HIGH_BITS
+        first -= _ASCII_ZERO
+        first ^= _HIGH_BITS
+        first &= _HIGH_BITS           # flags on bytes below '0'
+        sign_byte = np.negative(first)
+        sign_byte &= first            # lowest flagged byte only
+        sign_byte >>= _U(7)
+        if np.any(sign_byte <= _U(1)):  # no digit before the dot, or more than 7 digits
+            return None
+        digits = sign_byte - _U(1)    # 0xFF on the bytes of the run
+        if np.any(_non_digits(lo) & digits):  # letters etc. sort above '9'
+            return None
+        digits &= _LOW_NIBBLES
+        digits &= lo
+        mantissa = _swar_digits(digits.byteswap())
+        mantissa *= _U(frac_scale)
+        mantissa += frac
+
+        # The byte ending the run is a separator, or a '-' right after one ("1-2.5" and
+        # "e-3.0" are not numbers)
+        sign_byte *= _U(0xFF)
+        lo_sign = lo ^ _ASCII_MINUS
+        lo_sign &= sign_byte
+        negative = (lo_sign == 0).astype(np.uint64)
+        separator = sign_byte << (negative << _U(3))  # char in front of a '-' (0 past the window)
+        separator &= _HIGH_BITS
+        separator &= _separators(lo)
+        if not separator.all():
+            return None
+        negative <<= _U(63)
+
+        values = mantissa.astype(np.float64)
+        values /= frac_scale
+        values.view(np.uint64)[:] |= negative  # sign bit, keeps "-0.000000" as -0.0
+
+        if time_column:
+            prof_time[row:row + n_block] = values[0::2]
+            raw_data[row:row + n_block] = values[1::2]
+        else:
+            raw_data[row:row + n_block] = values
+        row += n_block
+        block_start = block_end
+
+    if row != n_rows:
+        return None
+    return prof_time, raw_data
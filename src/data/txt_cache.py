@@ -0,0 +1,172 @@
+# src/data/txt_cache.py
+import json
+import os
+import threading
+import numpy as np
+from src.data.tt1_reader import read_tt1_signal, build_tt1_line_index, split_zip_member, tt1_signal_name, tt1_stat
+from src.data.timebase import Timebase
+
+# Sidecar cache lives next to the text files: <shot dir>/.tt1_cache/<signal>.npy + manifest.json
+# (compressed <signal>.txt.gz etc. share it; a zipped shot uses <zip dir>/.tt1_cache/<shot>.zip/).
+# The .npy holds the signal column only, the time axis is stored as a (t0, dt, n) descriptor.
+# <signal>.lines.npy is a sparse row offset index used for windowed reads of the .txt.
+CACHE_DIR_NAME = ".tt1_cache"
+MANIFEST_NAME = "manifest.json"
+
+# Data rows between two entries of the line index (~100 entries for a 100k sample shot)
+LINE_INDEX_STRIDE = 1024
+
+# Serializes manifest updates from parallel loader threads
+_manifest_lock = threading.Lock()
+
+# Line indexes already loaded in this process: abs path -> (source stamp, index)
+_line_indexes = {}
+
+
+def cache_dir_for(txt_path):
+    member = split_zip_member(txt_path) if not os.path.exists(txt_path) else None
+    if member is not None:
+        zip_path = member[0]
+        return os.path.join(os.path.dirname(zip_path), CACHE_DIR_NAME, os.path.basename(zip_path))
+    return os.path.join(os.path.dirname(os.path.abspath(txt_path)), CACHE_DIR_NAME)
+
+
+def _read_manifest(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, MANIFEST_NAME), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _source_stamp(st):
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def cached_tt1(txt_path):
+    """
+    Returns (raw_data, timebase, header) from a valid cache entry without parsing,
+    or None when the .txt has no (or an outdated) entry.
+    """
+    st = tt1_stat(txt_path)
+    cache_dir = cache_dir_for(txt_path)
+    name = tt1_signal_name(txt_path)
+    entry = _read_manifest(cache_dir).get(name)
+    if entry is None or entry.get("source") != _source_stamp(st) or "timebase" not in entry:
+        return None
+    try:
+        raw_data = np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode="r")
+        timebase = Timebase(*entry["timebase"])
+    except (OSError, ValueError, TypeError):
+        return None  # Missing or truncated .npy
+    if raw_data.ndim != 1 or len(raw_data) != len(timebase):
+        return None
+    return raw_data, timebase, entry.get("header", {})
+
+
+def load_cached_tt1(txt_path, processes=1):
+    """
+    Reads a TT1 text file through the binary sidecar cache.
+
+    A valid cache entry (same size and mtime as the .txt, or as the compressed
+    file / zip it is read from) is opened with
+    np.load(mmap_mode='r'), so the returned array is read-only and shared
+    between processes. Otherwise the text is parsed (with `processes`, see
+    read_tt1_signal) and the cache rewritten.
+
+    Returns:
+        raw_data, timebase, header (same as read_tt1_signal)
+    """
+    cached = cached_tt1(txt_path)
+    if cached is not None:
+        return cached
+
+    st = tt1_stat(txt_path)
+    cache_dir = cache_dir_for(txt_path)
+    name = tt1_signal_name(txt_path)
+    raw_data, timebase, header = read_tt1_signal(txt_path, processes=processes)
+    try:
+        _write_entry(cache_dir, name, os.path.join(cache_dir, f"{name}.npy"), raw_data, _source_stamp(st), timebase, header)
+    except OSError as e:
+        # Read-only shot directory etc.: still return the parsed data
+        print(f"Cache write failed for {name}: {e}")
+    return raw_data, timebase, header
+
+
+def _write_entry(cache_dir, name, npy_path, raw_data, source, timebase, header):
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write to a temp file and rename so readers never see a partial .npy
+    tmp_path = f"{npy_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, raw_data)
+    os.replace(tmp_path, npy_path)
+
+    _update_manifest(cache_dir, name, {"source": source, "timebase": list(timebase.key()), "header": header})
+
+
+def tt1_line_index(txt_path, build=True):
+    """
+    Returns the line index of a TT1 text file as (offsets, stride, timebase, header),
+    the line_index argument of read_tt1_window.
+
+    The index is kept next to the file (.tt1_cache/<signal>.lines.npy) and rebuilt with
+    one scan of the file when missing or outdated (build=False returns None instead).
+    None is also returned for files that cannot be indexed.
+    """
+    st = tt1_stat(txt_path)
+    source = _source_stamp(st)
+    key = os.path.abspath(txt_path)
+    memo = _line_indexes.get(key)
+    if memo is not None and memo[0] == source:
+        return memo[1]
+
+    cache_dir = cache_dir_for(txt_path)
+    name = tt1_signal_name(txt_path)
+    index_path = os.path.join(cache_dir, f"{name}.lines.npy")
+    entry = _read_manifest(cache_dir).get(name, {}).get("line_index")
+    if entry is not None and entry.get("source") == source:
+        try:
+            index = (np.load(index_path), entry["stride"], Timebase(*entry["timebase"]), entry.get("header", {}))
+            _line_indexes[key] = (source, index)
+            return index
+        except (OSError, ValueError, KeyError, TypeError):
+            pass  # Missing or truncated index, rebuild
+    if not build:
+        return None
+
+    built = build_tt1_line_index(txt_path, LINE_INDEX_STRIDE)
+    if built is None:
+        return None
+    offsets, timebase, header = built
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, offsets)
+        os.replace(tmp_path, index_path)
+        _update_manifest(cache_dir, name, None, line_index={
+            "source": _source_stamp(st), "stride": LINE_INDEX_STRIDE, "timebase": list(timebase.key()), "header": header})
+    except OSError as e:
+        print(f"Line index write failed for {name}: {e}")
+    index = (offsets, LINE_INDEX_STRIDE, timebase, header)
+    _line_indexes[key] = (source, index)
+    return index
+
+
+def _update_manifest(cache_dir, name, entry, line_index=None):
+    """Replaces the .npy entry of a signal (entry) and/or its line index, keeping the other."""
+    with _manifest_lock:
+        manifest = _read_manifest(cache_dir)
+        current = manifest.get(name, {})
+        if entry is not None:
+            if "line_index" in current:
+                entry = dict(entry, line_index=current["line_index"])
+            current = entry
+        if line_index is not None:
+            current = dict(current, line_index=line_index)
+        manifest[name] = current
+        manifest_path = os.path.join(cache_dir, MANIFEST_NAME)
+        tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp_path, manifest_path)
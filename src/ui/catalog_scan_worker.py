@@ -0,0 +1,23 @@
+# src/ui/catalog_scan_worker.py
+from PySide6.QtCore import QThread, Signal
+from src.data.shot_catalog import shot_catalog
+
+
+class CatalogScanWorker(QThread):
+    """
+    Rescans a data root into the shot catalog off the Qt thread (headers only,
+    incremental). scanned(root) is emitted when the catalog is up to date.
+    """
+    scanned = Signal(str)
+
+    def __init__(self, root, parent=None):
+        super().__init__(parent)
+        self.root = root
+
+    def run(self):
+        try:
+            shot_catalog.scan(self.root)
+        except Exception as e:
+            print(f"Catalog scan of {self.root} failed: {e}")
+            return
+        self.scanned.emit(self.root)
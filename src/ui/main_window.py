@@ -1,14 +1,23 @@
 # src/ui/main_window.py
 import sys
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                            QLabel, QLineEdit, QPushButton, QComboBox, QSplitter, QFrame, QTabWidget, QFileDialog)
-from PySide6.QtCore import Qt
+                            QLabel, QLineEdit, QPushButton, QComboBox, QSplitter, QFrame, QTabWidget, QFileDialog,
+                            QProgressBar, QCompleter)
+from PySide6.QtCore import Qt, QStringListModel, Signal
 from src.ui.widgets.spectrogram_widget import SpectrogramWidget
 from src.ui.widgets.wavelet_widget import WaveletWidget
 from src.ui.widgets.phase_widget import PhaseWidget
 from src.ui.widgets.phase_cycle_widget import PhaseCycleWidget
 from src.ui.widgets.svd_widget import SVDWidget
-from src.data.loader import fetch_mhd_data, load_mds_data, load_txt_data
+from src.ui.shot_load_worker import ShotLoadWorker
+from src.ui.catalog_scan_worker import CatalogScanWorker
+from src.data.shot_catalog import shot_catalog
+from src.data.shot_bundle import open_bundle
+from src.data.fetch_orchestrator import fetch_orchestrator
+from src.data.alignment import overlay_grid
+from src.data.mds_pool import mds_pool
+from src.data.prefetch import shot_prefetcher
+from src.data.ingest import shot_ingester
 from src.data.analysis import SignalProcessor
 from src.utils.consts import MODE_POLOIDAL, MODE_TOROIDAL
 import os
@@ -21,6 +30,8 @@ from src.utils.export_manager import ExportManager
 from src.utils.config_manager import config_manager
 
 class MainWindow(QMainWindow):
+    shot_ingested = Signal(str) # Data root; emitted from the ingest thread, delivered queued
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("MHD Analysis Program")
@@ -36,8 +47,14 @@ class MainWindow(QMainWindow):
         self.current_time = None
         self.current_fs = 200000.0
         self.last_loaded_shot = None
+        self.shot_bundle = None # All signals of the displayed shot, materialized on demand
         self._updating_t0 = False
         
+        # Background Loading
+        self._load_worker = None
+        self._old_load_workers = [] # Cancelled workers, kept alive until their thread ends
+        self._catalog_workers = [] # Running catalog scans
+        
         # Load Params
         self.params_dict = config_manager.get_params()
         
@@ -61,6 +78,11 @@ class MainWindow(QMainWindow):
         self.setup_top_panel()
         self.setup_central_splitter()
         
+        # Shot list / overlay signals of the data root (from the header-only catalog)
+        self.shot_ingested.connect(self.on_catalog_scanned)
+        shot_ingester.on_ingested.append(self._on_shot_ingested)
+        self.refresh_catalog()
+        
         
         # Apply Theme
         self.apply_dark_theme()
@@ -76,6 +98,24 @@ class MainWindow(QMainWindow):
         # }
         # """
         # self.setStyleSheet(dark_style)
+
+    def closeEvent(self, event):
+        # Stop background loads before the window (and their QThread objects) go away
+        shot_prefetcher.cancel()
+        shot_ingester.stop()
+        if self._on_shot_ingested in shot_ingester.on_ingested:
+            shot_ingester.on_ingested.remove(self._on_shot_ingested)
+        if self.shot_bundle is not None:
+            self.shot_bundle.cancel_preload()
+        for worker in [self._load_worker] + self._old_load_workers:
+            if worker is not None:
+                worker.cancel()
+                worker.wait()
+        for worker in list(self._catalog_workers):
+            worker.wait()
+        # Release pooled MDSplus connections
+        mds_pool.close_all()
+        super().closeEvent(event)
         
     def apply_dark_theme(self):
         # Modern Dark Theme Palette
@@ -202,6 +242,9 @@ class MainWindow(QMainWindow):
         layout.addWidget(QLabel("Shot No:"))
         self.shot_input = QLineEdit()
         self.shot_input.setFixedWidth(60)
+        self.shot_model = QStringListModel() # Shots of the data root, filled from the catalog
+        self.shot_input.setCompleter(QCompleter(self.shot_model, self.shot_input))
+        self.shot_input.editingFinished.connect(self.on_shot_edited)
         layout.addWidget(self.shot_input)
         
         # IP 
@@ -267,6 +310,13 @@ class MainWindow(QMainWindow):
         self.load_btn.clicked.connect(self.on_load_clicked)
         layout.addWidget(self.load_btn)
         
+        # Load Progress (per channel, hidden when idle)
+        self.load_progress = QProgressBar()
+        self.load_progress.setFixedWidth(140)
+        self.load_progress.setTextVisible(True)
+        self.load_progress.setVisible(False)
+        layout.addWidget(self.load_progress)
+        
         # Set t0 Button
         self.btn_set_t0 = QPushButton("Init Phase")
         self.btn_set_t0.clicked.connect(self.on_set_t0_clicked)
@@ -334,6 +384,63 @@ class MainWindow(QMainWindow):
         is_text_file = (text == "Text file")
         self.path_input.setEnabled(is_text_file)
         self.browse_btn.setEnabled(is_text_file)
+        if hasattr(self, 'spectro_widget'):
+            self.update_overlay_params()
+
+    def _data_root(self):
+        """Folder holding the shot folders/archives (parent of the current shot path)."""
+        path = os.path.abspath(self.path_input.text())
+        return os.path.dirname(path) if os.path.basename(path).split(".")[0].isdigit() else path
+
+    def refresh_catalog(self):
+        """Rescans the data root into the shot catalog in the background and watches it for new shots."""
+        if self.method_combo.currentText() != "Text file":
+            self.update_overlay_params()
+            return
+        shot_ingester.start(self._data_root())
+        worker = CatalogScanWorker(self._data_root(), parent=self)
+        worker.scanned.connect(self.on_catalog_scanned)
+        worker.finished.connect(lambda w=worker: self._catalog_workers.remove(w) if w in self._catalog_workers else None)
+        self._catalog_workers.append(worker)
+        worker.start()
+
+    def _on_shot_ingested(self, shot, path, summary):
+        # Ingest thread: hand over to the Qt thread
+        self.shot_ingested.emit(os.path.dirname(path))
+
+    def on_catalog_scanned(self, root):
+        if root != self._data_root():
+            return
+        self.shot_model.setStringList(sorted({str(shot) for shot, _ in shot_catalog.shots(root)}, key=int))
+        self.update_overlay_params()
+
+    def update_overlay_params(self, names=None):
+        """
+        Fills the overlay list with the signals of the current shot (no sample data is read).
+        names: signal names already looked up off the Qt thread (default: read from the catalog).
+        """
+        if names is None:
+            names = []
+            if self.method_combo.currentText() == "Text file":
+                names = shot_catalog.signal_names(self.path_input.text())
+        if not names:
+            names = list(self.params_dict) # MDSplus, or a shot not cataloged yet
+        if names:
+            self.spectro_widget.set_param_options(names)
+
+    def on_shot_edited(self):
+        # Typing another shot of the cataloged root points the data path at that shot
+        if self.method_combo.currentText() != "Text file":
+            return
+        try:
+            shot_int = int(self.shot_input.text())
+        except ValueError:
+            return
+        root = self._data_root()
+        path = shot_catalog.find_shot(shot_int, root)
+        if path is not None and os.path.abspath(self.path_input.text()) != path:
+            self.path_input.setText(path)
+            self.update_overlay_params()
 
     def setup_central_splitter(self):
         splitter = QSplitter(Qt.Horizontal)
@@ -467,14 +574,19 @@ class MainWindow(QMainWindow):
         if self.last_loaded_shot is not None:
             self.on_load_clicked()
 
-    def on_channel_changed(self, index, keep_view=True):
+    def on_channel_changed(self, index, keep_view=True, spectrogram=None):
         if self.current_data is None or index < 0:
             return
             
         # Update Spectrogram with selected channel
         if index < self.current_data.shape[0]:
             t_offset_sec = self.current_time[0]
-            self.spectro_widget.set_data(self.current_data[index, :], self.current_fs, t_offset=t_offset_sec, keep_view=keep_view)
+            # spectrogram: (channel, params, result) precomputed by ShotLoadWorker
+            precomputed = None
+            if spectrogram is not None and spectrogram[0] == index:
+                precomputed = spectrogram[1:]
+            self.spectro_widget.set_data(self.current_data[index, :], self.current_fs, t_offset=t_offset_sec, keep_view=keep_view,
+                                         spectrogram=precomputed)
             
             # Restore the "reset target" (Plasma Duration) if we have it
             if self.view_min is not None and self.view_max is not None:
@@ -493,6 +605,9 @@ class MainWindow(QMainWindow):
             folder_name = os.path.basename(dir_path)
             if folder_name.isdigit():
                 self.shot_input.setText(folder_name)
+            
+            # Index the shots next to it (headers only, incremental)
+            self.refresh_catalog()
 
     def on_load_clicked(self):
         shot_no = self.shot_input.text()
@@ -506,15 +621,15 @@ class MainWindow(QMainWindow):
         except ValueError:
             return
 
-        self.load_btn.setEnabled(False)
+        # Starting another load cancels the running one (and any prefetch/overlay preload)
+        self._cancel_load()
+        shot_prefetcher.cancel()
+        if self.shot_bundle is not None:
+            self.shot_bundle.cancel_preload()
+
         self.load_btn.setText("Loading...")
-        
-        # Check if we should keep view (same shot)
-        # Note: self.last_loaded_shot is updated at the END of this function (on success)
-        keep_view = (self.last_loaded_shot == shot_int)
-        
-        # Set Flag for WaveletWidget Logic in on_spectro_region_changed
-        self._loading_new_shot = not keep_view 
+        self.load_progress.setRange(0, 0) # Busy until the first channel arrives
+        self.load_progress.setVisible(True)
         
         # Fetch Data
         base_path = None
@@ -523,13 +638,68 @@ class MainWindow(QMainWindow):
         
         # If DAQ SV, base_path stays None, loader uses default.
         
-        data, time, ip_data, ip_time = fetch_mhd_data(shot_int, method, mode_str, suffix=type_str, ip_signal=ip_choice, base_path=base_path)
-        
-        if data is None:
-            self.load_btn.setText("Failed")
-            self.load_btn.setEnabled(True)
-            self._loading_new_shot = False # Reset Flag
+        # Loading runs in a worker thread; widgets are only touched in on_shot_loaded
+        worker = ShotLoadWorker(shot_int, method, mode_str, type_str, ip_choice, base_path=base_path,
+                                channel_index=self.channel_combo.currentIndex(), fs=self.current_fs,
+                                spectrogram_params=self.spectro_widget.spectrogram_params(), parent=self)
+        worker.progress.connect(self.on_load_progress)
+        worker.loaded.connect(self.on_shot_loaded)
+        worker.failed.connect(self.on_load_failed)
+        worker.finished.connect(self._on_load_worker_finished)
+        self._load_worker = worker
+        worker.start()
+
+    def _cancel_load(self):
+        if self._load_worker is not None:
+            self._load_worker.cancel()
+            self._old_load_workers.append(self._load_worker)
+            self._load_worker = None
+
+    def _on_load_worker_finished(self):
+        worker = self.sender()
+        if worker in self._old_load_workers:
+            self._old_load_workers.remove(worker)
+            worker.deleteLater()
+
+    def _is_current_load(self):
+        # Signals already queued by a cancelled worker are ignored
+        return self.sender() is not None and self.sender() is self._load_worker
+
+    def _end_load(self, text="Load"):
+        self.load_progress.setVisible(False)
+        self.load_btn.setText(text)
+        self._cancel_load() # Finished worker is released via its finished signal
+
+    def on_load_progress(self, done, total, param):
+        if not self._is_current_load():
             return
+        self.load_progress.setRange(0, total)
+        self.load_progress.setValue(done)
+        self.load_progress.setFormat(f"{param} {done}/{total}")
+
+    def on_load_failed(self, message):
+        if not self._is_current_load():
+            return
+        self._end_load("Failed")
+
+    def on_shot_loaded(self, result):
+        if not self._is_current_load():
+            return
+        shot_int = result["shot"]
+        data, time = result["data"], result["time"]
+        ip_time = result["ip_time"]
+        
+        # Check if we should keep view (same shot)
+        # Note: self.last_loaded_shot is updated below (on success)
+        keep_view = (self.last_loaded_shot == shot_int)
+        
+        # Set Flag for WaveletWidget Logic in on_spectro_region_changed
+        self._loading_new_shot = not keep_view 
+
+        # Keep the bundle so overlays reuse the signals already read (previous shot is dropped)
+        if self.shot_bundle is not None and self.shot_bundle is not result["bundle"]:
+            self.shot_bundle.cancel_preload()
+        self.shot_bundle = result["bundle"]
 
         # Store Original Data for t0 Shift
         self.original_data_matrix = data
@@ -545,7 +715,7 @@ class MainWindow(QMainWindow):
         self.current_fs = 200000.0 # Assuming fixed or returned from loader? Hardcoded for now.
         
         # self.duration_label.setText(f"Duration: {duration:.2f} ms") 
-        duration, ip_max, start_idx = SignalProcessor.cal_duration(ip_data, ip_time) if ip_data is not None else (0,0,0)
+        duration, ip_max, start_idx = result["duration"], result["ip_max"], result["start_idx"]
         
         self.current_duration = duration
         self.current_ip_max = ip_max / 1000.0 if ip_max else 0.0
@@ -566,15 +736,20 @@ class MainWindow(QMainWindow):
         self.last_loaded_shot = shot_int
 
         # Update Phase Widget Context
-        self.phase_widget.set_context(self.current_data, self.current_time, fs=self.current_fs, reset=not keep_view)
+        # Channels failing the health screening stay out of the phase fits and the SVD
+        health = result["health"]
+        excluded = health.excluded_channels() if health is not None else []
+        self.phase_widget.set_context(self.current_data, self.current_time, fs=self.current_fs, reset=not keep_view,
+                                      excluded_channels=excluded)
         if hasattr(self, 'phase_cycle_widget'):
-            self.phase_cycle_widget.set_context(self.current_data, self.current_time, fs=self.current_fs, reset=not keep_view)
+            self.phase_cycle_widget.set_context(self.current_data, self.current_time, fs=self.current_fs, reset=not keep_view,
+                                                excluded_channels=excluded)
         
         if hasattr(self, 'svd_widget'):
-            self.svd_widget.set_context(self.current_data, self.current_time, fs=self.current_fs)
+            self.svd_widget.set_context(self.current_data, self.current_time, fs=self.current_fs, excluded_channels=excluded)
         
-        # Trigger channel update (will set spectrogram data)
-        self.on_channel_changed(self.channel_combo.currentIndex(), keep_view=keep_view)
+        # Trigger channel update (will set spectrogram data, reusing the worker's spectrogram)
+        self.on_channel_changed(self.channel_combo.currentIndex(), keep_view=keep_view, spectrogram=result["spectrogram"])
         
         
         # Auto-Crop Range (Zoom to activity) - Only if NOT keeping view
@@ -613,8 +788,15 @@ class MainWindow(QMainWindow):
 
 
 
-        self.load_btn.setText("Load")
-        self.load_btn.setEnabled(True)
+        # Overlay list = signals of this shot (cataloged from headers only, in the worker)
+        worker = self._load_worker
+        self.update_overlay_params(result["signal_names"])
+
+        # Warm the shot cache with the neighbouring shots while this one is inspected
+        shot_prefetcher.schedule(shot_int, worker.method, worker.mode, worker.suffix, worker.ip_signal,
+                                 base_path=worker.base_path, estimate_bytes=data.nbytes)
+
+        self._end_load()
         self._loading_new_shot = False # Reset Flag
 
     def on_spectro_region_changed(self, t_start, t_end, freq_center, dfreq):
@@ -666,25 +848,28 @@ class MainWindow(QMainWindow):
         
         # print(f"Loading overlay param: {param_name}")
         
-        if method == "Text file":
-            results = load_txt_data(shot_int, [param_name], base_path=base_path)
-        else: # DAQ
-            results = load_mds_data(shot_int, [param_name])
-            
-        if results and param_name in results:
-            data, time = results[param_name]
-            if data is not None and time is not None:
-                # Get Unit
-                unit = ""
-                if param_name in self.params_dict:
-                    unit = self.params_dict[param_name].get("unit", "")
-                
-                label = f"{param_name}"
-                self.spectro_widget.set_overlay_data(time, data, label=label, units=unit)
-            else:
-                print(f"Failed to load data for {param_name}")
+        # Same shot as displayed: served by self.shot_bundle, already read signals are reused
+        bundle = open_bundle(shot_int, method, base_path)
+        data, time = fetch_orchestrator.fetch([(bundle, [param_name])])[0][param_name]
+        if data is not None and time is not None:
+            # Get Unit
+            unit = ""
+            if param_name in self.params_dict:
+                unit = self.params_dict[param_name].get("unit", "")
+            elif base_path:
+                unit = next((sig["unit"] or "" for sig in shot_catalog.signals(base_path) if sig["name"] == param_name), "")
+            
+            # Overlays of the displayed shot are resampled onto its time grid (cached in the bundle)
+            grid = None
+            if bundle is self.shot_bundle and self.original_time_array is not None:
+                grid = overlay_grid(time, self.original_time_array)
+            if grid is not None and grid.n > 0:
+                data, time = bundle.aligned([param_name], grid)[0], grid.array()
+
+            label = f"{param_name}"
+            self.spectro_widget.set_overlay_data(time, data, label=label, units=unit)
         else:
-            print(f"Failed to fetch {param_name}")
+            print(f"Failed to load data for {param_name}")
 
     def on_set_t0_clicked(self):
         """Open Init Phase Dialog"""
@@ -0,0 +1,130 @@
+# src/ui/shot_load_worker.py
+import threading
+from PySide6.QtCore import QThread, Signal
+from src.data.loader import fetch_mhd_data
+from src.data.prefetch import shot_prefetcher
+from src.data.shot_bundle import open_bundle
+from src.data.analysis import SignalProcessor
+from src.data.ingest import stored_summary
+from src.data.shot_catalog import shot_catalog
+from src.data.timebase import time_index
+from src.utils.config_manager import config_manager
+_health_conf = config_manager.get_config("analysis", {}).get("channel_health", {})
+
+
+class ShotLoadWorker(QThread):
+    """
+    Runs fetch_mhd_data, cal_duration, the channel health screening and the first
+    spectrogram off the Qt thread. cal_duration is skipped for a text file shot the
+    ingester already summarized (and that has not changed since). The shot is also
+    (re)cataloged here, so the UI only receives its signal names.
+    The overlay preload of the shot starts with the load and is cancelled with it.
+
+    Signals are emitted from the worker thread and delivered queued to the UI:
+        progress(done, total, param): after every loaded channel
+        loaded(result): dict with data/time/ip_data/ip_time/duration/ip_max/start_idx/spectrogram/bundle/health/signal_names
+                        (health: ChannelHealth of data, None when screening is disabled;
+                         signal_names: cataloged signals of base_path, [] without one)
+        failed(message): load returned no data
+    Nothing is emitted after cancel(); a cancelled load stops between channels.
+    """
+    progress = Signal(int, int, str)
+    loaded = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, shot, method, mode, suffix, ip_signal, base_path=None,
+                 channel_index=0, fs=200000.0, spectrogram_params=None, parent=None):
+        super().__init__(parent)
+        self.shot = shot
+        self.method = method
+        self.mode = mode
+        self.suffix = suffix
+        self.ip_signal = ip_signal
+        self.base_path = base_path
+        self.channel_index = channel_index
+        self.fs = fs
+        self.spectrogram_params = spectrogram_params  # (nperseg, nfft) or None
+        self._cancel = threading.Event()
+        self._bundle = None
+
+    def cancel(self):
+        self._cancel.set()
+        bundle = self._bundle
+        if bundle is not None:
+            bundle.cancel_preload()
+
+    def is_cancelled(self):
+        return self._cancel.is_set()
+
+    def _on_progress(self, done, total, param):
+        if not self._cancel.is_set():
+            self.progress.emit(done, total, param)
+
+    def _duration(self, ip_data, ip_time):
+        """(duration, ip_max, start_idx) of the IP signal, from the ingest summary when it is current."""
+        if ip_data is None:
+            return 0, 0, 0
+        if self.method == "Text file" and self.base_path:
+            summary = stored_summary(self.base_path, self.ip_signal)
+            if summary is not None:
+                start_idx = int(time_index(ip_time, summary["t_start"])) if summary["t_start"] is not None else 0
+                return summary["duration"], summary["ip_max"], start_idx
+        return SignalProcessor.cal_duration(ip_data, ip_time)
+
+    def _signal_names(self):
+        """Refreshes the catalog entry of the shot from its headers and returns its signal names."""
+        if not self.base_path:
+            return []
+        try:
+            shot_catalog.scan_shot(self.base_path)
+            return shot_catalog.signal_names(self.base_path)
+        except Exception as e:
+            print(f"Cataloging {self.base_path} failed: {e}")
+            return []
+
+    def run(self):
+        # A foreground load never shares the link/disk with a background prefetch
+        shot_prefetcher.cancel(wait=True)
+        try:
+            # Held for the lifetime of the displayed shot; fetch_mhd_data and overlays read through it
+            bundle = self._bundle = open_bundle(self.shot, self.method, self.base_path)
+            # Overlays (IP, HCN, GP) are read alongside the probes, "Plot" then needs no read
+            data, time, ip_data, ip_time = fetch_mhd_data(
+                self.shot, self.method, self.mode, suffix=self.suffix, ip_signal=self.ip_signal,
+                base_path=self.base_path, progress=self._on_progress, cancel_event=self._cancel,
+                preload=not self._cancel.is_set())
+            if self._cancel.is_set():
+                return
+            if data is None:
+                self.failed.emit(f"No data for shot {self.shot}")
+                return
+
+            duration, ip_max, start_idx = self._duration(ip_data, ip_time)
+
+            health = None
+            if _health_conf.get("enabled", True):
+                prefix = "OBP" if self.mode == 'm' else "M"
+                names = [f"{prefix}{i}{self.suffix}" for i in range(1, data.shape[0] + 1)]
+                # Cached per shot, a reload of the same (cached) matrix is not screened again
+                health = bundle.channel_health(data, self.fs, names=names)
+                print(f"Channel health shot {self.shot}: {health.summary()}")
+
+            spectrogram = None
+            if self.spectrogram_params is not None and 0 <= self.channel_index < data.shape[0]:
+                nperseg, nfft = self.spectrogram_params
+                spectrogram = (self.channel_index, self.spectrogram_params,
+                               SignalProcessor.compute_spectrogram(data[self.channel_index, :], self.fs, nperseg=nperseg, nfft=nfft))
+
+            signal_names = self._signal_names()
+        except Exception as e:
+            if not self._cancel.is_set():
+                print(f"Error loading shot {self.shot}: {e}")
+                self.failed.emit(str(e))
+            return
+
+        if not self._cancel.is_set():
+            self.loaded.emit({
+                "shot": self.shot, "data": data, "time": time, "ip_data": ip_data, "ip_time": ip_time,
+                "duration": duration, "ip_max": ip_max, "start_idx": start_idx, "spectrogram": spectrogram,
+                "bundle": bundle, "health": health, "signal_names": signal_names,
+            })
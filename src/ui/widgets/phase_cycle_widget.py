@@ -103,6 +103,7 @@ class PhaseCycleWidget(QWidget):
         # State
         self.current_data = None
         self.current_time = None
+        self.excluded_channels = [] # 1-based, from the channel health screening
         self.current_t_start = 0
         self.current_t_end = 0
         self.current_freq = 0
@@ -130,11 +131,13 @@ class PhaseCycleWidget(QWidget):
         else:
             self.peaks_plot.setYRange(0.5, 14.5, padding=0)
 
-    def set_context(self, data, time, fs=200000.0, reset=True):
-        """Sets the raw data context."""
+    def set_context(self, data, time, fs=200000.0, reset=True, excluded_channels=None):
+        """Sets the raw data context. excluded_channels: 1-based channels left out (None keeps the current ones)."""
         self.current_data = data
         self.current_time = time
         self.current_fs = fs
+        if excluded_channels is not None:
+            self.excluded_channels = list(excluded_channels)
         
         # Clear data dependants
         self.peaks_data = []
@@ -323,24 +326,11 @@ class PhaseCycleWidget(QWidget):
         if idx >= len(self.filtered_data_T):
             return
             
-        # Data Matrix: (Time, Channels)
-        data_signal = self.filtered_data_T
-        
-        # ref_signal = data_signal[:, 0]
-        # Note: data_signal[:, 0] means Channel 1 trace.
-        
-        # Logic:
-        # phase_diffs = np.arctan2(data_signal[idx, :], ref_signal[idx])*180/np.pi
-        
-        val_ref = data_signal[idx, 0] # Scalar
-        vals_all = data_signal[idx, :] # Array (Channels)
-        
-        # arctan2(y, x)
-        phase_diffs = np.arctan2(vals_all, val_ref) * 180 / np.pi
-        
-        # Plot
-        num_channels = phase_diffs.shape[0]
-        channels = np.arange(1, num_channels + 1)
+        # Data Matrix: (Time, Channels); excluded channels are left out, the first good one is the reference
+        channels, phase_diffs = SignalProcessor.calculate_phase_cycle(
+            self.filtered_data_T, idx, excluded_channels=self.excluded_channels)
+        if channels is None:
+            return
         
         self.cycle_plot.clear()
         self.cycle_plot.plot(channels, phase_diffs, symbol='o', pen='b', brush='b', name="Poloidal Mode")
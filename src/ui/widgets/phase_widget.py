@@ -103,6 +103,7 @@ class PhaseWidget(QWidget):
         # State
         self.current_data = None
         self.current_time = None
+        self.excluded_channels = [] # 1-based, from the channel health screening
         self.current_t_start = 0
         self.current_t_end = 0
         self.current_freq = 0
@@ -162,11 +163,13 @@ class PhaseWidget(QWidget):
         if self.isVisible() and self.current_t_start != 0:
              self.zoom_to_range(self.current_t_start, offset, width)
 
-    def set_context(self, data, time, fs=200000.0, reset=True):
-        """Sets the raw data context."""
+    def set_context(self, data, time, fs=200000.0, reset=True, excluded_channels=None):
+        """Sets the raw data context. excluded_channels: 1-based channels left out (None keeps the current ones)."""
         self.current_data = data
         self.current_time = time
         self.current_fs = fs
+        if excluded_channels is not None:
+            self.excluded_channels = list(excluded_channels)
         
         # Always clear data-dependent calculations
         self.peaks_data = []
@@ -394,7 +397,7 @@ class PhaseWidget(QWidget):
         print(f"Fit Request: {t1:.4f}, {c1} -> {t2:.4f}, {c2}")
         
         # Determine coils and excludes based on mode
-        excluded = []
+        excluded = list(self.excluded_channels)
         num_coils = 12
         if self.current_mode == 'n': # Toroidal
              num_coils = 14
@@ -337,7 +337,11 @@ class SpectrogramWidget(QWidget):
         
         self.update_overlay_plot()
 
-    def set_data(self, data, fs, t_offset=0, keep_view=False):
+    def set_data(self, data, fs, t_offset=0, keep_view=False, spectrogram=None):
+        """
+        spectrogram: Optional (params, (freq, times, Sxx)) computed in advance (e.g. by the
+                     load worker); used when params still match spectrogram_params().
+        """
         self.current_data = data
         self.fs = fs
         self.t_offset = t_offset
@@ -360,7 +364,7 @@ class SpectrogramWidget(QWidget):
             saved_state['roi_region'] = self.time_roi.getRegion()
             # Also text values? kept in textboxes
 
-        self.compute_and_plot()
+        self.compute_and_plot(spectrogram)
         
         # Reset default view range (will be set by parent if needed)
         self.default_view_range = None
@@ -392,11 +396,8 @@ class SpectrogramWidget(QWidget):
         # Emit initial
         self.emit_region_changed()
 
-    def compute_and_plot(self):
-        if self.current_data is None:
-            return
-
-        # Get params from UI or defaults
+    def spectrogram_params(self):
+        """Returns (nperseg, nfft) from the text boxes (defaults if invalid)."""
         try:
             nfft = int(self.txt_nfft.text())
         except:
@@ -408,14 +409,25 @@ class SpectrogramWidget(QWidget):
         except:
             win_size = 200 # Approx 1ms at 200k? 200k/1000 = 200.
             self.txt_window.setText("200")
+        return win_size, nfft
+
+    def compute_and_plot(self, spectrogram=None):
+        if self.current_data is None:
+            return
+
+        # Get params from UI or defaults
+        win_size, nfft = self.spectrogram_params()
 
 
 
         # Compute Spectrogram
         # nperseg = win_size
-        freq, times, Sxx = SignalProcessor.compute_spectrogram(
-            self.current_data, self.fs,nperseg=win_size ,nfft=nfft
-        )
+        if spectrogram is not None and spectrogram[0] == (win_size, nfft):
+            freq, times, Sxx = spectrogram[1]
+        else:
+            freq, times, Sxx = SignalProcessor.compute_spectrogram(
+                self.current_data, self.fs,nperseg=win_size ,nfft=nfft
+            )
         
         self.freqs = freq
         if len(freq) > 0:
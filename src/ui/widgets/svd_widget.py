@@ -82,6 +82,7 @@ class SVDWidget(QWidget):
         # State
         self.current_data = None
         self.current_time = None
+        self.excluded_channels = [] # 1-based, from the channel health screening
         self.current_fs = 200000.0
         self.t_start = 0
         self.t_end = 0
@@ -93,10 +94,12 @@ class SVDWidget(QWidget):
         self.VT = None
         self.current_mode_idx = 0
 
-    def set_context(self, data, time, fs, reset=True):
+    def set_context(self, data, time, fs, reset=True, excluded_channels=None):
         self.current_data = data
         self.current_time = time
         self.current_fs = fs
+        if excluded_channels is not None:
+            self.excluded_channels = list(excluded_channels)
         if reset:
             self.clear_plots()
         
@@ -136,7 +139,7 @@ class SVDWidget(QWidget):
         
         data_matrix = filtered_T.T
         
-        U, S, VT = SignalProcessor.compute_svd(data_matrix)
+        U, S, VT = SignalProcessor.compute_svd(data_matrix, excluded_channels=self.excluded_channels)
         
         if U is None:
             return
@@ -0,0 +1,83 @@
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+import numpy as np
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.loader import load_txt_data
+
+EXAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "1275")
+PARAMS = [f"OBP{i}T" for i in range(1, 13)] + ["IP1"]
+CODECS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+
+
+def best_of(func, repeats=3):
+    best = None
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def extract_then_load(shot_dir, ext, tmp):
+    """Previous workflow: decompress every file to disk, then parse the .txt."""
+    out = os.path.join(tmp, "extracted")
+    os.makedirs(out, exist_ok=True)
+    for param in PARAMS:
+        with CODECS[ext](os.path.join(shot_dir, f"{param}.txt{ext}"), "rb") as src, open(os.path.join(out, f"{param}.txt"), "wb") as dst:
+            shutil.copyfileobj(src, dst)
+    try:
+        return load_txt_data(1275, PARAMS, base_path=out, workers=1, use_cache=False)
+    finally:
+        shutil.rmtree(out)
+
+
+def run_benchmark():
+    size_mb = sum(os.path.getsize(os.path.join(EXAMPLE_DIR, f"{p}.txt")) for p in PARAMS) / 1024 / 1024
+    print(f"--- Benchmarking: compressed TT1 loading ({len(PARAMS)} files, {size_mb:.1f} MB of text) ---")
+    expected = load_txt_data(1275, PARAMS, base_path=EXAMPLE_DIR, workers=1, use_cache=False)
+    t_plain, _ = best_of(lambda: load_txt_data(1275, PARAMS, base_path=EXAMPLE_DIR, workers=1, use_cache=False))
+    print(f"  plain .txt:        {t_plain * 1000:8.1f} ms")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        shot_dir = os.path.join(tmp, "1275")
+        os.makedirs(shot_dir)
+        for ext, opener in CODECS.items():
+            for param in PARAMS:
+                with open(os.path.join(EXAMPLE_DIR, f"{param}.txt"), "rb") as src, opener(os.path.join(shot_dir, f"{param}.txt{ext}"), "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+            compressed_mb = sum(os.path.getsize(os.path.join(shot_dir, f"{p}.txt{ext}")) for p in PARAMS) / 1024 / 1024
+            t_extract, _ = best_of(lambda: extract_then_load(shot_dir, ext, tmp))
+            # Only this codec's files are in the folder for the direct load
+            t_direct, direct = best_of(lambda: load_txt_data(1275, PARAMS, base_path=shot_dir, workers=1, use_cache=False))
+            identical = all(np.array_equal(direct[p][0], expected[p][0]) for p in PARAMS)
+            results[ext] = (t_extract, t_direct, identical)
+            print(f"  {ext:<4} ({compressed_mb:5.1f} MB)  extract+load {t_extract * 1000:8.1f} ms   direct {t_direct * 1000:8.1f} ms   identical {identical}")
+            for param in PARAMS:
+                os.remove(os.path.join(shot_dir, f"{param}.txt{ext}"))
+
+        zip_path = os.path.join(tmp, "1275.zip")
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as archive:
+            for param in PARAMS:
+                archive.write(os.path.join(EXAMPLE_DIR, f"{param}.txt"), f"1275/{param}.txt")
+        t_zip, direct = best_of(lambda: load_txt_data(1275, PARAMS, base_path=zip_path, workers=1, use_cache=False))
+        identical = all(np.array_equal(direct[p][0], expected[p][0]) for p in PARAMS)
+        results[".zip"] = (None, t_zip, identical)
+        print(f"  .zip ({os.path.getsize(zip_path) / 1024 / 1024:5.1f} MB)  direct {t_zip * 1000:8.1f} ms   identical {identical}")
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
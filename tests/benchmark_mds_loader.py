@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.loader import fetch_mhd_data, load_mds_data
+from src.data.mds_pool import MDSConnectionPool, mds_pool
+from src.data.shot_bundle import open_bundle
+from src.utils.config_manager import config_manager
+from mds_stand_in import StandInMDSipServer
+
+# (name, latency s, bandwidth bytes/s)
+NETWORKS = [
+    ("loopback", 0.0, None),
+    ("lab LAN (1 ms, 100 MB/s)", 0.001, 100e6),
+    ("remote (20 ms, 10 MB/s)", 0.02, 10e6),
+]
+PARAMS = [f"OBP{i}T" for i in range(1, 13)] + ["IP1"]
+
+
+def best_of(func, repeats=3):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def fetch_full_shot(server):
+    """fetch_mhd_data over the DAQ SV. path, i.e. the shared pool at config ip_address:port."""
+    system = config_manager.get_config("system", {})
+    saved = {key: system.get(key) for key in ("ip_address", "port", "mds_cache")}
+    system.update(ip_address=server.host, port=server.port, mds_cache=False)
+    try:
+        open_bundle(1275, "DAQ SV.").release()  # Read again from the server
+        return fetch_mhd_data(1275, "DAQ SV.", "m", suffix="T", ip_signal="IP1", use_shot_cache=False)
+    finally:
+        system.update(saved)
+        mds_pool.close_all()
+
+
+def run_network(name, latency, bandwidth, repeats=3):
+    print(f"\n--- {name} ---")
+    with StandInMDSipServer(latency=latency, bandwidth=bandwidth) as server:
+        pool = MDSConnectionPool(connection_factory=server.connect)
+        load = lambda **kwargs: load_mds_data(1275, PARAMS, pool=pool, use_cache=False, **kwargs)
+        load(workers=4, batch=False)  # Connect and open the tree once
+
+        cases = [
+            ("per signal, 1 connection", lambda: load(workers=1, batch=False)),
+            ("per signal, 4 connections", lambda: load(workers=4, batch=False)),
+            ("batched (GetMany)", lambda: load(batch=True)),
+            ("batched, 100 ms window", lambda: load(batch=True, time_range=(100.0, 200.0))),
+            ("fetch_mhd_data (m mode)", lambda: fetch_full_shot(server)),
+        ]
+        results = {}
+        for label, func in cases:
+            before = dict(server.stats)
+            elapsed = best_of(func, repeats)
+            sent = (server.stats["bytes_sent"] - before.get("bytes_sent", 0)) / repeats
+            requests = sum(server.stats[op] - before.get(op, 0) for op in ("get", "getMany", "openTree")) / repeats
+            results[label] = elapsed
+            print(f"  {label:<28} {elapsed * 1000:8.1f} ms  {sent / 1e6 / elapsed:7.1f} MB/s  {requests:5.1f} requests")
+    return results
+
+
+def run_benchmark(networks=NETWORKS):
+    print(f"--- Benchmarking: MDSplus loading of {len(PARAMS)} signals through the mdsip stand-in ---")
+    return {name: run_network(name, latency, bandwidth) for name, latency, bandwidth in networks}
+
+
+if __name__ == "__main__":
+    run_benchmark()
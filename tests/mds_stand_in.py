@@ -0,0 +1,392 @@
+import ctypes
+import os
+import re
+import numpy as np
+import socket
+import socketserver
+import sys
+import time
+import threading
+from collections import Counter
+from mdsthin import Connection
+from mdsthin.descriptors import Descriptor, Dictionary, String
+from mdsthin.exceptions import EXCEPTION_PREFIX_MAP
+from mdsthin.message import Message
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.tt1_reader import read_tt1_file
+
+EXAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "1275")
+
+
+class StandInResult:
+    """Mimics the descriptor returned by mdsthin Connection.get()."""
+
+    def __init__(self, value):
+        self._value = value
+
+    def data(self):
+        return self._value
+
+
+class StandInServer:
+    """
+    Offline stand-in for the TT1 MDSplus server.
+    Serves shots from TT1 text directories and counts every operation, with optional
+    delays to mimic connection setup and per-request round trips. stall maps signal
+    names to extra seconds for every request that reads them (a hung request); socket
+    timeouts and aborts apply to these waits as they would on a real socket.
+
+    Usage:
+        server = StandInServer({1275: EXAMPLE_DIR}, connect_delay=0.05)
+        pool = MDSConnectionPool(connection_factory=server.connect)
+    """
+
+    def __init__(self, shot_dirs=None, connect_delay=0.0, latency=0.0):
+        self.shot_dirs = shot_dirs if shot_dirs is not None else {1275: EXAMPLE_DIR}
+        self.connect_delay = connect_delay
+        self.latency = latency
+        self.stats = Counter()
+        self.epoch = 0  # Bumped by restart(), older connections are dead
+        self.reachable = True  # Set False to refuse new connections
+        self.stall = {}  # Signal name -> extra delay (s) of requests reading it
+        self._signals = {}
+        self._lock = threading.Lock()
+
+    def connect(self, address):
+        if not self.reachable:
+            raise ConnectionRefusedError(f"[Errno 111] Connection refused: {address}")
+        time.sleep(self.connect_delay)
+        with self._lock:
+            self.stats["connect"] += 1
+        return StandInConnection(self, address)
+
+    def restart(self):
+        """Simulates a server restart: every open connection drops."""
+        with self._lock:
+            self.epoch += 1
+
+    def signal(self, shot, param):
+        key = (shot, param.upper())
+        with self._lock:
+            if key not in self._signals:
+                path = os.path.join(self.shot_dirs[shot], f"{param.upper()}.txt")
+                if not os.path.exists(path):
+                    raise KeyError(f"%TREE-W-NNF, Node Not Found: {param}")
+                raw_data, prof_time, _ = read_tt1_file(path)
+                self._signals[key] = (raw_data, prof_time)
+            return self._signals[key]
+
+    def delay(self, exprs):
+        stalls = [delay for param, delay in self.stall.items()
+                  if any(re.search(rf"\b{param}\b", expr, re.IGNORECASE) for expr in exprs)]
+        return self.latency + max(stalls, default=0.0)
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+
+class StandInSocket:
+    """The socket calls made on mdsthin's Connection._socket: timeout and shutdown."""
+
+    def __init__(self):
+        self.timeout = None
+        self.closed = threading.Event()
+
+    def settimeout(self, seconds):
+        self.timeout = seconds
+
+    def shutdown(self, how):
+        self.closed.set()
+
+
+class StandInConnection:
+    """Implements the subset of mdsthin.Connection used by the loader."""
+
+    _DIM_OF = re.compile(r"^DIM_OF\((\w+)\)$", re.IGNORECASE)
+    _SUBSCRIPT = re.compile(r"^(DATA|DIM_OF)\((\w+)\)\[(\d+) : (\d+) : (\d+)\]$", re.IGNORECASE)
+    _FINGERPRINT = re.compile(r"^\[SIZE\(DIM_OF\((\w+)\)\), MINVAL\(DIM_OF\(\1\)\), MAXVAL\(DIM_OF\(\1\)\)\]$", re.IGNORECASE)
+
+    def __init__(self, server, address):
+        self.server = server
+        self.address = address
+        self.tree = None
+        self.connected = True
+        self.epoch = server.epoch
+        self._socket = StandInSocket()
+
+    def _round_trip(self, name, *exprs):
+        if not self.connected or self.epoch != self.server.epoch:
+            raise BrokenPipeError("Connection closed by peer")
+        delay = self.server.delay(exprs)
+        timeout = self._socket.timeout
+        if self._socket.closed.wait(delay if timeout is None else min(delay, timeout)):
+            raise ConnectionAbortedError("Connection aborted")
+        if timeout is not None and delay > timeout:
+            raise TimeoutError("timed out")
+        self.server.count(name)
+
+    def openTree(self, tree, shot):
+        self._round_trip("openTree")
+        if shot not in self.server.shot_dirs:
+            raise KeyError(f"%TREE-E-TreeFILE_NOT_FOUND, shot {shot}")
+        self.tree = (tree, shot)
+
+    def closeTree(self, tree, shot):
+        self._round_trip("closeTree")
+        self.tree = None
+
+    def get(self, expr, *args):
+        self._round_trip("get", expr)
+        return StandInResult(self._sent(self.evaluate(expr)))
+
+    def _sent(self, value):
+        self.server.stats["samples_sent"] += np.size(value)
+        return value
+
+    def getMany(self):
+        return StandInGetMany(self)
+
+    def evaluate(self, expr):
+        """Evaluates the TDI expressions the loader sends."""
+        expr = expr.strip()
+        if expr == "1":
+            return 1
+        if self.tree is None:
+            raise KeyError("%TREE-W-NOT_OPEN, Tree not currently open")
+        shot = self.tree[1]
+        match = self._FINGERPRINT.match(expr)
+        if match:
+            prof_time = self.server.signal(shot, match.group(1))[1]
+            return np.array([len(prof_time), prof_time.min(), prof_time.max()])
+        match = self._SUBSCRIPT.match(expr)
+        if match:
+            # Index range subscript, end inclusive as in TDI
+            column = 1 if match.group(1).upper() == "DIM_OF" else 0
+            values = self.server.signal(shot, match.group(2))[column]
+            i0, i1, step = (int(match.group(k)) for k in (3, 4, 5))
+            return values[i0:i1 + 1:step].copy()
+        match = self._DIM_OF.match(expr)
+        if match:
+            return self.server.signal(shot, match.group(1))[1]
+        return self.server.signal(shot, expr)[0]
+
+    def disconnect(self):
+        self.connected = False
+        self.server.count("disconnect")
+
+
+class StandInGetMany:
+    """Mimics mdsthin GetMany: all appended expressions are evaluated in one round trip."""
+
+    def __init__(self, connection):
+        self._connection = connection
+        self._queries = []
+        self._result = None
+
+    def append(self, name, exp, *args):
+        self._queries.append((name, exp))
+
+    def execute(self):
+        self._connection._round_trip("getMany", *(exp for _, exp in self._queries))
+        self._result = {}
+        for name, exp in self._queries:
+            try:
+                self._result[name] = {"value": StandInResult(self._connection._sent(self._connection.evaluate(exp)))}
+            except Exception as e:
+                self._result[name] = {"error": e}
+        return self._result
+
+    def get(self, name):
+        if self._result is None:
+            raise RuntimeError("GetMany has not been executed, call execute() first.")
+        if name not in self._result:
+            return None
+        result = self._result[name]
+        if "value" in result:
+            return result["value"]
+        raise result["error"]
+
+
+def _recv_exact(sock, size):
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    while len(view):
+        read = sock.recv_into(view, len(view))
+        if read == 0:
+            raise EOFError("Connection closed by client")
+        view = view[read:]
+    return buffer
+
+
+def _recv_message(sock, unpack=True):
+    """One mdsip message: the 48 byte header and the descriptor it carries."""
+    msg = Message.from_buffer_copy(_recv_exact(sock, ctypes.sizeof(Message)))
+    body = msg.msglen - ctypes.sizeof(Message)
+    data = _recv_exact(sock, body) if body > 0 else None
+    return msg, msg.unpack_data(data) if unpack and data is not None else Descriptor()
+
+
+def _error_text(error):
+    return str(error.args[0]) if error.args else str(error)
+
+
+def _error_status(error):
+    # Status of the matching mdsthin exception ("%TREE-W-NNF, ..." -> TreeNNF), even = error
+    known = EXCEPTION_PREFIX_MAP.get(_error_text(error).split(",")[0])
+    return known.status if known is not None else 0
+
+
+class _MDSipHandler(socketserver.BaseRequestHandler):
+    """Serves one client connection of a StandInMDSipServer."""
+
+    def handle(self):
+        server = self.server.stand_in
+        sock = self.request
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with server._lock:
+            server._clients.add(sock)
+        try:
+            # Login: the user name, dims[0] is the protocol version
+            login, _ = _recv_message(sock, unpack=False)
+            if not server.reachable:
+                return
+            time.sleep(server.connect_delay)
+            server.count("connect")
+            # The login answer is the bare request header with an OK status (no compression)
+            login.status = 1
+            login.msglen = ctypes.sizeof(Message)
+            sock.sendall(bytes(login))
+
+            session = StandInConnection(server, self.client_address)
+            while True:
+                msg, expr = _recv_message(sock)
+                args = [_recv_message(sock)[1] for _ in range(msg.nargs - 1)]
+                try:
+                    value, status = server._execute(session, expr.data(), args), 1
+                except OSError:
+                    raise  # e.g. restart(): drop the connection
+                except Exception as e:
+                    value, status = None, _error_status(e)
+                answer = Message(value)
+                answer.status = status
+                answer.message_id = msg.message_id
+                server._transmit(sock, answer.pack())
+        except (EOFError, OSError):
+            pass
+        finally:
+            with server._lock:
+                server._clients.discard(sock)
+
+
+class _MDSipTCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class StandInMDSipServer(StandInServer):
+    """
+    StandInServer behind a real TCP socket, speaking enough of the mdsip protocol for
+    mdsthin.Connection: login, get() with arguments, TreeOpen/TreeClose and GetManyExecute.
+    latency (s) is added to every request; bandwidth (bytes/s, None = unlimited) limits the
+    answers on one link shared by all connections, so parallel connections only hide
+    latency, as on the real network. Both can be changed while the server runs; stall,
+    restart() and reachable work as on StandInServer.
+
+    Usage:
+        with StandInMDSipServer(latency=0.005, bandwidth=10e6) as server:
+            pool = MDSConnectionPool(connection_factory=server.connect)
+    """
+
+    BLOCK = 64 * 1024  # Bytes sent per bandwidth slot
+
+    def __init__(self, shot_dirs=None, latency=0.0, bandwidth=None, connect_delay=0.0, host="127.0.0.1", port=0):
+        super().__init__(shot_dirs, connect_delay=connect_delay, latency=latency)
+        self.bandwidth = bandwidth
+        self._clients = set()
+        self._link_free = 0.0
+        self._tcp = _MDSipTCPServer((host, port), _MDSipHandler)
+        self._tcp.stand_in = self
+        self.host, self.port = self._tcp.server_address[:2]
+        self.address = f"{self.host}:{self.port}"
+        threading.Thread(target=self._tcp.serve_forever, name="mdsip stand-in", daemon=True).start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def connect(self, address=None, timeout=60.0):
+        """An mdsthin.Connection to this server; address is ignored (pool factory signature)."""
+        return Connection(self.address, timeout=timeout)
+
+    def close(self):
+        self._tcp.shutdown()
+        self._tcp.server_close()
+        with self._lock:
+            clients = list(self._clients)
+        for sock in clients:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _execute(self, session, expr, args):
+        if expr == "TreeOpen($,$)":
+            session.openTree(args[0].data(), int(args[1].data()))
+            return np.int32(1)
+        if expr == "TreeClose($,$)":
+            session.closeTree(args[0].data(), int(args[1].data()))
+            return np.int32(1)
+        if expr == "GetManyExecute($)":
+            many = session.getMany()
+            for query in args[0].deserialize():
+                many.append(query["name"].data(), query["exp"].data())
+            results = {}
+            for name, result in many.execute().items():
+                results[name] = Dictionary({"value": Descriptor(result["value"].data())} if "value" in result
+                                           else {"error": String(_error_text(result["error"]))})
+            return Dictionary(results).serialize()
+        return session.get(expr).data()
+
+    def _transmit(self, sock, payload):
+        if not self.bandwidth:
+            sock.sendall(payload)
+            self.count("bytes_sent", len(payload))
+            return
+        view = memoryview(payload)
+        for k in range(0, len(view), self.BLOCK):
+            block = view[k:k + self.BLOCK]
+            with self._lock:
+                # Blocks of all connections queue on the link
+                start = max(time.monotonic(), self._link_free)
+                self._link_free = start + len(block) / self.bandwidth
+                done = self._link_free
+            time.sleep(max(0.0, done - time.monotonic()))
+            sock.sendall(block)
+            self.count("bytes_sent", len(block))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serves TT1 text shots over mdsip, e.g. for the GUI (config ip_address/port).")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--shot", type=int, default=1275)
+    parser.add_argument("--dir", default=EXAMPLE_DIR, help="TT1 text directory of the shot")
+    parser.add_argument("--latency", type=float, default=0.0, help="Added to every request (ms)")
+    parser.add_argument("--bandwidth", type=float, default=0.0, help="Link bandwidth (MB/s, 0 = unlimited)")
+    args = parser.parse_args()
+
+    server = StandInMDSipServer({args.shot: args.dir}, latency=args.latency / 1000,
+                                bandwidth=args.bandwidth * 1e6 or None, host="0.0.0.0", port=args.port)
+    print(f"Serving shot {args.shot} from {args.dir} on port {server.port}, Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.close()
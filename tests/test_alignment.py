@@ -0,0 +1,96 @@
+import os
+import shutil
+import sys
+import numpy as np
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.alignment import align_signals, overlay_grid
+from src.data.loader import fetch_mhd_data
+from src.data.shot_bundle import ShotBundle
+from src.data.timebase import Timebase, timebase_of
+
+EXAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "1275")
+
+
+def _signal(t):
+    return np.sin(2 * np.pi * 0.5 * t) + 0.3 * t
+
+
+def test_integer_ratios_and_interpolation():
+    source = Timebase(0.0, 0.005, 20000)
+    t = source.array()
+    signals = [(_signal(t), t), (2 * _signal(t), t), (None, None)]
+    grids = [Timebase(0.0, 0.005, 20000),   # same axis: copied
+             Timebase(1.0, 0.01, 5000),     # down by 2 (polyphase)
+             Timebase(-5.0, 0.02, 5000),    # down by 4, starts before the signal
+             Timebase(10.0, 0.001, 3000),   # up by 5 (polyphase)
+             Timebase(0.3, 0.0075, 10000)]  # ratio 1.5: interpolated
+    for grid in grids:
+        out = align_signals(signals, grid, fill_value=np.nan)
+        g = grid.array()
+        inside = (g >= 0.0) & (g <= t[-1])
+        interior = (g >= 0.5) & (g <= t[-1] - 0.5)  # Filter edge effects stay at the ends
+        assert np.allclose(out[0, interior], _signal(g[interior]), rtol=0, atol=1e-4)
+        assert np.allclose(out[0, inside], _signal(g[inside]), rtol=0, atol=1e-2)
+        assert np.array_equal(out[1, inside], 2 * out[0, inside])  # Both channels in one pass
+        assert np.isnan(out[0, ~inside]).all() and np.isnan(out[2]).all()
+    assert np.array_equal(align_signals(signals, grids[0])[0], _signal(t))
+
+
+def test_non_uniform_time_is_interpolated():
+    t = np.cumsum(np.linspace(0.001, 0.002, 1000))
+    assert timebase_of(t) is None
+    fitted = timebase_of(np.arange(100) * 0.01 + 2.0)
+    assert fitted.n == 100 and fitted.t0 == 2.0 and abs(fitted.dt - 0.01) < 1e-12
+    grid = Timebase(0.1, 0.003, 300)
+    out = align_signals([(3 * t + 1, t)], grid)
+    assert np.allclose(out[0], 3 * grid.array() + 1)
+
+
+def test_overlay_grid():
+    reference = Timebase(0.0, 0.005, 100000).array()
+    grid = overlay_grid(Timebase(100.0, 0.1, 1001).array(), reference)
+    assert grid.dt == 0.005 * 20 and grid.n == 1001
+    assert grid.t0 == reference[20000]
+    assert overlay_grid(Timebase(0.0, 0.001, 10).array(), reference).dt == 0.005
+
+
+def test_fetch_aligns_mixed_rate_channels(tmp_path):
+    shot_dir = tmp_path / "1275"
+    os.makedirs(shot_dir)
+    for param in [f"OBP{i}T" for i in range(1, 13)] + ["IP1"]:
+        shutil.copy(os.path.join(EXAMPLE_DIR, f"{param}.txt"), shot_dir / f"{param}.txt")
+    # A 50 kHz channel among the 200 kHz probes
+    shutil.copy(os.path.join(EXAMPLE_DIR, "IP1.txt"), shot_dir / "OBP5T.txt")
+
+    data, time, ip_data, ip_time = fetch_mhd_data(1275, "Text file", "m", suffix="T", ip_signal="IP1",
+                                                  base_path=str(shot_dir), use_shot_cache=False)
+    # It is upsampled onto the probe grid instead of being left as zeros
+    assert data.shape == (12, 100000) and len(ip_data) == 25000
+    inside = time <= ip_time[-1]
+    assert np.allclose(data[4, inside], np.interp(time[inside], ip_time, ip_data), rtol=0, atol=0.01 * np.ptp(ip_data))
+    assert not data[4, ~inside].any()
+
+    grid = Timebase(100.0, 0.02, 10000)
+    bundle = ShotBundle(1275, "Text file", str(shot_dir))
+    aligned = bundle.aligned(["OBP1T", "OBP5T", "IP1"], grid)
+    assert bundle.aligned(["OBP1T", "OBP5T", "IP1"], grid) is aligned  # Cached per shot
+    assert not aligned.flags.writeable
+
+    data, time, ip_data, ip_time = fetch_mhd_data(1275, "Text file", "m", suffix="T", ip_signal="IP1",
+                                                  base_path=str(shot_dir), use_shot_cache=False, grid=grid)
+    assert data.shape == (12, 10000) and np.array_equal(time, grid.array()) and ip_time is time
+    assert np.array_equal(data[0], aligned[0]) and np.array_equal(ip_data, aligned[2])
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_integer_ratios_and_interpolation()
+    test_non_uniform_time_is_interpolated()
+    test_overlay_grid()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_fetch_aligns_mixed_rate_channels(pathlib.Path(tmp))
+    print("SUCCESS: Alignment tests passed.")
@@ -0,0 +1,122 @@
+import os
+import sys
+import numpy as np
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.analysis import SignalProcessor
+from src.data.channel_health import _longest_runs, screen_channels, select_channels
+from src.data.loader import fetch_mhd_data
+from src.data.shot_bundle import ShotBundle
+
+EXAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "1275")
+FS = 200000.0
+
+
+def _mode_matrix(num_channels=12, n=100000, seed=0):
+    """Rotating 10 kHz m=2 mode plus noise, with one faulty coil of every kind."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) / FS
+    phases = 2 * np.pi * 2 * np.arange(num_channels) / num_channels
+    data = np.sin(2 * np.pi * 10e3 * t + phases[:, None]) + 0.1 * rng.standard_normal((num_channels, n))
+    data[2] = 1e-4 * rng.standard_normal(n)          # Ch3 dead
+    data[4] = np.clip(data[4], -0.5, 0.5)            # Ch5 saturated
+    data[7, 40000:44000] = data[7, 40000]            # Ch8 stuck for 20 ms
+    data[9] = 0.7 * rng.standard_normal(n)           # Ch10 disconnected, picks up noise only
+    return t * 1e3, data
+
+
+def test_faulty_coils_are_excluded():
+    _, data = _mode_matrix()
+    health = screen_channels(data, FS)
+    assert health.excluded_channels() == [3, 5, 8, 10]
+    assert "dead" in health.reasons[2] and "saturated" in health.reasons[4]
+    assert health.reasons[7] == ["flat"] and health.reasons[9] == ["low SNR"]
+    assert health.flat_run[7] == 4000
+    assert np.array_equal(health.good, ~health.excluded) and not health.good.flags.writeable
+
+
+def test_clean_sine_passes():
+    # Noise-free, full-amplitude mode: every channel touches its extremes once per period
+    t = np.arange(100000) / FS
+    phases = 2 * np.pi * 2 * np.arange(12) / 12
+    data = np.sin(2 * np.pi * 10e3 * t + phases[:, None])
+    data[1] = np.sin(2 * np.pi * 10e3 * (t + 0.5 / FS))  # Peaks between two equal samples
+    health = screen_channels(data, FS)
+    assert health.excluded_channels() == [] and not health.clip_fraction.any()
+
+    # Held on the rail, even briefly, is still saturation
+    data[4] = np.clip(data[4], -0.9, 0.9)
+    assert screen_channels(data, FS).excluded_channels() == [5]
+
+
+def test_example_shot():
+    data = fetch_mhd_data(1275, "Text file", "m", suffix="T", ip_signal="IP1", base_path=EXAMPLE_DIR, use_shot_cache=False)[0]
+    # OBP1T and OBP7T of shot 1275 carry no signal
+    assert screen_channels(data, FS).excluded_channels() == [1, 7]
+    data = fetch_mhd_data(1275, "Text file", "n", suffix="T", ip_signal="IP1", base_path=EXAMPLE_DIR, use_shot_cache=False)[0]
+    assert screen_channels(data, FS).excluded_channels() == []
+
+
+def test_longest_runs():
+    rng = np.random.default_rng(1)
+    equal = rng.random((5, 1000)) < 0.7
+    equal[3] = False
+    equal[4] = True
+    expected = []
+    for row in equal:
+        longest = run = 0
+        for value in row:
+            run = run + 1 if value else 0
+            longest = max(longest, run)
+        expected.append(longest)
+    assert list(_longest_runs(equal)) == expected
+
+
+def test_select_channels():
+    data = np.arange(60.0).reshape(6, 10)
+    assert select_channels(data, np.ones(6, dtype=bool)) is data
+    block = select_channels(data, np.array([False, True, True, True, False, False]))
+    assert np.shares_memory(block, data) and np.array_equal(block, data[1:4])
+    rows = select_channels(data.T, np.array([True, False, True, False, True, True]), axis=1)
+    assert np.array_equal(rows, data.T[:, [0, 2, 4, 5]]) and not np.shares_memory(rows, data)
+
+
+def test_exclusion_in_svd_and_phases():
+    _, data = _mode_matrix()
+    excluded = screen_channels(data, FS).excluded_channels()
+    good = np.array([ch not in excluded for ch in range(1, 13)])
+
+    U, S, VT = SignalProcessor.compute_svd(data, excluded_channels=excluded)
+    U_good, S_good, _ = np.linalg.svd(data[good], full_matrices=False)
+    assert U.shape == (12, good.sum()) and not U[~good].any()
+    assert np.allclose(S, S_good) and np.allclose(np.abs(U[good]), np.abs(U_good))
+    # The m=2 pair dominates once the faulty coils are out
+    assert S[1] / S[2] > 10
+
+    channels, phase = SignalProcessor.calculate_phase_cycle(data.T, 5000, excluded_channels=excluded)
+    assert list(channels) == [1, 2, 4, 6, 7, 9, 11, 12]
+    assert np.allclose(phase, np.degrees(np.arctan2(data[good, 5000], data[0, 5000])))  # Against Ch1
+    assert SignalProcessor.calculate_phase_cycle(data.T[:, :2], 0, excluded_channels=[1, 2]) == (None, None)
+
+
+def test_health_cached_per_shot():
+    bundle = ShotBundle(1275, "Text file", EXAMPLE_DIR)
+    _, data = _mode_matrix()
+    health = bundle.channel_health(data, FS)
+    assert bundle.channel_health(data, FS) is health
+    assert bundle.channel_health(data.copy(), FS) is not health
+    bundle.release()
+    assert bundle.channel_health(data, FS) is not health
+
+
+if __name__ == "__main__":
+    test_faulty_coils_are_excluded()
+    test_clean_sine_passes()
+    test_example_shot()
+    test_longest_runs()
+    test_select_channels()
+    test_exclusion_in_svd_and_phases()
+    test_health_cached_per_shot()
+    print("SUCCESS: Channel health tests passed.")
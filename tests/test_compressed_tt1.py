@@ -0,0 +1,128 @@
+import bz2
+import gzip
+import lzma
+import os
+import sys
+import zipfile
+import numpy as np
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.tt1_reader import (read_tt1_signal, read_tt1_window, iter_tt1_chunks, read_tt1_header,
+                                 list_tt1_files, find_tt1_file, build_tt1_line_index)
+from src.data.loader import load_txt_data
+from src.data.shot_catalog import ShotCatalog
+from src.data.signal_stream import open_source
+
+EXAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "1275")
+# Fast compression levels keep the fixtures cheap
+OPENERS = {".gz": lambda path, mode: gzip.open(path, mode, compresslevel=1),
+           ".bz2": lambda path, mode: bz2.open(path, mode, compresslevel=1),
+           ".xz": lambda path, mode: lzma.open(path, mode, preset=0)}
+
+
+def _text(param):
+    with open(os.path.join(EXAMPLE_DIR, f"{param}.txt"), "rb") as f:
+        return f.read()
+
+
+def _compressed_shot(tmp_path):
+    """Shot folder with OBP1T as .txt.gz, IP1 as .txt.bz2 and OBP2T as .txt.xz."""
+    shot_dir = tmp_path / "1275"
+    os.makedirs(shot_dir)
+    for param, ext in (("OBP1T", ".gz"), ("IP1", ".bz2"), ("OBP2T", ".xz")):
+        with OPENERS[ext](shot_dir / f"{param}.txt{ext}", "wb") as f:
+            f.write(_text(param))
+    return str(shot_dir)
+
+
+def _zip_shot(tmp_path, params=("OBP1T", "IP1")):
+    """A zipped shot folder (members under 1276/, as written by zipping the folder)."""
+    zip_path = str(tmp_path / "1276.zip")
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for param in params:
+            archive.write(os.path.join(EXAMPLE_DIR, f"{param}.txt"), f"1276/{param}.txt")
+    return zip_path
+
+
+def test_compressed_files_parse_identically(tmp_path):
+    shot_dir = _compressed_shot(tmp_path)
+    zip_path = _zip_shot(tmp_path)
+    cases = [(os.path.join(shot_dir, "OBP1T.txt.gz"), "OBP1T"), (os.path.join(shot_dir, "IP1.txt.bz2"), "IP1"),
+             (os.path.join(shot_dir, "OBP2T.txt.xz"), "OBP2T"), (os.path.join(zip_path, "OBP1T.txt"), "OBP1T")]
+    for path, param in cases:
+        plain = os.path.join(EXAMPLE_DIR, f"{param}.txt")
+        expected = read_tt1_signal(plain)
+        raw_data, timebase, header = read_tt1_signal(path, processes=4)
+        assert np.array_equal(raw_data, expected[0]) and timebase == expected[1] and header == expected[2]
+        assert read_tt1_header(path) == expected[2]
+
+        window, window_tb, _ = read_tt1_window(path, 100.0, 200.0, 3)
+        expected_window = read_tt1_window(plain, 100.0, 200.0, 3)
+        assert np.array_equal(window, expected_window[0]) and window_tb == expected_window[1]
+
+        chunks = list(iter_tt1_chunks(path, 7000, 250.0, 400.0))
+        expected_chunks = list(iter_tt1_chunks(plain, 7000, 250.0, 400.0))
+        assert [tb for _, tb in chunks] == [tb for _, tb in expected_chunks]
+        assert all(np.array_equal(a, b) for (a, _), (b, _) in zip(chunks, expected_chunks))
+        assert build_tt1_line_index(path) is None
+
+
+def test_gzip_size_hint_too_small(tmp_path):
+    # Two gzip members: the ISIZE trailer only covers the last one, the buffer has to grow
+    text = _text("OBP1T")
+    path = str(tmp_path / "OBP1T.txt.gz")
+    with open(path, "wb") as f:
+        f.write(gzip.compress(text[:len(text) // 2]) + gzip.compress(text[len(text) // 2:]))
+    assert np.array_equal(read_tt1_signal(path)[0], read_tt1_signal(os.path.join(EXAMPLE_DIR, "OBP1T.txt"))[0])
+
+
+def test_load_txt_data_from_zip_and_compressed_folder(tmp_path):
+    zip_path = _zip_shot(tmp_path)
+    expected = load_txt_data(1275, ["OBP1T", "IP1"], base_path=EXAMPLE_DIR, use_cache=False)
+
+    first = load_txt_data(1276, ["OBP1T", "IP1", "NOPE1"], base_path=zip_path, workers=2)
+    second = load_txt_data(1276, ["OBP1T", "IP1"], base_path=zip_path)
+    for param in ("OBP1T", "IP1"):
+        assert np.array_equal(first[param][0], expected[param][0])
+        assert np.array_equal(second[param][1], expected[param][1])
+        # The second load comes from the sidecar cache next to the zip
+        assert isinstance(second[param][0], np.memmap)
+    assert first["NOPE1"] == (None, None)
+    assert os.path.isfile(tmp_path / ".tt1_cache" / "1276.zip" / "OBP1T.npy")
+
+    shot_dir = _compressed_shot(tmp_path)
+    window = load_txt_data(1275, ["OBP2T"], base_path=shot_dir, use_cache=False, time_range=(100.0, 200.0), decimate=2)
+    expected = load_txt_data(1275, ["OBP2T"], base_path=EXAMPLE_DIR, use_cache=False, time_range=(100.0, 200.0), decimate=2)
+    assert np.array_equal(window["OBP2T"][0], expected["OBP2T"][0])
+
+
+def test_listing_and_catalog(tmp_path):
+    shot_dir = _compressed_shot(tmp_path)
+    # A plain .txt wins over a compressed copy
+    with open(os.path.join(shot_dir, "IP1.txt"), "wb") as f:
+        f.write(_text("IP1"))
+    assert list_tt1_files(shot_dir) == {"IP1": os.path.join(shot_dir, "IP1.txt"),
+                                        "OBP1T": os.path.join(shot_dir, "OBP1T.txt.gz"),
+                                        "OBP2T": os.path.join(shot_dir, "OBP2T.txt.xz")}
+    assert find_tt1_file(shot_dir, "OBP2T") == os.path.join(shot_dir, "OBP2T.txt.xz")
+    assert find_tt1_file(shot_dir, "NOPE1") == os.path.join(shot_dir, "NOPE1.txt")
+
+    zip_path = _zip_shot(tmp_path)
+    catalog = ShotCatalog(str(tmp_path / "catalog.sqlite"))
+    catalog.scan(str(tmp_path))
+    assert catalog.shots(str(tmp_path)) == [(1275, shot_dir), (1276, zip_path)]
+    assert catalog.signal_names(zip_path) == ["IP1", "OBP1T"]
+    assert catalog.signals(shot_dir)[1]["samples"] == 100000
+    assert open_source(1276, "Text file", zip_path).signals() == ["IP1", "OBP1T"]
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    for test in (test_compressed_files_parse_identically, test_gzip_size_hint_too_small,
+                 test_load_txt_data_from_zip_and_compressed_folder, test_listing_and_catalog):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(pathlib.Path(tmp))
+    print("SUCCESS: Compressed TT1 tests passed.")
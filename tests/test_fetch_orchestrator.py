@@ -0,0 +1,121 @@
+import os
+import sys
+import threading
+import time
+import numpy as np
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.fetch_orchestrator import FetchOrchestrator
+from src.data.loader import load_txt_data
+from src.data.shot_bundle import ShotBundle
+from src.utils.config_manager import config_manager
+
+EXAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "1275")
+
+
+class SlowSource:
+    """Bundle stand-in whose reads take a fixed time; records concurrency and call order."""
+
+    def __init__(self, method, delay=0.1):
+        self.method = method
+        self.path = None if method == "DAQ SV." else "data"
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def get_many(self, names, workers=None, progress=None, cancel_event=None, deadline=None):
+        with self._lock:
+            self.calls.append(list(names))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        for i, name in enumerate(names):
+            if progress is not None:
+                progress(i + 1, len(names), name)
+        return {name: (np.zeros(3), np.arange(3.0)) for name in names}
+
+
+def test_sources_load_concurrently_within_limits():
+    orchestrator = FetchOrchestrator(limits={"Text file": 2, "DAQ SV.": 4})
+    text = SlowSource("Text file")
+    mds = SlowSource("DAQ SV.")
+    progress = []
+
+    start = time.perf_counter()
+    text_result, mds_result = orchestrator.fetch([(text, ["A", "B", "C", "D"]), (mds, ["IP1", "HCN1"])],
+                                                 progress=lambda *args: progress.append(args))
+    elapsed = time.perf_counter() - start
+
+    # 4 text reads 2 at a time, MDSplus in parallel: ~0.2 s instead of 0.6 s one after another
+    assert elapsed < 0.45
+    assert text.max_active == 2
+    assert sorted(mds.calls) == [["HCN1"], ["IP1"]]  # Per-signal gets by default (system.mds_batch false)
+    assert sorted(text_result) == ["A", "B", "C", "D"] and sorted(mds_result) == ["HCN1", "IP1"]
+    assert sorted(p[0] for p in progress) == list(range(1, 7)) and all(p[1] == 6 for p in progress)
+
+    # Batch mode keeps one round trip
+    system = config_manager.get_config("system", {})
+    saved = system.get("mds_batch")
+    system["mds_batch"] = True
+    try:
+        mds = SlowSource("DAQ SV.")
+        orchestrator.fetch([(mds, ["IP1", "HCN1"])])
+        assert mds.calls == [["IP1", "HCN1"]]
+    finally:
+        system["mds_batch"] = saved
+
+
+def test_critical_requests_go_first():
+    orchestrator = FetchOrchestrator(limits={"Text file": 1})
+    source = SlowSource("Text file", delay=0.1)
+    background = orchestrator.submit(source, ["bg1", "bg2", "bg3"])
+    time.sleep(0.03)  # bg1 holds the only slot
+
+    result = orchestrator.fetch([(source, ["probe"])], background=[(source, ["bg4"])])[0]
+    assert list(result) == ["probe"]
+    assert source.calls[:2] == [["bg1"], ["probe"]]
+    assert not background.done()  # fetch() returned without waiting for the background reads
+    background.result()
+    assert [call[0] for call in source.calls] == ["bg1", "probe", "bg2", "bg3", "bg4"]
+
+
+def test_cancel_skips_reads_not_started():
+    orchestrator = FetchOrchestrator(limits={"Text file": 1})
+    source = SlowSource("Text file", delay=0.1)
+    cancel = threading.Event()
+    future = orchestrator.submit(source, ["A", "B", "C"], cancel_event=cancel)
+    time.sleep(0.03)
+    cancel.set()
+    result = future.result()
+    assert source.calls == [["A"]]
+    assert result["B"] == result["C"] == (None, None)
+
+
+def test_bundles_read_through_orchestrator():
+    orchestrator = FetchOrchestrator()
+    names = ["OBP1T", "OBP2T", "IP1", "M1N"]
+    bundles = [ShotBundle(1275, "Text file", EXAMPLE_DIR) for _ in range(2)]
+    # Two shots at once, with a signal requested twice
+    first, second = orchestrator.fetch([(bundles[0], names), (bundles[1], names + ["OBP1T"])])
+
+    expected = load_txt_data(1275, names, base_path=EXAMPLE_DIR, use_cache=False)
+    for result in (first, second):
+        assert result["M1N"] == (None, None)
+        for name in names[:3]:
+            assert np.array_equal(result[name][0], expected[name][0])
+    assert sorted(bundles[0].loaded()) == ["IP1", "OBP1T", "OBP2T"]
+    assert bundles[1].get("OBP1T")[0] is second["OBP1T"][0]
+
+
+if __name__ == "__main__":
+    test_sources_load_concurrently_within_limits()
+    test_critical_requests_go_first()
+    test_cancel_skips_reads_not_started()
+    test_bundles_read_through_orchestrator()
+    print("SUCCESS: Fetch orchestrator tests passed.")
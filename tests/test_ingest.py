@@ -0,0 +1,125 @@
+import os
+import shutil
+import sys
+import time
+import numpy as np
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.ingest import ShotIngester, shot_stamp
+from src.data.loader import load_txt_data
+from src.data.shot_catalog import ShotCatalog
+from src.data.shot_archive import write_shot_archive
+from src.data.txt_cache import cached_tt1
+
+EXAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "1275")
+PARAMS = ["OBP1T", "IP1", "IP2"]
+
+
+def _copy_shot(root, shot, params=PARAMS):
+    os.makedirs(root / str(shot))
+    for param in params:
+        shutil.copy(os.path.join(EXAMPLE_DIR, f"{param}.txt"), root / str(shot) / f"{param}.txt")
+    return str(root / str(shot))
+
+
+def _ingester(tmp_path, **kwargs):
+    kwargs.setdefault("settle", 2.0)
+    return ShotIngester(interval=0.05, backfill_hours=None, catalog=ShotCatalog(str(tmp_path / "catalog.sqlite")), **kwargs)
+
+
+def test_new_shot_is_cached_cataloged_and_summarized(tmp_path):
+    root = tmp_path / "data"
+    path = _copy_shot(root, 1275)
+    ingester = _ingester(tmp_path)
+    seen = []
+    ingester.on_ingested.append(lambda shot, p, summary: seen.append((shot, p, summary)))
+
+    now = time.time()
+    assert ingester.poll(str(root), now=now) == []  # Not settled yet
+    assert ingester.poll(now=now + 3) == [path]
+
+    for param in PARAMS:
+        cached = cached_tt1(os.path.join(path, f"{param}.txt"))
+        assert cached is not None and isinstance(cached[0], np.memmap)
+    catalog = ingester.catalog
+    assert catalog.shots(str(root)) == [(1275, path)]
+    assert catalog.signal_names(path) == ["IP1", "IP2", "OBP1T"]
+
+    summary = catalog.summary(path)
+    assert summary["ip_signal"] == "IP2" and summary["stamp"] == shot_stamp(path)[0]
+    assert summary["duration"] > 0 and summary["ip_max"] > 0
+    assert summary["t_end"] - summary["t_start"] == summary["duration"]
+    assert seen == [(1275, path, summary)]
+    # Every available IP signal is summarized
+    assert catalog.summary(path, "IP1")["ip_signal"] == "IP1" and catalog.summary(path, "IP3") is None
+
+    # Nothing left to do, also for a new ingester on the same catalog
+    assert ingester.poll(now=now + 10) == []
+    assert _ingester(tmp_path, ip_signals=["IP1"]).poll(str(root), now=now + 10) == []
+
+
+def test_shot_still_being_written_waits(tmp_path):
+    root = tmp_path / "data"
+    path = _copy_shot(root, 1276, ["OBP1T"])
+    ingester = _ingester(tmp_path)
+    now = time.time()
+    assert ingester.poll(str(root), now=now) == []
+
+    # Another signal arrives: the settle time starts over
+    shutil.copy(os.path.join(EXAMPLE_DIR, "IP1.txt"), os.path.join(path, "IP1.txt"))
+    assert ingester.poll(now=now + 3) == []
+    assert ingester.catalog.summary(path) is None
+    assert ingester.poll(now=now + 6) == [path]
+    assert ingester.catalog.summary(path)["ip_signal"] == "IP1"
+
+    # A changed shot is ingested again
+    shutil.copy(os.path.join(EXAMPLE_DIR, "IP2.txt"), os.path.join(path, "IP2.txt"))
+    assert ingester.poll(now=now + 7) == []
+    assert ingester.poll(now=now + 10) == [path]
+    assert ingester.catalog.summary(path)["ip_signal"] == "IP2"
+
+
+def test_backfill_and_archives(tmp_path):
+    root = tmp_path / "data"
+    old = _copy_shot(root, 1275, ["IP1"])
+    os.utime(os.path.join(old, "IP1.txt"), (time.time() - 3 * 86400,) * 2)
+    archive = str(root / "1277.tt1z")
+    write_shot_archive(EXAMPLE_DIR, archive, params=["IP1", "GP"])
+
+    ingester = ShotIngester(settle=0, backfill_hours=24, catalog=ShotCatalog(str(tmp_path / "catalog.sqlite")))
+    assert ingester.poll(str(root)) == [archive]
+    assert ingester.catalog.summary(old) is None
+    assert ingester.catalog.signal_names(archive) == ["GP", "IP1"]
+    expected = load_txt_data(1277, ["IP1"], base_path=archive)["IP1"][0]
+    assert ingester.catalog.summary(archive)["ip_max"] == float(np.max(expected))
+
+
+def test_background_thread(tmp_path):
+    root = tmp_path / "data"
+    os.makedirs(root)
+    ingester = _ingester(tmp_path, settle=0)
+    arrived = []
+    ingester.on_ingested.append(lambda shot, path, summary: arrived.append(shot))
+    ingester.enabled = True
+    ingester.start(str(root))
+    try:
+        _copy_shot(root, 1280, ["IP1"])
+        deadline = time.time() + 20
+        while not arrived and time.time() < deadline:
+            time.sleep(0.05)
+        assert arrived == [1280]
+    finally:
+        ingester.stop(wait=True)
+    assert not ingester.is_running()
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    for test in (test_new_shot_is_cached_cataloged_and_summarized, test_shot_still_being_written_waits,
+                 test_backfill_and_archives, test_background_thread):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(pathlib.Path(tmp))
+    print("SUCCESS: Shot ingest tests passed.")
@@ -0,0 +1,91 @@
+import os
+import shutil
+import sys
+import numpy as np
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.loader import load_txt_data
+from src.data.tt1_reader import read_tt1_window, build_tt1_line_index
+from src.data.txt_cache import tt1_line_index, cache_dir_for, cached_tt1, LINE_INDEX_STRIDE
+
+EXAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "1275")
+
+
+def _shot_copy(tmp_path, params):
+    shot_dir = tmp_path / "1275"
+    os.makedirs(shot_dir)
+    for param in params:
+        shutil.copy(os.path.join(EXAMPLE_DIR, f"{param}.txt"), shot_dir / f"{param}.txt")
+    return str(shot_dir)
+
+
+def test_index_offsets_point_at_rows():
+    path = os.path.join(EXAMPLE_DIR, "OBP1T.txt")
+    offsets, timebase, header = build_tt1_line_index(path, stride=1000)
+    assert len(timebase) == header["Samples"] == 100000
+    assert len(offsets) == 100 + 1
+
+    with open(path, "rb") as f:
+        lines = f.read().splitlines(keepends=True)
+    row_starts = np.cumsum([0] + [len(line) for line in lines])[8:]
+    assert np.array_equal(offsets[:-1], row_starts[:100000:1000])
+    assert offsets[-1] == len(b"".join(lines).rstrip())
+
+
+def test_indexed_window_matches_bisection():
+    path = os.path.join(EXAMPLE_DIR, "OBP2T.txt")
+    offsets, timebase, header = build_tt1_line_index(path, stride=LINE_INDEX_STRIDE)
+    line_index = (offsets, LINE_INDEX_STRIDE, timebase, header)
+    for t_start, t_end, decimate in [(100.0, 102.0, 1), (0.0, 0.5, 1), (-5.0, 0.02, 1), (250.0, 260.0, 7),
+                                     (499.9, 600.0, 1), (None, None, 9), (300.0, 300.0, 1)]:
+        expected, expected_tb, _ = read_tt1_window(path, t_start, t_end, decimate)
+        raw_data, window_tb, _ = read_tt1_window(path, t_start, t_end, decimate, line_index=line_index)
+        assert np.array_equal(raw_data, expected)
+        assert window_tb == expected_tb
+
+
+def test_index_is_persisted_and_invalidated(tmp_path):
+    shot_dir = _shot_copy(tmp_path, ["IP1"])
+    txt_path = os.path.join(shot_dir, "IP1.txt")
+
+    assert tt1_line_index(txt_path, build=False) is None
+    built = tt1_line_index(txt_path)
+    assert os.path.exists(os.path.join(cache_dir_for(txt_path), "IP1.lines.npy"))
+    loaded = tt1_line_index(txt_path, build=False)
+    assert np.array_equal(loaded[0], built[0]) and loaded[1:] == built[1:]
+
+    # The .npy cache entry and the line index live side by side in the manifest
+    load_txt_data(1275, ["IP1"], base_path=shot_dir, use_cache=True)
+    assert cached_tt1(txt_path) is not None
+    assert tt1_line_index(txt_path, build=False) is not None
+
+    shutil.copy(os.path.join(EXAMPLE_DIR, "IP2.txt"), txt_path)
+    os.utime(txt_path, ns=(0, 10**9))
+    assert tt1_line_index(txt_path, build=False) is None
+
+
+def test_windowed_load_uses_index(tmp_path):
+    shot_dir = _shot_copy(tmp_path, ["OBP1T", "IP1"])
+    full = load_txt_data(1275, ["OBP1T", "IP1"], base_path=EXAMPLE_DIR, workers=1, use_cache=False)
+
+    window = load_txt_data(1275, ["OBP1T", "IP1"], base_path=shot_dir, workers=1, use_cache=True, time_range=(200.0, 202.0))
+    for param in ["OBP1T", "IP1"]:
+        assert tt1_line_index(os.path.join(shot_dir, f"{param}.txt"), build=False) is not None
+        data, time = full[param]
+        keep = np.flatnonzero((time >= 200.0) & (time < 202.0))
+        assert np.array_equal(window[param][0], data[keep])
+        assert np.allclose(window[param][1], time[keep], rtol=0, atol=1e-9)
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_index_offsets_point_at_rows()
+    test_indexed_window_matches_bisection()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_index_is_persisted_and_invalidated(pathlib.Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_windowed_load_uses_index(pathlib.Path(tmp))
+    print("SUCCESS: Line index tests passed.")
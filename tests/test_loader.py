@@ -0,0 +1,39 @@
+import os
+import sys
+import numpy as np
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.loader import load_txt_data, fetch_mhd_data
+
+EXAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "1275")
+
+
+def test_parallel_load_matches_sequential():
+    # MISSING1T does not exist and must be reported as (None, None) in both modes
+    param_list = ["OBP1T", "OBP2T", "MISSING1T", "IP1"]
+    sequential = load_txt_data(1275, param_list, base_path=EXAMPLE_DIR, workers=1)
+    parallel = load_txt_data(1275, param_list, base_path=EXAMPLE_DIR, workers=4)
+
+    assert list(parallel) == param_list
+    assert parallel["MISSING1T"] == (None, None)
+    for param in ["OBP1T", "OBP2T", "IP1"]:
+        assert np.array_equal(sequential[param][0], parallel[param][0])
+        assert np.array_equal(sequential[param][1], parallel[param][1])
+
+
+def test_fetch_mhd_data_parallel():
+    data_seq, time_seq, ip_seq, _ = fetch_mhd_data(1275, "Text", "m", suffix="T", ip_signal="IP1", base_path=EXAMPLE_DIR, workers=1, use_shot_cache=False)
+    data_par, time_par, ip_par, _ = fetch_mhd_data(1275, "Text", "m", suffix="T", ip_signal="IP1", base_path=EXAMPLE_DIR, workers=4, use_shot_cache=False)
+
+    assert data_par.shape == (12, 100000)
+    assert np.array_equal(data_seq, data_par)
+    assert np.array_equal(time_seq, time_par)
+    assert np.array_equal(ip_seq, ip_par)
+
+
+if __name__ == "__main__":
+    test_parallel_load_matches_sequential()
+    test_fetch_mhd_data_parallel()
+    print("SUCCESS: Loader tests passed.")
@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+import numpy as np
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.loader import load_mds_data
+from src.data.mds_pool import MDSConnectionPool
+from mds_stand_in import StandInServer
+
+# m-mode load: 12 probes on one timebase plus IP1 on a slower one
+M_PARAMS = [f"OBP{i}T" for i in range(1, 13)] + ["IP1"]
+
+
+def round_trips(server):
+    return server.stats["get"] + server.stats["getMany"]
+
+
+def test_batched_matches_per_signal():
+    server = StandInServer()
+    pool = MDSConnectionPool(connection_factory=server.connect)
+    per_signal = load_mds_data(1275, M_PARAMS + ["NOPE1"], workers=1, pool=pool, batch=False, use_cache=False)
+    assert round_trips(server) == 2 * len(M_PARAMS) + 1
+
+    server.stats.clear()
+    batched = load_mds_data(1275, M_PARAMS + ["NOPE1"], pool=pool, batch=True, use_cache=False)
+    # One round trip for all signals, one more for the IP1 time axis
+    assert round_trips(server) == 2
+
+    assert list(batched) == M_PARAMS + ["NOPE1"]
+    assert batched["NOPE1"] == (None, None)
+    for param in M_PARAMS:
+        assert np.array_equal(batched[param][0], per_signal[param][0])
+        assert np.array_equal(batched[param][1], per_signal[param][1])
+    # Probe channels share a single time array
+    assert all(batched[p][1] is batched["OBP1T"][1] for p in M_PARAMS[:12])
+
+
+def test_batched_latency():
+    server = StandInServer(latency=0.01)
+    pool = MDSConnectionPool(connection_factory=server.connect)
+    load_mds_data(1275, M_PARAMS, pool=pool, use_cache=False)  # connect, open tree, warm server
+
+    start = time.perf_counter()
+    load_mds_data(1275, M_PARAMS, workers=1, pool=pool, batch=False, use_cache=False)
+    t_single = time.perf_counter() - start
+    start = time.perf_counter()
+    load_mds_data(1275, M_PARAMS, pool=pool, batch=True, use_cache=False)
+    t_batch = time.perf_counter() - start
+
+    print(f"per signal {t_single * 1000:.1f} ms, batched {t_batch * 1000:.1f} ms")
+    assert t_batch * 4 < t_single
+
+
+if __name__ == "__main__":
+    test_batched_matches_per_signal()
+    test_batched_latency()
+    print("SUCCESS: Batched MDSplus fetch tests passed.")
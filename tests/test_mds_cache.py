@@ -0,0 +1,96 @@
+import os
+import sys
+import tempfile
+import numpy as np
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.loader import load_mds_data, _mds_address
+from src.data.mds_cache import MDSSignalCache
+from src.data.mds_pool import MDSConnectionPool
+from mds_stand_in import StandInServer
+
+PARAMS = ["OBP1T", "OBP2T", "IP1"]
+
+
+def test_repeat_load_served_offline():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        server = StandInServer()
+        cache = MDSSignalCache(tmpdir)
+        first = load_mds_data(1275, PARAMS, pool=MDSConnectionPool(connection_factory=server.connect), cache=cache)
+        # 3 signals + 2 distinct time axes
+        assert len(os.listdir(tmpdir)) > 1
+        assert cache.total_bytes() < 4 * 100000 * 8 + 2 * 25000 * 8
+
+        # Server down: everything comes from the cache
+        server.reachable = False
+        pool = MDSConnectionPool(connection_factory=server.connect)
+        second = load_mds_data(1275, PARAMS, pool=pool, cache=cache)
+        for param in PARAMS:
+            assert np.array_equal(first[param][0], second[param][0])
+            assert np.array_equal(first[param][1], second[param][1])
+
+        # Partly cached: cached signals are kept, the rest is reported missing
+        partial = load_mds_data(1275, ["OBP1T", "OBP3T"], pool=pool, cache=cache)
+        assert partial["OBP1T"][0] is not None
+        assert partial["OBP3T"] == (None, None)
+
+        # Windowed request sliced from the cache
+        window = load_mds_data(1275, ["OBP1T"], pool=pool, cache=cache, time_range=(100.0, 110.0), decimate=2)
+        time = first["OBP1T"][1]
+        keep = np.flatnonzero((time >= 100.0) & (time < 110.0))[::2]
+        assert np.array_equal(window["OBP1T"][0], first["OBP1T"][0][keep])
+
+        # Bypass goes to the (unreachable) server
+        assert load_mds_data(1275, PARAMS, pool=pool, cache=cache, use_cache=False) is None
+
+
+def test_lru_eviction():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        server = StandInServer()
+        pool = MDSConnectionPool(connection_factory=server.connect)
+        # Room for about two OBP signals with their time axis
+        cache = MDSSignalCache(tmpdir, max_bytes=3 * 100000 * 8 + 1000)
+        load_mds_data(1275, ["OBP1T"], pool=pool, cache=cache)
+        load_mds_data(1275, ["OBP2T"], pool=pool, cache=cache)
+        load_mds_data(1275, ["OBP1T"], pool=pool, cache=cache)  # OBP1T is now the most recent
+        load_mds_data(1275, ["OBP3T"], pool=pool, cache=cache)
+
+        assert cache.total_bytes() <= cache.max_bytes
+        cached = cache.get_many(_mds_address(), "tt1", 1275, ["OBP1T", "OBP2T", "OBP3T"])
+        assert sorted(cached) == ["OBP1T", "OBP3T"]
+
+
+def test_blob_that_cannot_be_removed_stays_accounted():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        server = StandInServer()
+        pool = MDSConnectionPool(connection_factory=server.connect)
+        cache = MDSSignalCache(tmpdir, max_bytes=3 * 100000 * 8 + 1000)
+        obp1 = load_mds_data(1275, ["OBP1T"], pool=pool, cache=cache)["OBP1T"][0]
+        load_mds_data(1275, ["OBP2T"], pool=pool, cache=cache)
+        blobs = [os.path.join(d, f) for d, _, names in os.walk(tmpdir) for f in names if f.endswith(".npy")]
+        locked = next(path for path in blobs if np.array_equal(np.load(path), obp1))
+        # A directory in its place makes os.remove fail, like a file held open on Windows
+        locked_size = os.path.getsize(locked)
+        os.remove(locked)
+        os.makedirs(locked)
+
+        load_mds_data(1275, ["OBP3T"], pool=pool, cache=cache)
+        # The stuck blob still takes room, so OBP2T had to go as well
+        assert sorted(cache.get_many(_mds_address(), "tt1", 1275, ["OBP1T", "OBP2T", "OBP3T"])) == ["OBP3T"]
+        files = [os.path.join(d, f) for d, _, names in os.walk(tmpdir) for f in names if f.endswith(".npy")]
+        assert os.path.isdir(locked) and cache.total_bytes() == locked_size + sum(map(os.path.getsize, files))
+
+        # Once it can be removed, the next eviction reclaims it before evicting live entries
+        os.rmdir(locked)
+        load_mds_data(1275, ["OBP4T"], pool=pool, cache=cache)
+        assert sorted(cache.get_many(_mds_address(), "tt1", 1275, ["OBP3T", "OBP4T"])) == ["OBP3T", "OBP4T"]
+        assert cache.total_bytes() <= cache.max_bytes
+
+
+if __name__ == "__main__":
+    test_repeat_load_served_offline()
+    test_lru_eviction()
+    test_blob_that_cannot_be_removed_stays_accounted()
+    print("SUCCESS: MDSplus cache tests passed.")
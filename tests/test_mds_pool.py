@@ -0,0 +1,81 @@
+import os
+import sys
+import time
+import numpy as np
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.loader import load_mds_data, load_txt_data
+from src.data.mds_pool import MDSConnectionPool
+from mds_stand_in import StandInServer, EXAMPLE_DIR
+
+PARAMS = ["OBP1T", "OBP2T", "IP1"]
+
+
+def test_connection_and_tree_reused():
+    server = StandInServer()
+    pool = MDSConnectionPool(connection_factory=server.connect)
+
+    first = load_mds_data(1275, PARAMS, workers=1, pool=pool, use_cache=False)
+    load_mds_data(1275, ["IP2"], workers=1, pool=pool, use_cache=False)  # e.g. an overlay request
+    load_mds_data(1275, PARAMS, workers=1, pool=pool, use_cache=False)
+    assert server.stats["connect"] == 1
+    assert server.stats["openTree"] == 1
+    assert pool.idle_count() == 1
+
+    expected = load_txt_data(1275, PARAMS, base_path=EXAMPLE_DIR, use_cache=False)
+    for param in PARAMS:
+        assert np.array_equal(first[param][0], expected[param][0])
+
+    # Unknown node is reported per channel, the connection stays pooled
+    result = load_mds_data(1275, ["NOPE1"], workers=1, pool=pool, use_cache=False)
+    assert result["NOPE1"] == (None, None)
+    assert pool.idle_count() == 1
+
+
+def test_dead_connection_replaced():
+    server = StandInServer()
+    pool = MDSConnectionPool(connection_factory=server.connect, health_check_interval=0)
+    load_mds_data(1275, PARAMS, workers=1, pool=pool, use_cache=False)
+
+    server.restart()
+    result = load_mds_data(1275, PARAMS, workers=1, pool=pool, use_cache=False)
+    assert result["OBP1T"][0] is not None
+    assert server.stats["connect"] == 2
+
+
+def test_idle_timeout():
+    server = StandInServer()
+    pool = MDSConnectionPool(connection_factory=server.connect, idle_timeout=0.05)
+    load_mds_data(1275, PARAMS, workers=1, pool=pool, use_cache=False)
+    time.sleep(0.1)
+    load_mds_data(1275, PARAMS, workers=1, pool=pool, use_cache=False)
+    assert server.stats["connect"] == 2
+    assert server.stats["disconnect"] == 1
+
+
+def test_pool_speedup():
+    # Connection setup of 50 ms, as seen over the lab network
+    server = StandInServer(connect_delay=0.05)
+    pooled = MDSConnectionPool(connection_factory=server.connect)
+    unpooled = MDSConnectionPool(connection_factory=server.connect, max_idle_per_host=0)
+
+    def run(pool):
+        start = time.perf_counter()
+        for _ in range(5):
+            load_mds_data(1275, ["IP1"], workers=1, pool=pool, use_cache=False)
+        return time.perf_counter() - start
+
+    run(pooled)  # warm up
+    t_pooled, t_unpooled = run(pooled), run(unpooled)
+    print(f"pooled {t_pooled * 1000:.1f} ms, unpooled {t_unpooled * 1000:.1f} ms")
+    assert t_pooled * 2 < t_unpooled
+
+
+if __name__ == "__main__":
+    test_connection_and_tree_reused()
+    test_dead_connection_replaced()
+    test_idle_timeout()
+    test_pool_speedup()
+    print("SUCCESS: MDSplus pool tests passed.")
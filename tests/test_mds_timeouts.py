@@ -0,0 +1,118 @@
+import os
+import sys
+import threading
+import time
+import numpy as np
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.loader import load_mds_data, load_txt_data, fetch_mhd_data, _mds_address
+from src.data.mds_pool import MDSConnectionPool, mds_pool
+from src.data.shot_bundle import open_bundle
+from src.utils.config_manager import config_manager
+from mds_stand_in import StandInServer, StandInMDSipServer, EXAMPLE_DIR
+
+PARAMS = ["OBP1T", "OBP2T", "IP1"]
+
+
+def test_stalled_request_fails_alone():
+    server = StandInServer()
+    server.stall["OBP2T"] = 5.0
+    pool = MDSConnectionPool(connection_factory=server.connect)
+
+    start = time.perf_counter()
+    result = load_mds_data(1275, PARAMS, workers=1, pool=pool, batch=False, use_cache=False, request_timeout=0.2)
+    assert time.perf_counter() - start < 1.5
+
+    expected = load_txt_data(1275, PARAMS, base_path=EXAMPLE_DIR, use_cache=False)
+    assert result["OBP2T"] == (None, None)
+    for param in ("OBP1T", "IP1"):
+        assert np.array_equal(result[param][0], expected[param][0])
+    # The timed out connection was dropped, IP1 came over a new one
+    assert server.stats["connect"] == 2
+    assert pool.idle_count() == 1
+
+
+def test_load_timeout_keeps_partial_results():
+    server = StandInServer(latency=0.05)
+    pool = MDSConnectionPool(connection_factory=server.connect)
+    params = [f"OBP{i}T" for i in range(1, 13)]
+
+    start = time.perf_counter()
+    result = load_mds_data(1275, params, workers=1, pool=pool, batch=False, use_cache=False, timeout=0.5)
+    assert time.perf_counter() - start < 1.0
+
+    arrived = [param for param in params if result[param][0] is not None]
+    assert arrived == params[:len(arrived)] and 0 < len(arrived) < len(params)
+    assert all(result[param] == (None, None) for param in params[len(arrived):])
+
+
+def test_cancel_aborts_request_in_flight():
+    server = StandInServer()
+    server.stall["OBP1T"] = 10.0
+    pool = MDSConnectionPool(connection_factory=server.connect)
+    cancel = threading.Event()
+    threading.Timer(0.2, cancel.set).start()
+
+    start = time.perf_counter()
+    result = load_mds_data(1275, PARAMS, workers=1, pool=pool, batch=False, use_cache=False, cancel_event=cancel)
+    assert time.perf_counter() - start < 1.0
+    assert all(result[param] == (None, None) for param in PARAMS)
+    assert pool.idle_count() == 0  # The aborted connection is not reused
+
+
+def test_batch_times_out():
+    server = StandInServer()
+    server.stall["IP1"] = 5.0
+    pool = MDSConnectionPool(connection_factory=server.connect)
+
+    start = time.perf_counter()
+    result = load_mds_data(1275, PARAMS, pool=pool, batch=True, use_cache=False, request_timeout=0.2)
+    assert time.perf_counter() - start < 1.0
+    assert result is None  # Nothing arrived and nothing was cached
+
+
+def test_released_connection_gets_default_timeout():
+    server = StandInServer()
+    pool = MDSConnectionPool(connection_factory=server.connect, request_timeout=2.0)
+    # The end of a load deadline leaves a tiny socket timeout behind
+    load_mds_data(1275, PARAMS, workers=1, pool=pool, batch=False, use_cache=False, request_timeout=0.01)
+    assert pool.idle_count() == 1
+
+    server.stall["OBP1T"] = 0.2
+    with pool.connection(_mds_address()) as con:
+        assert con.con._socket.timeout == 2.0
+        con.open_tree("tt1", 1275)
+        assert len(con.get("OBP1T").data()) == 100000
+    assert pool.idle_count() == 1 and server.stats["connect"] == 1
+
+
+def test_load_timeout_covers_whole_shot():
+    # fetch_mhd_data reads every channel as its own orchestrator job; the limit is for all of them
+    system = config_manager.get_config("system", {})
+    saved = {key: system.get(key) for key in ("ip_address", "port", "mds_cache")}
+    with StandInMDSipServer(latency=0.2) as server:
+        system.update(ip_address=server.host, port=server.port, mds_cache=False)
+        try:
+            open_bundle(1275, "DAQ SV.").release()
+            start = time.perf_counter()
+            fetch_mhd_data(1275, "DAQ SV.", "m", suffix="T", ip_signal="IP1", use_shot_cache=False, timeout=0.7)
+            elapsed = time.perf_counter() - start
+        finally:
+            system.update(saved)
+            mds_pool.close_all()
+            open_bundle(1275, "DAQ SV.").release()
+    # 13 signals of 2 requests at 0.2 s, 4 at a time: about 2 s without a shared limit
+    assert elapsed < 1.2
+    assert server.stats["get"] < 26
+
+
+if __name__ == "__main__":
+    test_stalled_request_fails_alone()
+    test_load_timeout_keeps_partial_results()
+    test_cancel_aborts_request_in_flight()
+    test_batch_times_out()
+    test_released_connection_gets_default_timeout()
+    test_load_timeout_covers_whole_shot()
+    print("SUCCESS: MDSplus timeout tests passed.")
@@ -0,0 +1,83 @@
+import os
+import sys
+import time
+import numpy as np
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.loader import load_mds_data, load_txt_data
+from src.data.mds_pool import MDSConnectionPool
+from mds_stand_in import StandInMDSipServer, EXAMPLE_DIR
+
+PARAMS = ["OBP1T", "OBP2T", "IP1"]
+
+
+def _check(result, params=PARAMS):
+    expected = load_txt_data(1275, params, base_path=EXAMPLE_DIR, use_cache=False)
+    for param in params:
+        assert np.array_equal(result[param][0], expected[param][0])
+        # Time axis as stored on the server
+        assert np.allclose(result[param][1], expected[param][1], rtol=0, atol=1e-5)
+
+
+def test_mdsthin_loads_over_socket():
+    with StandInMDSipServer() as server:
+        pool = MDSConnectionPool(connection_factory=server.connect)
+        for batch, workers in ((False, 1), (True, 1), (False, 3)):
+            result = load_mds_data(1275, PARAMS + ["NOPE1"], workers=workers, pool=pool, batch=batch, use_cache=False)
+            _check(result)
+            assert result["NOPE1"] == (None, None)  # Node errors arrive as mdsthin exceptions
+
+        window = load_mds_data(1275, ["OBP1T"], pool=pool, use_cache=False, time_range=(100.0, 200.0))
+        assert len(window["OBP1T"][0]) == 20000
+        assert server.stats["connect"] == 3 and server.stats["getMany"] > 0
+
+
+def test_latency_and_bandwidth():
+    with StandInMDSipServer(latency=0.05) as server:
+        pool = MDSConnectionPool(connection_factory=server.connect)
+        load_mds_data(1275, ["IP1"], workers=1, pool=pool, batch=False, use_cache=False)  # Connect, open the tree
+
+        start = time.perf_counter()
+        load_mds_data(1275, PARAMS, workers=1, pool=pool, batch=False, use_cache=False)
+        per_signal = time.perf_counter() - start
+        start = time.perf_counter()
+        load_mds_data(1275, PARAMS, workers=1, pool=pool, batch=True, use_cache=False)
+        batched = time.perf_counter() - start
+        # 6 round trips against 1
+        assert per_signal >= 0.3 and batched < per_signal / 2
+
+        server.latency = 0.0
+        server.bandwidth = 10e6
+        sent = server.stats["bytes_sent"]
+        start = time.perf_counter()
+        _check(load_mds_data(1275, PARAMS, pool=pool, batch=True, use_cache=False))
+        elapsed = time.perf_counter() - start
+        assert elapsed >= (server.stats["bytes_sent"] - sent) / 10e6 * 0.9
+
+
+def test_socket_failures():
+    with StandInMDSipServer() as server:
+        pool = MDSConnectionPool(connection_factory=server.connect, health_check_interval=0)
+        _check(load_mds_data(1275, PARAMS, workers=1, pool=pool, use_cache=False))
+
+        # Dropped connections are replaced
+        server.restart()
+        _check(load_mds_data(1275, PARAMS, workers=1, pool=pool, use_cache=False))
+        assert server.stats["connect"] == 2
+
+        # A hung request hits the socket timeout, the other signals still arrive
+        server.stall["OBP2T"] = 3.0
+        start = time.perf_counter()
+        result = load_mds_data(1275, PARAMS, workers=1, pool=pool, batch=False, use_cache=False, request_timeout=0.3)
+        assert time.perf_counter() - start < 2.0
+        assert result["OBP2T"] == (None, None)
+        _check(result, ["OBP1T", "IP1"])
+
+
+if __name__ == "__main__":
+    test_mdsthin_loads_over_socket()
+    test_latency_and_bandwidth()
+    test_socket_failures()
+    print("SUCCESS: mdsip stand-in tests passed.")
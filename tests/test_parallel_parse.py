@@ -0,0 +1,69 @@
+import os
+import sys
+import numpy as np
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.tt1_reader import read_tt1_signal, _read_parallel
+
+EXAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "1275")
+
+
+def _write_tt1(path, values, period=0.005, newline="\n"):
+    header = ["ShotNo = 9999", "SignalName = TEST", "TriggerTime = -10.000000", f"Period = {period:f}",
+              f"Samples = {len(values)}", "Unit = V", "Comment = ", "Format = time value"]
+    times = -10.0 + period * np.arange(len(values))
+    rows = [f"{t:f}  {v:f}" for t, v in zip(times, values)]
+    with open(path, "w", newline="") as f:
+        f.write(newline.join(header + rows) + newline)
+
+
+def _assert_bit_identical(path, **kwargs):
+    serial = read_tt1_signal(path)
+    parallel = read_tt1_signal(path, processes=2, min_parallel_bytes=0, **kwargs)
+    assert np.array_equal(serial[0].view(np.uint64), parallel[0].view(np.uint64))
+    assert serial[1] == parallel[1]
+    assert serial[2] == parallel[2]
+
+
+def test_example_file_bit_identical():
+    _assert_bit_identical(os.path.join(EXAMPLE_DIR, "OBP1T.txt"))
+    _assert_bit_identical(os.path.join(EXAMPLE_DIR, "IP1.txt"))
+
+
+def test_many_ranges_bit_identical(tmp_path):
+    rng = np.random.default_rng(3)
+    values = rng.normal(0, 50, 20000)
+    values[::97] = -0.0000001  # printed as -0.000000, must stay -0.0
+    path = str(tmp_path / "SIG.txt")
+    _write_tt1(path, values)
+
+    serial = read_tt1_signal(path)
+    for chunks in (2, 3, 7, 64, 1000):
+        parallel = _read_parallel(path, 2, chunks=chunks)
+        assert np.array_equal(serial[0].view(np.uint64), parallel[0].view(np.uint64))
+        assert serial[1] == parallel[1]
+
+
+def test_crlf_file(tmp_path):
+    path = str(tmp_path / "CRLF.txt")
+    _write_tt1(path, np.linspace(-3, 3, 5001), newline="\r\n")
+    _assert_bit_identical(path)
+
+
+def test_small_files_stay_serial(tmp_path):
+    path = str(tmp_path / "SMALL.txt")
+    _write_tt1(path, np.arange(10.0))
+    raw_data, timebase, _ = read_tt1_signal(path, processes=4)
+    assert np.array_equal(raw_data, np.arange(10.0)) and len(timebase) == 10
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_example_file_bit_identical()
+    for test in (test_many_ranges_bit_identical, test_crlf_file, test_small_files_stay_serial):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(pathlib.Path(tmp))
+    print("SUCCESS: Parallel parse tests passed.")
@@ -0,0 +1,133 @@
+import os
+import sys
+import threading
+import numpy as np
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.loader import fetch_mhd_data
+from src.data.prefetch import ShotPrefetcher, neighbour_shots, neighbour_path
+from src.data.shot_cache import ShotCache, shot_cache
+
+EXAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "1275")
+
+
+class FakeFetch:
+    """Stores a shot of nbytes into the cache per call, optionally blocking until released."""
+
+    def __init__(self, cache, nbytes=1000, gate=None):
+        self.cache = cache
+        self.nbytes = nbytes
+        self.gate = gate
+        self.calls = []
+
+    def __call__(self, shot, method, mode, suffix='T', ip_signal='IP2', base_path=None, workers=None,
+                 use_shot_cache=None, cancel_event=None, critical=True):
+        self.calls.append((shot, base_path, workers, critical))
+        if self.gate is not None:
+            self.gate.wait()
+        if cancel_event is not None and cancel_event.is_set():
+            return None, None, None, None
+        result = (np.zeros(self.nbytes // 8), None, None, None)
+        self.cache.put((shot, method), result)
+        return result
+
+
+def _prefetcher(cache, fetch, depth=2, budget_bytes=10**6):
+    prefetcher = ShotPrefetcher(depth=depth, budget_bytes=budget_bytes, cache=cache, fetch=fetch)
+    prefetcher.enabled = True
+    return prefetcher
+
+
+def test_neighbour_order_and_paths(tmp_path):
+    assert neighbour_shots(100, 2) == [101, 99, 102, 98]
+    assert neighbour_shots(1, 1) == [2]
+
+    for shot in (1274, 1275, 1276):
+        os.makedirs(tmp_path / str(shot))
+    assert neighbour_path(str(tmp_path / "1275"), 1275, 1276) == str(tmp_path / "1276")
+    assert neighbour_path(str(tmp_path / "1275"), 1275, 1277) is None
+    # Not a shot folder: neighbours cannot be located
+    assert neighbour_path(str(tmp_path), 1275, 1276) is None
+
+
+def test_mds_prefetch_depth():
+    cache = ShotCache(max_bytes=10**6)
+    fetch = FakeFetch(cache)
+    prefetcher = _prefetcher(cache, fetch, depth=2)
+
+    prefetcher.schedule(500, "DAQ SV.", "m", estimate_bytes=1000)
+    prefetcher._thread.join()
+
+    assert [c[0] for c in fetch.calls] == [501, 499, 502, 498]
+    # Background reads: never at the priority of a foreground load
+    assert all(c[1] is None and c[2] == 1 and c[3] is False for c in fetch.calls)
+    assert len(cache) == 4
+
+
+def test_budget_and_cache_room():
+    cache = ShotCache(max_bytes=10**6)
+    fetch = FakeFetch(cache, nbytes=4000)
+    prefetcher = _prefetcher(cache, fetch, depth=2, budget_bytes=10000)
+    prefetcher.schedule(500, "DAQ SV.", "m", estimate_bytes=4000)
+    prefetcher._thread.join()
+    assert [c[0] for c in fetch.calls] == [501, 499]
+
+    # The prefetcher never evicts from the shot cache (e.g. the displayed shot)
+    cache = ShotCache(max_bytes=10000)
+    cache.put(("displayed",), (np.zeros(500),))  # 4000 bytes
+    fetch = FakeFetch(cache, nbytes=4000)
+    prefetcher = _prefetcher(cache, fetch, depth=2)
+    prefetcher.schedule(500, "DAQ SV.", "m", estimate_bytes=4000)
+    prefetcher._thread.join()
+    assert [c[0] for c in fetch.calls] == [501]
+    assert ("displayed",) in cache
+
+
+def test_cancel_stops_prefetch():
+    cache = ShotCache(max_bytes=10**6)
+    gate = threading.Event()
+    fetch = FakeFetch(cache, gate=gate)
+    prefetcher = _prefetcher(cache, fetch)
+
+    prefetcher.schedule(500, "DAQ SV.", "m")
+    prefetcher.cancel()
+    gate.set()
+    prefetcher.cancel(wait=True)
+
+    assert not prefetcher.is_running()
+    assert len(fetch.calls) <= 1 and len(cache) == 0
+
+
+def test_text_prefetch_fills_shot_cache(tmp_path):
+    for shot in (1275, 1276):
+        os.symlink(EXAMPLE_DIR, tmp_path / str(shot))
+    base_path = str(tmp_path / "1275")
+    neighbour = str(tmp_path / "1276")
+    shot_cache.invalidate(1276)
+
+    prefetcher = ShotPrefetcher(depth=1)
+    prefetcher.enabled = True
+    prefetcher.schedule(1275, "Text file", "m", suffix="T", ip_signal="IP1", base_path=base_path)
+    prefetcher._thread.join()
+
+    # The foreground load of the neighbour is now served from the shot cache
+    assert (1276, "Text file", "m", "T", "IP1", os.path.abspath(neighbour), None, 1, None) in shot_cache
+    cached = fetch_mhd_data(1276, "Text file", "m", suffix="T", ip_signal="IP1", base_path=neighbour)
+    fresh = fetch_mhd_data(1276, "Text file", "m", suffix="T", ip_signal="IP1", base_path=neighbour, use_shot_cache=False)
+    assert np.array_equal(cached[0], fresh[0])
+    shot_cache.invalidate(1276)
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as tmp:
+        test_neighbour_order_and_paths(pathlib.Path(tmp))
+    test_mds_prefetch_depth()
+    test_budget_and_cache_room()
+    test_cancel_stops_prefetch()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_text_prefetch_fills_shot_cache(pathlib.Path(tmp))
+    print("SUCCESS: Prefetch tests passed.")
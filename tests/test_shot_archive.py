@@ -0,0 +1,106 @@
+import os
+import sys
+import numpy as np
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.loader import fetch_mhd_data, load_txt_data
+from src.data.shot_archive import ShotArchive, write_shot_archive, open_archive, CODECS
+from src.data.shot_bundle import ShotBundle
+from src.data.prefetch import neighbour_path
+from src.data.tt1_reader import read_tt1_signal
+
+EXAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "1275")
+PARAMS = ["OBP1T", "OBP2T", "IP1", "HCN1"]
+
+
+def _bits(array):
+    return np.ascontiguousarray(array).view(np.uint64)
+
+
+def test_roundtrip_all_codecs(tmp_path):
+    expected = {param: read_tt1_signal(os.path.join(EXAMPLE_DIR, f"{param}.txt")) for param in PARAMS}
+    text_bytes = sum(os.path.getsize(os.path.join(EXAMPLE_DIR, f"{param}.txt")) for param in PARAMS)
+    for codec in CODECS:
+        path = write_shot_archive(EXAMPLE_DIR, str(tmp_path / f"1275_{codec}.tt1z"), codec=codec,
+                                  chunk_samples=7000, params=PARAMS)
+        with ShotArchive(path) as archive:
+            assert archive.signals() == PARAMS
+            for param in PARAMS:
+                raw_data, timebase = archive.read(param)
+                assert np.array_equal(_bits(raw_data), _bits(expected[param][0]))
+                assert timebase == expected[param][1]
+                assert archive.header(param) == expected[param][2]
+        if codec != "none":
+            assert os.path.getsize(path) < text_bytes / 5
+
+
+def test_window_decompresses_overlapping_chunks_only(tmp_path):
+    path = write_shot_archive(EXAMPLE_DIR, str(tmp_path / "1275.tt1z"), chunk_samples=1000, params=["OBP1T"])
+    full, timebase, _ = read_tt1_signal(os.path.join(EXAMPLE_DIR, "OBP1T.txt"))
+    time = timebase.array()
+
+    archive = ShotArchive(path)
+    decompress, calls = archive._decompress, []
+    archive._decompress = lambda blob: calls.append(len(blob)) or decompress(blob)
+    for t_start, t_end, decimate in [(100.0, 102.0, 1), (0.0, 4.0, 3), (499.0, 600.0, 1), (250.0, 250.0, 1), (None, None, 7)]:
+        calls.clear()
+        raw_data, window = archive.read("OBP1T", t_start, t_end, decimate)
+        keep = np.flatnonzero((time >= (-np.inf if t_start is None else t_start)) &
+                              (time < (np.inf if t_end is None else t_end)))[::decimate]
+        assert np.array_equal(_bits(raw_data), _bits(full[keep]))
+        assert np.allclose(window.array(), time[keep], rtol=0, atol=1e-9)
+        if t_start == 100.0:
+            assert len(calls) <= 2  # 400 samples, at most two 1000-sample chunks
+    archive.close()
+
+
+def test_float_fallback_keeps_negative_zero(tmp_path):
+    shot_dir = tmp_path / "77"
+    os.makedirs(shot_dir)
+    values = ["0.000001", "-0.000000", "1.250000", "-3.5"]
+    header = ["DataBase = TT1", "ShotNo = 77", "SignalName = X", "SignalUnit = V", "TriggerTime = 0.000000 ms",
+              "Period = 1.000000 ms", "CreateTime = -", f"Samples = {len(values)}"]
+    with open(shot_dir / "X.txt", "w") as f:
+        f.write("\n".join(header + [f"{i:f}  {v}" for i, v in enumerate(values)]) + "\n")
+    expected = read_tt1_signal(str(shot_dir / "X.txt"))[0]
+
+    path = write_shot_archive(str(shot_dir))
+    assert path == str(tmp_path / "77.tt1z")
+    raw_data, _ = ShotArchive(path).read("X")
+    assert np.array_equal(_bits(raw_data), _bits(expected))
+
+
+def test_loaders_read_archive_natively(tmp_path):
+    channels = [f"OBP{i}T" for i in range(1, 13)] + ["IP1"]
+    path = write_shot_archive(EXAMPLE_DIR, str(tmp_path / "1275.tt1z"), params=channels)
+
+    text = fetch_mhd_data(1275, "Text file", "m", suffix="T", ip_signal="IP1", base_path=EXAMPLE_DIR, use_shot_cache=False)
+    packed = fetch_mhd_data(1275, "Text file", "m", suffix="T", ip_signal="IP1", base_path=path, use_shot_cache=False)
+    for a, b in zip(text, packed):
+        assert np.array_equal(a, b)
+
+    window = fetch_mhd_data(1275, "Text file", "m", suffix="T", ip_signal="IP1", base_path=path,
+                            time_range=(300.0, 310.0), decimate=2, use_shot_cache=False)
+    keep = np.flatnonzero((text[1] >= 300.0) & (text[1] < 310.0))[::2]
+    assert np.array_equal(window[0], text[0][:, keep])
+
+    missing = load_txt_data(1275, ["HCN1"], base_path=path)
+    assert missing["HCN1"] == (None, None)
+    assert set(ShotBundle(1275, "Text file", path).available()) == set(channels)
+    assert open_archive(path) is open_archive(path)
+
+    write_shot_archive(EXAMPLE_DIR, str(tmp_path / "1276.tt1z"), params=["IP1"])
+    assert neighbour_path(path, 1275, 1276) == str(tmp_path / "1276.tt1z")
+    assert neighbour_path(path, 1275, 1274) is None
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    for test in (test_roundtrip_all_codecs, test_window_decompresses_overlapping_chunks_only,
+                 test_float_fallback_keeps_negative_zero, test_loaders_read_archive_natively):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(pathlib.Path(tmp))
+    print("SUCCESS: Shot archive tests passed.")
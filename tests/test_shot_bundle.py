@@ -0,0 +1,125 @@
+import os
+import shutil
+import sys
+import threading
+import numpy as np
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.loader import fetch_mhd_data, load_txt_data
+from src.data.shot_bundle import ShotBundle, open_bundle
+
+EXAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "1275")
+
+
+def test_index_without_reading():
+    bundle = ShotBundle(1275, "Text file", EXAMPLE_DIR)
+    names = bundle.available()
+
+    assert len(names) == len([f for f in os.listdir(EXAMPLE_DIR) if f.endswith(".txt")])
+    assert "OBP1T" in bundle and "HCN1" in bundle and "VP0" in bundle
+    assert "M1N" not in bundle  # Listed in params.json but no file for this shot
+    assert bundle.loaded() == [] and bundle.nbytes() == 0
+
+
+def test_lazy_materialization_is_shared():
+    bundle = ShotBundle(1275, "Text file", EXAMPLE_DIR)
+    raw_data, prof_time = bundle.get("OBP1T")
+    assert bundle.loaded() == ["OBP1T"]
+
+    # Second access returns the same arrays without reading again
+    again = bundle.get("OBP1T")
+    assert again[0] is raw_data and again[1] is prof_time
+
+    expected = load_txt_data(1275, ["OBP1T"], base_path=EXAMPLE_DIR, use_cache=False)["OBP1T"]
+    assert np.array_equal(raw_data, expected[0])
+    assert np.array_equal(prof_time, expected[1])
+
+    results = bundle.get_many(["OBP1T", "IP1", "M1N"])
+    assert results["OBP1T"][0] is raw_data
+    assert results["M1N"] == (None, None)
+    assert sorted(bundle.loaded()) == ["IP1", "OBP1T"]
+
+    bundle.release("IP1")
+    assert bundle.loaded() == ["OBP1T"]
+
+
+def test_fetch_and_overlay_read_from_one_bundle():
+    bundle = open_bundle(1275, "Text file", EXAMPLE_DIR)
+    assert open_bundle(1275, "Text file", EXAMPLE_DIR) is bundle
+
+    progress = []
+    data, time, ip_data, ip_time = fetch_mhd_data(1275, "Text file", "m", suffix="T", ip_signal="IP1", base_path=EXAMPLE_DIR,
+                                                  use_shot_cache=False, progress=lambda *args: progress.append(args))
+    assert len(bundle.loaded()) == 13 and len(progress) == 13
+
+    # The N variant only reads the N channels, IP comes from the bundle
+    fetch_mhd_data(1275, "Text file", "m", suffix="N", ip_signal="IP1", base_path=EXAMPLE_DIR, use_shot_cache=False)
+    assert len(bundle.loaded()) == 25
+
+    # An overlay of the displayed shot reuses the loaded IP signal
+    assert bundle.get("IP1")[0] is open_bundle(1275, "Text file", EXAMPLE_DIR).get("IP1")[0]
+    assert np.array_equal(bundle.get("IP1")[0], ip_data)
+    assert np.array_equal(bundle.get("OBP3T")[0], data[2])
+
+
+def test_changed_file_is_reloaded(tmp_path):
+    shot_dir = tmp_path / "1275"
+    os.makedirs(shot_dir)
+    shutil.copy(os.path.join(EXAMPLE_DIR, "IP1.txt"), shot_dir / "IP1.txt")
+    bundle = ShotBundle(1275, "Text file", str(shot_dir))
+
+    first = bundle.get("IP1")[0]
+    assert bundle.get("IP1")[0] is first
+
+    shutil.copy(os.path.join(EXAMPLE_DIR, "IP2.txt"), shot_dir / "IP1.txt")
+    os.utime(shot_dir / "IP1.txt", ns=(0, 10**9))
+    reloaded = bundle.get("IP1")[0]
+    assert reloaded is not first
+    assert np.array_equal(reloaded, bundle.get("IP1")[0])
+
+
+def test_overlay_preload_in_background():
+    bundle = ShotBundle(1275, "Text file", EXAMPLE_DIR)
+    # Missing signals (M1N) are skipped, loaded ones are not read again
+    ip1 = bundle.get("IP1")[0]
+    bundle.preload(["IP1", "HCN1", "M1N", "GP"]).result()
+    assert sorted(bundle.loaded()) == ["GP", "HCN1", "IP1"]
+    assert bundle.get("IP1")[0] is ip1
+
+    # The overlay is then served from memory
+    hcn = bundle.get("HCN1")
+    assert bundle.get("HCN1")[0] is hcn[0]
+    expected = load_txt_data(1275, ["HCN1"], base_path=EXAMPLE_DIR, use_cache=False)["HCN1"]
+    assert np.array_equal(hcn[0], expected[0])
+
+
+def test_cancelled_preload_stops():
+    bundle = ShotBundle(1275, "Text file", EXAMPLE_DIR)
+    bundle.cancel_preload()
+    names = [f"OBP{i}T" for i in range(1, 13)]
+    # Mark the signals as being read elsewhere, so no read starts before the cancel
+    gates = {name: threading.Event() for name in names}
+    bundle._loading.update(gates)
+    future = bundle.preload(names)
+    bundle.cancel_preload()
+    for name in names:
+        bundle._loading.pop(name).set()
+    bundle.cancel_preload(wait=True)
+    assert future.done()
+    assert bundle.loaded() == []
+    assert all(future.result()[name] == (None, None) for name in names)
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_index_without_reading()
+    test_lazy_materialization_is_shared()
+    test_fetch_and_overlay_read_from_one_bundle()
+    test_overlay_preload_in_background()
+    test_cancelled_preload_stops()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_changed_file_is_reloaded(pathlib.Path(tmp))
+    print("SUCCESS: Shot bundle tests passed.")
@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+import numpy as np
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.loader import fetch_mhd_data
+from src.data.shot_cache import ShotCache, shot_cache
+
+EXAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "1275")
+
+
+def test_mode_toggle_served_from_cache():
+    shot_cache.invalidate()
+    args = dict(suffix="T", ip_signal="IP1", base_path=EXAMPLE_DIR)
+    first_m = fetch_mhd_data(1275, "Text file", "m", **args)
+    first_n = fetch_mhd_data(1275, "Text file", "n", **args)
+
+    start = time.perf_counter()
+    again_m = fetch_mhd_data(1275, "Text file", "m", **args)
+    again_n = fetch_mhd_data(1275, "Text file", "n", **args)
+    elapsed = time.perf_counter() - start
+
+    assert again_m[0] is first_m[0] and again_n[0] is first_n[0]
+    assert not again_m[0].flags.writeable
+    assert elapsed < 0.05
+
+
+def test_changed_file_invalidates():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for i in range(1, 13):
+            shutil.copy(os.path.join(EXAMPLE_DIR, f"OBP{i}T.txt"), tmpdir)
+        shutil.copy(os.path.join(EXAMPLE_DIR, "IP1.txt"), tmpdir)
+
+        first = fetch_mhd_data(1275, "Text file", "m", suffix="T", ip_signal="IP1", base_path=tmpdir)
+        path = os.path.join(tmpdir, "OBP3T.txt")
+        with open(path, "r") as f:
+            lines = f.readlines()
+        lines[8] = "0.000000  1.000000\n"
+        with open(path, "w") as f:
+            f.writelines(lines)
+        second = fetch_mhd_data(1275, "Text file", "m", suffix="T", ip_signal="IP1", base_path=tmpdir)
+
+        assert second[0] is not first[0]
+        assert second[0][2, 0] == 1.0
+
+
+def test_byte_budget_lru():
+    cache = ShotCache(max_bytes=3 * 8000)
+    for shot in range(4):
+        cache.put((shot,), (np.zeros(1000), np.zeros(0)))
+        cache.get((0,))  # keep shot 0 recently used
+    assert cache.total_bytes() <= cache.max_bytes
+    assert (0,) in cache and (3,) in cache
+    assert (1,) not in cache
+
+
+if __name__ == "__main__":
+    test_mode_toggle_served_from_cache()
+    test_changed_file_invalidates()
+    test_byte_budget_lru()
+    print("SUCCESS: Shot cache tests passed.")
@@ -0,0 +1,82 @@
+import os
+import shutil
+import sys
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.shot_catalog import ShotCatalog
+from src.data.shot_archive import write_shot_archive
+
+EXAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "1275")
+
+
+def _make_root(tmp_path):
+    root = tmp_path / "data"
+    for shot, params in [(1275, ["OBP1T", "IP1", "HCN1"]), (1276, ["OBP1T", "IP2"])]:
+        os.makedirs(root / str(shot))
+        for param in params:
+            shutil.copy(os.path.join(EXAMPLE_DIR, f"{param}.txt"), root / str(shot) / f"{param}.txt")
+    os.makedirs(root / "notes")
+    shutil.copy(os.path.join(EXAMPLE_DIR, "IP1.txt"), root / "notes" / "IP1.txt")
+    write_shot_archive(EXAMPLE_DIR, str(root / "1277.tt1z"), params=["IP1", "GP"])
+    return root
+
+
+def test_scan_reads_headers(tmp_path):
+    root = _make_root(tmp_path)
+    catalog = ShotCatalog(str(tmp_path / "catalog.sqlite"))
+
+    assert catalog.scan(str(root)) == 3 + 2 + 2
+    assert catalog.shots(str(root)) == [(1275, str(root / "1275")), (1276, str(root / "1276")), (1277, str(root / "1277.tt1z"))]
+    assert catalog.signal_names(str(root / "1275")) == ["HCN1", "IP1", "OBP1T"]
+    assert catalog.signal_names(str(root / "1277.tt1z")) == ["GP", "IP1"]
+
+    obp = catalog.signals(str(root / "1275"))[2]
+    assert obp == {"name": "OBP1T", "unit": "V", "samples": 100000, "period": 0.005,
+                   "trigger_time": 0.0, "create_time": "2022/09/03 13:02:51"}
+    assert catalog.find_shot(1276, str(root)) == str(root / "1276")
+    assert catalog.find_shot(1999, str(root)) is None
+
+
+def test_rescan_is_incremental(tmp_path):
+    root = _make_root(tmp_path)
+    catalog = ShotCatalog(str(tmp_path / "catalog.sqlite"))
+    catalog.scan(str(root))
+    assert catalog.scan(str(root)) == 0
+
+    # Changed file: only its header is read again
+    shutil.copy(os.path.join(EXAMPLE_DIR, "IP2.txt"), root / "1275" / "IP1.txt")
+    os.utime(root / "1275" / "IP1.txt", ns=(0, 10**9))
+    assert catalog.scan(str(root)) == 1
+
+    # Removed file and removed shot
+    os.remove(root / "1276" / "IP2.txt")
+    shutil.rmtree(root / "1275")
+    assert catalog.scan(str(root)) == 0
+    assert catalog.signal_names(str(root / "1276")) == ["OBP1T"]
+    assert [shot for shot, _ in catalog.shots(str(root))] == [1276, 1277]
+    assert catalog.signals(str(root / "1275")) == []
+
+    # Rewritten archive is re-read as a whole
+    write_shot_archive(EXAMPLE_DIR, str(root / "1277.tt1z"), params=["IP2"])
+    os.utime(root / "1277.tt1z", ns=(0, 10**9))
+    assert catalog.scan(str(root)) == 1
+    assert catalog.signal_names(str(root / "1277.tt1z")) == ["IP2"]
+
+
+def test_scan_of_a_shot_folder(tmp_path):
+    root = _make_root(tmp_path)
+    catalog = ShotCatalog(str(tmp_path / "catalog.sqlite"))
+    # Pointing at a shot folder itself indexes that shot under its parent
+    assert catalog.scan_shot(str(root / "1276")) == 2
+    assert catalog.shots(str(root)) == [(1276, str(root / "1276"))]
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    for test in (test_scan_reads_headers, test_rescan_is_incremental, test_scan_of_a_shot_folder):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(pathlib.Path(tmp))
+    print("SUCCESS: Shot catalog tests passed.")
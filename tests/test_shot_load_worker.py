@@ -0,0 +1,121 @@
+import os
+import shutil
+import sys
+import threading
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.loader import load_txt_data, fetch_mhd_data
+from PySide6.QtCore import Qt
+from src.ui.shot_load_worker import ShotLoadWorker
+from src.data.analysis import SignalProcessor
+from src.data.ingest import ShotIngester
+from src.data.shot_catalog import ShotCatalog
+import src.data.ingest as ingest
+
+EXAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "1275")
+
+
+def test_load_progress_per_channel():
+    calls = []
+    param_list = ["OBP1T", "OBP2T", "MISSING1T"]
+    load_txt_data(1275, param_list, base_path=EXAMPLE_DIR, workers=1, use_cache=False,
+                  progress=lambda done, total, param: calls.append((done, total, param)))
+
+    assert [c[:2] for c in calls] == [(1, 3), (2, 3), (3, 3)]
+    assert sorted(c[2] for c in calls) == sorted(param_list)
+
+
+def test_cancelled_fetch_returns_nothing():
+    cancel = threading.Event()
+
+    def progress(done, total, param):
+        if done == 2:
+            cancel.set()
+
+    result = fetch_mhd_data(1275, "Text", "m", suffix="T", ip_signal="IP1", base_path=EXAMPLE_DIR, workers=1,
+                            use_shot_cache=False, progress=progress, cancel_event=cancel)
+    assert result == (None, None, None, None)
+
+
+def test_worker_emits_loaded_with_spectrogram():
+    worker = ShotLoadWorker(1275, "Text file", "m", "T", "IP1", base_path=EXAMPLE_DIR,
+                            channel_index=1, spectrogram_params=(200, 512))
+    progress, loaded, failed = [], [], []
+    # Progress is emitted from loader threads, take it directly (no event loop here)
+    worker.progress.connect(lambda *args: progress.append(args), Qt.DirectConnection)
+    worker.loaded.connect(loaded.append)
+    worker.failed.connect(failed.append)
+
+    worker.run()  # Run in this thread instead of start()
+
+    assert not failed and len(loaded) == 1
+    result = loaded[0]
+    assert result["shot"] == 1275 and result["data"].shape == (12, 100000)
+    # Cataloged in the worker, the UI only fills the overlay list
+    assert {"IP1", "OBP1T", "OBP12T"} <= set(result["signal_names"])
+    assert sorted(p[0] for p in progress) == list(range(1, len(progress) + 1))
+    assert all(p[1] == len(progress) for p in progress)
+    channel, params, (freq, times, Sxx) = result["spectrogram"]
+    assert channel == 1 and params == (200, 512)
+    assert Sxx.shape == (len(freq), len(times))
+
+
+def test_cancelled_worker_emits_nothing():
+    worker = ShotLoadWorker(1275, "Text file", "m", "T", "IP1", base_path=EXAMPLE_DIR)
+    emitted = []
+    worker.progress.connect(lambda *args: emitted.append(args))
+    worker.loaded.connect(emitted.append)
+    worker.failed.connect(emitted.append)
+
+    worker.cancel()
+    worker.run()
+    assert emitted == []
+
+
+def test_worker_uses_ingested_summary(tmp_path):
+    shot_dir = tmp_path / "1275"
+    os.makedirs(shot_dir)
+    for param in [f"OBP{i}T" for i in range(1, 13)] + ["IP1", "IP2"]:
+        shutil.copy(os.path.join(EXAMPLE_DIR, f"{param}.txt"), shot_dir / f"{param}.txt")
+    catalog = ShotCatalog(str(tmp_path / "catalog.sqlite"))
+    ShotIngester(ip_signals=["IP2", "IP1"], catalog=catalog).ingest(str(shot_dir))
+
+    def run_worker():
+        worker = ShotLoadWorker(1275, "Text file", "m", "T", "IP1", base_path=str(shot_dir))
+        loaded = []
+        worker.loaded.connect(loaded.append)
+        worker.run()
+        return loaded[0]
+
+    calls = []
+    cal_duration = SignalProcessor.cal_duration
+    default_catalog = ingest.shot_catalog
+    SignalProcessor.cal_duration = staticmethod(lambda data, time: calls.append(1) or cal_duration(data, time))
+    ingest.shot_catalog = catalog
+    try:
+        result = run_worker()
+        # The IP1 summary is used although IP2 is the preferred ingest signal
+        assert calls == []
+        expected = cal_duration(result["ip_data"], result["ip_time"])
+        assert (result["duration"], result["ip_max"], result["start_idx"]) == tuple(float(v) for v in expected[:2]) + (expected[2],)
+
+        # A changed shot is not trusted until it is ingested again
+        shutil.copy(os.path.join(EXAMPLE_DIR, "IP1.txt"), shot_dir / "IP3.txt")
+        assert run_worker()["duration"] == expected[0] and calls == [1]
+    finally:
+        SignalProcessor.cal_duration = staticmethod(cal_duration)
+        ingest.shot_catalog = default_catalog
+
+
+if __name__ == "__main__":
+    test_load_progress_per_channel()
+    test_cancelled_fetch_returns_nothing()
+    test_worker_emits_loaded_with_spectrogram()
+    test_cancelled_worker_emits_nothing()
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as tmp:
+        test_worker_uses_ingested_summary(pathlib.Path(tmp))
+    print("SUCCESS: Shot load worker tests passed.")
@@ -0,0 +1,112 @@
+import os
+import shutil
+import sys
+import threading
+import time
+import numpy as np
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.analysis import SignalProcessor
+from src.data.mds_pool import MDSConnectionPool
+from src.data.shot_archive import write_shot_archive
+from src.data.signal_stream import MDSSource, ArchiveSource, TextSource, open_source
+from src.data.tt1_reader import read_tt1_signal, read_tt1_window
+from src.data.txt_cache import load_cached_tt1
+from mds_stand_in import StandInServer, EXAMPLE_DIR
+
+WINDOWS = [(None, None), (100.0, 231.3), (499.99, None), (300.0, 300.0)]
+
+
+def _check(source, name, chunk_samples=7000, atol=1e-9):
+    path = os.path.join(EXAMPLE_DIR, f"{name}.txt")
+    for t_start, t_end in WINDOWS:
+        blocks = list(source.chunks(name, t_start, t_end, chunk_samples=chunk_samples))
+        expected, timebase, _ = read_tt1_window(path, t_start, t_end)
+        assert all(len(raw) == len(time) for raw, time in blocks)
+        # Time ordered blocks of chunk_samples, only the last one shorter
+        assert all(len(raw) == chunk_samples for raw, _ in blocks[:-1])
+        assert sum(len(raw) for raw, _ in blocks) == len(expected)
+        if blocks:
+            assert np.array_equal(np.concatenate([b[0] for b in blocks]), expected)
+            assert np.allclose(np.concatenate([b[1] for b in blocks]), timebase.array(), rtol=0, atol=atol)
+
+
+def test_text_source(tmp_path):
+    shot_dir = tmp_path / "1275"
+    os.makedirs(shot_dir)
+    shutil.copy(os.path.join(EXAMPLE_DIR, "OBP1T.txt"), shot_dir / "OBP1T.txt")
+    source = open_source(1275, "Text file", str(shot_dir))
+    assert isinstance(source, TextSource) and source.signals() == ["OBP1T"]
+    _check(source, "OBP1T")  # Parsed block by block
+
+    load_cached_tt1(str(shot_dir / "OBP1T.txt"))
+    _check(source, "OBP1T")  # Sliced from the .npy cache
+
+
+def test_archive_source(tmp_path):
+    path = write_shot_archive(EXAMPLE_DIR, str(tmp_path / "1275.tt1z"), chunk_samples=1000, params=["OBP1T", "IP1"])
+    source = open_source(1275, "Text file", path)
+    assert isinstance(source, ArchiveSource) and source.signals() == ["OBP1T", "IP1"]
+    _check(source, "OBP1T", chunk_samples=2500)
+    _check(source, "IP1", chunk_samples=777)
+
+
+def test_mds_source():
+    server = StandInServer()
+    source = MDSSource(1275, pool=MDSConnectionPool(connection_factory=server.connect))
+    _check(source, "OBP1T", chunk_samples=30000, atol=1e-5)  # Time axis as stored on the server
+    # Only the window samples (signal + time axis) and one fingerprint per stream were sent
+    path = os.path.join(EXAMPLE_DIR, "OBP1T.txt")
+    window_samples = sum(len(read_tt1_window(path, t_start, t_end)[0]) for t_start, t_end in WINDOWS)
+    assert server.stats["samples_sent"] == 2 * window_samples + 3 * len(WINDOWS)
+
+
+def test_mds_source_timeouts_and_cancel():
+    server = StandInServer()
+    pool = MDSConnectionPool(connection_factory=server.connect)
+
+    # A request stalled mid-stream fails after request_timeout instead of blocking
+    chunks = MDSSource(1275, pool=pool, request_timeout=0.2).chunks("OBP1T", chunk_samples=30000)
+    assert len(next(chunks)[0]) == 30000
+    server.stall["OBP1T"] = 5.0
+    start = time.perf_counter()
+    try:
+        next(chunks)
+    except TimeoutError:
+        pass
+    else:
+        raise AssertionError("stalled request did not time out")
+    assert time.perf_counter() - start < 1.5
+
+    # Cancel aborts the request in flight and ends the stream
+    cancel = threading.Event()
+    threading.Timer(0.2, cancel.set).start()
+    start = time.perf_counter()
+    assert list(MDSSource(1275, pool=pool, cancel_event=cancel).chunks("OBP1T")) == []
+    assert time.perf_counter() - start < 1.5
+    assert pool.idle_count() == 0  # Neither interrupted connection is reused
+
+
+def test_spectrogram_stream_matches_full():
+    raw_data, timebase, _ = read_tt1_signal(os.path.join(EXAMPLE_DIR, "OBP2T.txt"))
+    freq, times, Sxx = SignalProcessor.compute_spectrogram(raw_data, 200000.0, nperseg=200, nfft=512)
+
+    chunks = open_source(1275, "Text file", EXAMPLE_DIR).chunks("OBP2T", chunk_samples=3333)
+    parts = list(SignalProcessor.spectrogram_stream(chunks, 200000.0, nperseg=200, nfft=512))
+    assert len(parts) > 1 and np.array_equal(parts[0][0], freq)
+    assert np.allclose(np.concatenate([p[2] for p in parts], axis=1), Sxx, rtol=1e-10, atol=0)
+    assert np.allclose(np.concatenate([p[1] for p in parts]), times)
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    for test in (test_text_source, test_archive_source):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(pathlib.Path(tmp))
+    test_mds_source()
+    test_mds_source_timeouts_and_cancel()
+    test_spectrogram_stream_matches_full()
+    print("SUCCESS: Signal stream tests passed.")
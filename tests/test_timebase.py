@@ -0,0 +1,36 @@
+import os
+import sys
+import numpy as np
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.timebase import Timebase, time_index, same_timebase
+
+
+def test_index_arithmetic_matches_searchsorted():
+    timebase = Timebase(0.0, 0.00499995, 100000)
+    axis = timebase.array()
+    queries = np.concatenate([np.linspace(-1, 501, 997), axis[::1013], axis[::1013] + 1e-12, [-np.inf, np.inf]])
+    for t in queries:
+        for side in ("left", "right"):
+            assert time_index(axis, t, side) == np.searchsorted(axis, t, side)
+
+
+def test_shared_axis():
+    a = Timebase(0.0, 0.005, 1000)
+    b = Timebase(0.0, 0.005, 1000)
+    assert a == b
+    assert a.array() is b.array()
+    assert not a.array().flags.writeable
+    assert same_timebase(a.array(), b.array())
+    assert not same_timebase(a.array(), Timebase(0.0, 0.02, 1000).array())
+    # Slices are plain time values without a descriptor
+    assert a.array()[10:].timebase is None
+    assert time_index(a.array()[10:], 0.06) == np.searchsorted(a.array()[10:], 0.06)
+
+
+if __name__ == "__main__":
+    test_index_arithmetic_matches_searchsorted()
+    test_shared_axis()
+    print("SUCCESS: Timebase tests passed.")
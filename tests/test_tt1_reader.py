@@ -0,0 +1,116 @@
+import os
+import sys
+import tempfile
+import numpy as np
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.tt1_reader import read_tt1_file, read_tt1_header, read_tt1_signal
+
+EXAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "1275")
+
+HEADER = """DataBase = TT1
+ShotNo = 9999
+SignalName = TEST1
+SignalUnit = V
+TriggerTime = 0.000000 ms
+Period = 0.005000 ms
+CreateTime = 2022/09/03 13:02:51
+Samples = {samples}
+"""
+
+
+def _write(dirname, name, text):
+    path = os.path.join(dirname, name)
+    with open(path, "w") as f:
+        f.write(text)
+    return path
+
+
+def test_header():
+    header = read_tt1_header(os.path.join(EXAMPLE_DIR, "IP1.txt"))
+    assert header["SignalName"] == "IP1"
+    assert header["Samples"] == 25000
+    assert header["Period"] == 0.019999
+    assert header["TriggerTime"] == 0.0
+
+
+def test_matches_float_parse():
+    # Signs, "-0.000000", wide integer parts and a file without trailing newline
+    rows = [(0.0, -0.0), (0.005, 1234567.5), (0.01, -0.000272), (0.015, -2479.506836), (0.02, 12.0)]
+    body = "\n".join(f"{t:.6f}  {v:.6f}" for t, v in rows)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = _write(tmpdir, "TEST1.txt", HEADER.format(samples=len(rows)) + body)
+        raw_data, prof_time, header = read_tt1_file(path)
+
+    expected = np.array([float(f"{v:.6f}") for _, v in rows])
+    assert header["Samples"] == len(rows)
+    assert np.array_equal(raw_data, expected)
+    assert np.array_equal(np.signbit(raw_data), np.signbit(expected))
+    assert np.array_equal(prof_time, [float(f"{t:.6f}") for t, _ in rows])
+
+
+def test_fallback_for_other_formats():
+    # Blank header lines and free-form floats are handled by the generic path
+    t = np.linspace(0, 0.1, 50)
+    d = np.sin(2 * np.pi * 1000 * t) * 1e-7
+    body = "".join(f"{float(a)!r} {float(b)!r}\n" for a, b in zip(t, d))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = _write(tmpdir, "TEST1.txt", "\n" * 8 + body)
+        raw_data, prof_time, header = read_tt1_file(path)
+
+    assert header == {}
+    assert np.array_equal(raw_data, d)
+    assert np.array_equal(prof_time, t)
+
+
+def test_malformed_digits_fall_back():
+    # Exponent notation after fixed-point rows: the fraction bytes hold 'e' and '-'
+    rows = ["0.000000  -0.000272", "0.005000  0.125000", "0.010000  1.00e-05", "0.015000  2.000000"]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = _write(tmpdir, "TEST1.txt", HEADER.format(samples=len(rows)) + "\n".join(rows) + "\n")
+        raw_data, prof_time, _ = read_tt1_file(path)
+        signal, _, _ = read_tt1_signal(path)
+        expected = np.loadtxt(path, skiprows=8)
+        assert np.array_equal(raw_data, expected[:, 1]) and np.array_equal(prof_time, expected[:, 0])
+        assert np.array_equal(signal, expected[:, 1]) and signal[2] == 1e-05
+
+        # A letter inside the integer part is not decoded as a digit, a '-' must follow a separator
+        for value in ("x1.000000", "1-2.500000", "e-3.000000"):
+            bad = _write(tmpdir, "TEST2.txt", HEADER.format(samples=2) + f"0.000000  1.000000\n0.005000  {value}\n")
+            try:
+                read_tt1_signal(bad)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"{value} was parsed")
+
+
+def test_example_shot():
+    raw_data, prof_time, header = read_tt1_file(os.path.join(EXAMPLE_DIR, "OBP1T.txt"))
+    assert len(raw_data) == len(prof_time) == header["Samples"] == 100000
+    assert raw_data[0] == -0.000272
+    assert prof_time[11] == 0.054999
+
+
+def test_signal_only_read():
+    path = os.path.join(EXAMPLE_DIR, "IP1.txt")
+    raw_data, prof_time, header = read_tt1_file(path)
+    signal, timebase, _ = read_tt1_signal(path)
+
+    assert np.array_equal(signal, raw_data)
+    assert len(timebase) == header["Samples"]
+    assert timebase.t0 == header["TriggerTime"]
+    # Time column is printed with 6 decimals
+    assert np.allclose(timebase.array(), prof_time, rtol=0, atol=1e-6)
+
+
+if __name__ == "__main__":
+    test_header()
+    test_matches_float_parse()
+    test_fallback_for_other_formats()
+    test_malformed_digits_fall_back()
+    test_example_shot()
+    test_signal_only_read()
+    print("SUCCESS: TT1 reader tests passed.")
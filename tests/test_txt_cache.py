@@ -0,0 +1,48 @@
+import os
+import sys
+import shutil
+import tempfile
+import numpy as np
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.txt_cache import load_cached_tt1, cache_dir_for
+from src.data.tt1_reader import read_tt1_signal
+
+EXAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "1275")
+
+
+def test_cache_roundtrip_and_invalidation():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        txt_path = os.path.join(tmpdir, "IP1.txt")
+        shutil.copy(os.path.join(EXAMPLE_DIR, "IP1.txt"), txt_path)
+        expected_data, expected_timebase, expected_header = read_tt1_signal(txt_path)
+
+        # First load parses the text and writes the sidecar
+        raw_data, timebase, header = load_cached_tt1(txt_path)
+        assert os.path.exists(os.path.join(cache_dir_for(txt_path), "IP1.npy"))
+        assert not isinstance(raw_data, np.memmap)
+
+        # Second load is served from the memory-mapped cache
+        raw_data, timebase, header = load_cached_tt1(txt_path)
+        assert isinstance(raw_data, np.memmap)
+        assert np.array_equal(raw_data, expected_data)
+        assert timebase == expected_timebase
+        assert header == expected_header
+        del raw_data
+
+        # Changing the text invalidates the entry
+        with open(txt_path, "r") as f:
+            lines = f.readlines()
+        with open(txt_path, "w") as f:
+            f.writelines(lines[:8 + 10])
+        os.utime(txt_path, ns=(0, 0))
+        raw_data, timebase, header = load_cached_tt1(txt_path)
+        assert len(raw_data) == 10
+        assert np.array_equal(raw_data, expected_data[:10])
+
+
+if __name__ == "__main__":
+    test_cache_roundtrip_and_invalidation()
+    print("SUCCESS: TT1 cache tests passed.")
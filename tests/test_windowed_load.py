@@ -0,0 +1,69 @@
+import os
+import sys
+import numpy as np
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.loader import load_txt_data, load_mds_data, fetch_mhd_data
+from src.data.mds_pool import MDSConnectionPool
+from src.data.tt1_reader import read_tt1_window
+from mds_stand_in import StandInServer, EXAMPLE_DIR
+
+PARAMS = ["OBP1T", "OBP2T", "IP1"]
+
+
+def _full():
+    return load_txt_data(1275, PARAMS, base_path=EXAMPLE_DIR, workers=1, use_cache=False)
+
+
+def test_text_window_matches_full_read():
+    full = _full()
+    for time_range, decimate in [((100.0, 140.0), 1), ((100.0, 140.0), 4), ((-5.0, 0.02), 1), ((499.9, 600.0), 3), ((300.0, 300.0), 1)]:
+        for use_cache in (False, True):
+            window = load_txt_data(1275, PARAMS, base_path=EXAMPLE_DIR, workers=1, use_cache=use_cache,
+                                   time_range=time_range, decimate=decimate)
+            for param in PARAMS:
+                data, time = full[param]
+                keep = np.flatnonzero((time >= time_range[0]) & (time < time_range[1]))[::decimate]
+                assert np.array_equal(window[param][0], data[keep])
+                assert np.allclose(window[param][1], time[keep], rtol=0, atol=1e-9)
+
+
+def test_window_reads_only_part_of_file():
+    # Direct reader call on a ~20% window of a 100k row file
+    raw_data, timebase, header = read_tt1_window(os.path.join(EXAMPLE_DIR, "OBP1T.txt"), 200.0, 300.0)
+    assert len(raw_data) == len(timebase) == 20000
+    assert header["Samples"] == 100000
+
+
+def test_mds_window_server_side():
+    full = _full()
+    for batch in (True, False):
+        server = StandInServer()
+        pool = MDSConnectionPool(connection_factory=server.connect)
+        window = load_mds_data(1275, PARAMS, workers=1, pool=pool, batch=batch, time_range=(100.0, 140.0), decimate=2, use_cache=False)
+        for param in PARAMS:
+            data, time = full[param]
+            keep = np.flatnonzero((time >= 100.0) & (time < 140.0))[::2]
+            assert np.array_equal(window[param][0], data[keep])
+            assert np.allclose(window[param][1], time[keep], rtol=0, atol=1e-5)
+        # 3 fingerprints, 2 x 4000 OBP samples + their shared axis, 1000 IP1 samples + axis
+        # (instead of 2 x 225k samples for the full records)
+        assert server.stats["samples_sent"] == 9 + 3 * 4000 + 2 * 1000
+
+
+def test_fetch_mhd_data_window():
+    data, time, ip_data, ip_time = fetch_mhd_data(1275, "Text", "m", suffix="T", ip_signal="IP1", base_path=EXAMPLE_DIR,
+                                                  time_range=(250.0, 260.0), decimate=2)
+    assert data.shape == (12, 1000)
+    assert time[0] >= 250.0 and time[-1] < 260.0
+    assert len(ip_data) == len(ip_time) == 250
+
+
+if __name__ == "__main__":
+    test_text_window_matches_full_read()
+    test_window_reads_only_part_of_file()
+    test_mds_window_server_side()
+    test_fetch_mhd_data_window()
+    print("SUCCESS: Windowed load tests passed.")